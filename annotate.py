@@ -0,0 +1,173 @@
+"""
+Tespit Sonuçlarının Görüntü Üzerine Çizimi
+
+Bu modül, tespit edilen kutuları ve etiketleri görüntüye çizer.
+Eski çizim döngüsündeki her kutu için tekrarlanan maliyetler kaldırılmıştır:
+
+• Renkler: Her kutu için np.random.seed(class_id) çağırmak yerine
+  sınıf renk tablosu (palet) bir kez hesaplanır. Global rastgele sayı
+  üretecinin durumu artık değiştirilmez.
+• Etiket boyutu: cv2.getTextSize sonucu (metin, font, ölçek, kalınlık)
+  anahtarıyla önbellekte tutulur.
+• Kutular: Aynı renkteki (aynı sınıftaki) tüm kutular tek bir
+  cv2.polylines çağrısıyla çizilir.
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import functools
+
+import cv2
+import numpy as np
+
+import profiling
+
+# ==================== SABİTLER ====================
+
+# COCO veri setindeki sınıf sayısı
+NUM_CLASSES = 80
+
+# Etiket yazı tipi ayarları
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.5
+TEXT_THICKNESS = 1
+TEXT_COLOR = (255, 255, 255)  # Beyaz
+
+# Kutu çizgi kalınlığı
+BOX_THICKNESS = 2
+
+
+# ==================== RENK PALETİ ====================
+
+def _class_color(class_id):
+    """
+    Bir sınıfın rengini hesaplar.
+
+    Eski np.random.seed(class_id) yöntemiyle aynı renkleri üretir,
+    ancak global üreteç yerine yerel bir RandomState kullanır.
+    """
+    return np.random.RandomState(class_id).randint(0, 255, 3)
+
+
+@functools.lru_cache(maxsize=8)
+def get_palette(num_classes=NUM_CLASSES):
+    """
+    Sınıf indeksi → BGR renk tablosunu döndürür (bir kez hesaplanır).
+
+    Parametreler:
+        num_classes (int): Tablodaki sınıf sayısı
+
+    Dönüş:
+        numpy.ndarray: (num_classes × 3) uint8 renk tablosu
+    """
+    palette = np.array(
+        [_class_color(i) for i in range(num_classes)], dtype=np.uint8
+    )
+    palette.setflags(write=False)
+    return palette
+
+
+def class_color(class_id):
+    """
+    Tek bir sınıfın rengini OpenCV'nin beklediği tuple olarak döndürür.
+
+    Parametreler:
+        class_id (int): Sınıf indeksi
+
+    Dönüş:
+        tuple: (B, G, R) renk değeri
+    """
+    palette = get_palette(max(NUM_CLASSES, class_id + 1))
+    return tuple(palette[class_id].tolist())
+
+
+# ==================== ETİKET BOYUTU ====================
+
+@functools.lru_cache(maxsize=4096)
+def label_size(text, font=FONT, scale=FONT_SCALE, thickness=TEXT_THICKNESS):
+    """
+    Etiket metninin piksel boyutunu döndürür (önbellekli).
+
+    Dönüş:
+        tuple: ((genişlik, yükseklik), taban çizgisi)
+    """
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
+# ==================== ÇİZİM ====================
+
+def draw_detections(image, detections, labels=True, copy=True, ids=None):
+    """
+    Tespit kutularını ve etiketlerini görüntü üzerine çizer.
+
+    Parametreler:
+        image (numpy.ndarray): BGR formatında görüntü
+        detections (Detections): Çizilecek tespitler
+        labels (bool): False ise yalnızca kutular çizilir
+            (büyük toplu işlerde en hızlı mod)
+        copy (bool): False ise çizim doğrudan verilen görüntüye yapılır
+        ids (numpy.ndarray): Takip kimlikleri; verilirse etiketlerin
+            başına '#ID' eklenir
+
+    Dönüş:
+        numpy.ndarray: Üzerine çizim yapılmış görüntü
+    """
+    with profiling.stage('draw'):
+        return _draw(image, detections, labels, copy, ids)
+
+
+def _draw(image, detections, labels, copy, ids=None):
+    """draw_detections'ın asıl çizim işlemi."""
+    output = image.copy() if copy else image
+
+    if not len(detections):
+        return output
+
+    boxes = detections.boxes
+    class_ids = detections.class_ids
+    palette = get_palette(max(NUM_CLASSES, int(class_ids.max()) + 1))
+
+    # Kutuların köşe noktaları: (N × 4 × 2)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    corners = np.stack([
+        np.stack([x1, y1], axis=1),
+        np.stack([x2, y1], axis=1),
+        np.stack([x2, y2], axis=1),
+        np.stack([x1, y2], axis=1),
+    ], axis=1).astype(np.int32)
+
+    # ========== KUTULAR (sınıf başına tek çağrı) ==========
+    for class_id in np.unique(class_ids):
+        color = tuple(palette[class_id].tolist())
+        polygons = list(corners[class_ids == class_id])
+        cv2.polylines(output, polygons, True, color, BOX_THICKNESS)
+
+    if not labels:
+        return output
+
+    # ========== ETİKETLER ==========
+    prefixes = [''] * len(detections) if ids is None else \
+        [f"#{track_id} " for track_id in ids.tolist()]
+    for (bx1, by1, _, _), confidence, class_id, class_name, prefix in zip(
+            boxes.tolist(), detections.confidences.tolist(),
+            class_ids.tolist(), detections.class_names.tolist(), prefixes):
+        color = tuple(palette[class_id].tolist())
+        label = f"{prefix}{class_name}: {confidence:.2f}"
+        (label_w, label_h), _ = label_size(label)
+
+        # Etiket arka planını çiz (okunabilirlik için)
+        cv2.rectangle(
+            output,
+            (bx1, by1 - label_h - 10),
+            (bx1 + label_w, by1),
+            color,
+            -1  # Dolu dikdörtgen
+        )
+
+        # Etiket metnini yaz
+        cv2.putText(
+            output, label, (bx1, by1 - 5),
+            FONT, FONT_SCALE, TEXT_COLOR, TEXT_THICKNESS
+        )
+
+    return output
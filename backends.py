@@ -0,0 +1,465 @@
+"""
+Çıkarım Arka Uçları (Backends): PyTorch, ONNX Runtime, OpenVINO
+
+Uygulama yalnızca CPU üzerinde çalıştırıldığında PyTorch en hızlı çıkarım
+ortamı değildir. Bu modül YOLO modelini bir kez ONNX (ve kuruluysa
+OpenVINO) formatına dışa aktarır, oluşan dosyayı önbelleğe alır ve
+çıkarımı bu ortamlarda çalıştırır.
+
+Önbellek:
+---------
+Dışa aktarılan dosyalar ağırlık dosyasının yanındaki '.yolo_cache'
+dizininde tutulur. Dosya adı; model adı, ağırlık dosyasının özeti (hash)
+ve giriş boyutundan oluşur. Ağırlıklar değişirse yeniden dışa aktarılır:
+
+    .yolo_cache/yolov8n-3f2a9c1b7d4e-640.onnx
+    .yolo_cache/yolov8n-3f2a9c1b7d4e-640_openvino_model/
+
+Çıktı Biçimi:
+-------------
+Tüm arka uçlar detection.Detections döndürür; böylece arayüz, tablo ve
+JSON çıktısı hangi arka ucun kullanıldığından etkilenmez.
+
+Kullanım:
+---------
+    model = backends.load_backend('yolov8n.pt', 'onnx', intra_threads=8)
+    dets = detection.detect_images(model, images)
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import abc
+import ast
+import shutil
+import hashlib
+import tempfile
+
+import cv2
+import numpy as np
+
+import detection
+import profiling
+
+# onnxruntime: ONNX modellerini CPU'da çalıştırmak için (opsiyonel)
+try:
+    import onnxruntime as ort
+
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# openvino: Intel CPU'lar için optimize çıkarım ortamı (opsiyonel)
+try:
+    import openvino as ov
+
+    OPENVINO_AVAILABLE = True
+except ImportError:
+    OPENVINO_AVAILABLE = False
+
+# ==================== SABİTLER ====================
+
+# Desteklenen arka uçlar
+BACKENDS = ('torch', 'onnx', 'openvino')
+
+# Dışa aktarılan dosyaların önbellek dizini adı
+CACHE_DIR_NAME = '.yolo_cache'
+
+# NMS örtüşme eşiği (ultralytics varsayılanı ile aynı)
+NMS_IOU = 0.7
+
+# Görüntü başına en fazla tespit (ultralytics max_det ile aynı)
+MAX_DET = 300
+
+# Letterbox dolgu rengi (ultralytics ile aynı gri)
+PAD_COLOR = (114, 114, 114)
+
+
+# ==================== ÖNBELLEK ====================
+
+def file_hash(path, length=12):
+    """
+    Dosyanın SHA-256 özetini döndürür (kısaltılmış).
+
+    Parametreler:
+        path (str): Dosya yolu
+        length (int): Döndürülecek onaltılık karakter sayısı
+
+    Dönüş:
+        str: Özet
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def artifact_path(weights, backend, imgsz, cache_dir=None, tag=''):
+    """
+    Dışa aktarılan model dosyasının önbellekteki yolunu hesaplar.
+
+    Parametreler:
+        weights (str): .pt ağırlık dosyasının yolu
+        backend (str): 'onnx' veya 'openvino'
+        imgsz (int): Giriş boyutu
+        cache_dir (str): Önbellek dizini (None ise ağırlıkların yanı)
+        tag (str): Ek ayırt edici (örn. 'int8')
+
+    Dönüş:
+        str: Önbellek yolu
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(
+            os.path.dirname(os.path.abspath(weights)), CACHE_DIR_NAME
+        )
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    name = f"{stem}-{file_hash(weights)}-{imgsz}{tag}"
+
+    if backend == 'openvino':
+        return os.path.join(cache_dir, f"{name}_openvino_model")
+    return os.path.join(cache_dir, f"{name}.onnx")
+
+
+def local_weights(weights):
+    """
+    Ağırlık dosyasının yerel yolunu döndürür (yerelde yoksa indirir).
+
+    Önbellek anahtarı dosyanın özetinden hesaplandığı için yol yerel bir
+    dosya olmalıdır. Dosya zaten varsa model yüklenmez.
+
+    Parametreler:
+        weights (str): .pt ağırlık dosyası veya ultralytics model adı
+
+    Dönüş:
+        str: Yerel .pt dosyasının yolu
+    """
+    if os.path.isfile(weights):
+        return weights
+    # Model indirildiyse gerçek dosya yolu ckpt_path'tedir
+    yolo = detection.load_model(weights)
+    return getattr(yolo, 'ckpt_path', None) or weights
+
+
+def export_cached(weights, backend, imgsz, cache_dir=None):
+    """
+    Modeli dışa aktarır; önbellekte varsa yeniden aktarmaz.
+
+    Önbellek isabetinde PyTorch modeli hiç yüklenmez. Dışa aktarma
+    ağırlıkların geçici bir dizindeki kopyasından yapılır: ultralytics
+    çıktıyı ağırlıkların yanına sabit bir adla yazar ve aynı ağırlıkları
+    eş zamanlı aktaran iki süreç aksi halde birbirinin dosyasını ezer.
+
+    Parametreler:
+        weights (str): Yerel .pt ağırlık dosyası (bkz. local_weights)
+        backend (str): 'onnx' veya 'openvino'
+        imgsz (int): Giriş boyutu
+        cache_dir (str): Önbellek dizini
+
+    Dönüş:
+        str: Önbellekteki dosya (veya dizin) yolu
+    """
+    target = artifact_path(weights, backend, imgsz, cache_dir)
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix='.export-', dir=os.path.dirname(target))
+    try:
+        copy = os.path.join(workdir, os.path.basename(weights))
+        shutil.copyfile(weights, copy)
+
+        # dynamic=True: batch boyutu çalışma anında değişebilir
+        exported = detection.load_model(copy).export(
+            format=backend, imgsz=imgsz, dynamic=True, verbose=False
+        )
+
+        # Tamamlanmış çıktı önbelleğe tek adımda taşınır
+        try:
+            os.replace(str(exported), target)
+        except OSError:
+            # Dizin hedefi (openvino) başka bir süreç tarafından yazıldı
+            if not os.path.exists(target):
+                raise
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return target
+
+
+# ==================== ÖN VE SON İŞLEME ====================
+
+def letterbox(image, size):
+    """
+    Görüntüyü en-boy oranını koruyarak size × size boyutuna getirir.
+
+    Parametreler:
+        image (numpy.ndarray): BGR görüntü
+        size (int): Hedef kenar uzunluğu
+
+    Dönüş:
+        tuple: (doldurulmuş görüntü, ölçek, (x dolgusu, y dolgusu))
+    """
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h),
+                           interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (size - new_w) // 2
+    pad_y = (size - new_h) // 2
+    padded = cv2.copyMakeBorder(
+        image, pad_y, size - new_h - pad_y, pad_x, size - new_w - pad_x,
+        cv2.BORDER_CONSTANT, value=PAD_COLOR
+    )
+    return padded, scale, (pad_x, pad_y)
+
+
+def preprocess(images, imgsz):
+    """
+    Görüntüleri modelin beklediği NCHW float32 batch'e çevirir.
+
+    Parametreler:
+        images (list): BGR görüntüler
+        imgsz (int): Giriş boyutu
+
+    Dönüş:
+        tuple: (batch, [(ölçek, dolgu, orijinal boyut), ...])
+    """
+    batch = np.empty((len(images), 3, imgsz, imgsz), dtype=np.float32)
+    meta = []
+    for i, img in enumerate(images):
+        padded, scale, pad = letterbox(img, imgsz)
+        # BGR → RGB, HWC → CHW, 0-255 → 0-1
+        batch[i] = padded[:, :, ::-1].transpose(2, 0, 1)
+        meta.append((scale, pad, img.shape))
+    batch *= 1.0 / 255.0
+    return batch, meta
+
+
+def decode_predictions(pred, conf, scale, pad, shape, names):
+    """
+    YOLOv8 ham çıktısını Detections'a çevirir.
+
+    Ham çıktı (4 + sınıf sayısı) × aday sayısı boyutundadır:
+    ilk 4 satır [cx, cy, w, h], kalanlar sınıf skorlarıdır.
+
+    Parametreler:
+        pred (numpy.ndarray): Tek görüntünün ham çıktısı
+        conf (float): Minimum güven eşiği
+        scale (float): Letterbox ölçeği
+        pad (tuple): Letterbox dolgusu (x, y)
+        shape (tuple): Orijinal görüntü boyutu (h, w)
+        names (dict): Sınıf adları
+
+    Dönüş:
+        Detections: Orijinal koordinatlarda, NMS uygulanmış tespitler
+        (en fazla MAX_DET, güvene göre azalan sırada)
+    """
+    pred = pred.T  # (aday sayısı, 4 + sınıf sayısı)
+    scores = pred[:, 4:]
+
+    class_ids = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(scores)), class_ids]
+
+    keep = confidences >= conf
+    if not keep.any():
+        return detection.Detections(names=names)
+
+    cx, cy, bw, bh = pred[keep, :4].T
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], 1)
+
+    # Letterbox dolgusunu çıkar ve orijinal ölçeğe geri dön
+    boxes -= np.array([pad[0], pad[1], pad[0], pad[1]], dtype=boxes.dtype)
+    boxes /= scale
+    h, w = shape[:2]
+    np.clip(boxes[:, 0::2], 0, w, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, h, out=boxes[:, 1::2])
+    confidences, class_ids = confidences[keep], class_ids[keep]
+
+    # Sınıfa duyarlı NMS ondalıklı kutularda yapılır: her sınıf, görüntü
+    # boyutundan büyük bir kaydırmayla ayrı bir bölgeye taşınır; böylece
+    # farklı sınıfların kutuları birbirini bastırmaz
+    offset = (class_ids * (max(h, w) + 1))[:, None].astype(boxes.dtype)
+    shifted = boxes[:, :2] + offset
+    xywh = np.concatenate([shifted, boxes[:, 2:] - boxes[:, :2]], axis=1)
+    indices = cv2.dnn.NMSBoxes(xywh.tolist(), confidences.tolist(),
+                               conf, NMS_IOU)
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)[:MAX_DET]
+
+    # Kutular yalnızca en sonda tam sayıya yuvarlanır
+    return detection.Detections(
+        np.rint(boxes[indices]), confidences[indices], class_ids[indices],
+        names
+    )
+
+
+# ==================== ARKA UÇLAR ====================
+
+class ExportedBackend(abc.ABC):
+    """
+    Dışa aktarılmış modeller için ortak ön/son işleme.
+
+    Alt sınıflar yalnızca _infer(batch) metodunu tanımlar. detect()
+    metodu detection.detect_images tarafından çağrılır.
+    """
+
+    def __init__(self, names, imgsz):
+        self.names = names
+        self.imgsz = imgsz
+        # Önbellek anahtarlarında kullanılan kimlik (dışa aktarılan dosya adı)
+        self.identity = None
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None):
+        """
+        Görüntüleri tek bir batch olarak işler.
+
+        Parametreler:
+            images (list): BGR görüntüler
+            conf (float): Minimum güven eşiği
+            imgsz (int): Yok sayılır; dışa aktarılan boyut kullanılır
+
+        Dönüş:
+            list: Her görüntü için Detections
+        """
+        with profiling.stage('preprocess'):
+            batch, meta = preprocess(images, self.imgsz)
+
+        with profiling.stage('inference'):
+            preds = self._infer(batch)
+
+        with profiling.stage('nms'):
+            return [
+                decode_predictions(pred, conf, scale, pad, shape, self.names)
+                for pred, (scale, pad, shape) in zip(preds, meta)
+            ]
+
+    @abc.abstractmethod
+    def _infer(self, batch):
+        """Ön işlenmiş batch'i çalıştırır, ham tahminleri döndürür."""
+
+
+class OnnxBackend(ExportedBackend):
+    """ONNX Runtime ile CPU çıkarımı."""
+
+    def __init__(self, path, names, imgsz, intra_threads=None,
+                 inter_threads=1):
+        """
+        Parametreler:
+            path (str): .onnx dosyası
+            names (dict): Sınıf adları (None ise model üst verisinden)
+            imgsz (int): Giriş boyutu
+            intra_threads (int): Tek bir işlem içindeki iş parçacığı sayısı
+                (None ise çekirdek sayısı)
+            inter_threads (int): Paralel işlem sayısı (sıralı grafiklerde 1)
+        """
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_threads or os.cpu_count() or 1
+        options.inter_op_num_threads = inter_threads or 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+
+        self.session = ort.InferenceSession(
+            path, options, providers=['CPUExecutionProvider']
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+        if names is None:
+            # ultralytics sınıf adlarını ONNX üst verisine yazar
+            metadata = self.session.get_modelmeta().custom_metadata_map
+            names = ast.literal_eval(metadata.get('names', '{}'))
+
+        super().__init__(names, imgsz)
+
+    def _infer(self, batch):
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenVinoBackend(ExportedBackend):
+    """OpenVINO ile CPU çıkarımı."""
+
+    def __init__(self, path, names, imgsz, intra_threads=None):
+        """
+        Parametreler:
+            path (str): *_openvino_model dizini
+            names (dict): Sınıf adları (None ise metadata.yaml'dan)
+            imgsz (int): Giriş boyutu
+            intra_threads (int): Çıkarım iş parçacığı sayısı
+        """
+        core = ov.Core()
+        xml = next(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.endswith('.xml')
+        )
+        model = core.read_model(xml)
+
+        config = {}
+        if intra_threads:
+            config['INFERENCE_NUM_THREADS'] = int(intra_threads)
+        self.compiled = core.compile_model(model, 'CPU', config)
+
+        if names is None:
+            # ultralytics sınıf adlarını dizindeki metadata.yaml'a yazar
+            import yaml
+
+            with open(os.path.join(path, 'metadata.yaml'),
+                      encoding='utf-8') as f:
+                names = (yaml.safe_load(f) or {}).get('names', {})
+
+        super().__init__(names, imgsz)
+
+    def _infer(self, batch):
+        return self.compiled(batch)[0]
+
+
+# ==================== YÜKLEME ====================
+
+def load_backend(weights=detection.DEFAULT_WEIGHTS, backend='torch',
+                 imgsz=detection.DEFAULT_IMGSZ, intra_threads=None,
+                 inter_threads=1, cache_dir=None):
+    """
+    İstenen arka uçla çalışan bir model döndürür.
+
+    'torch' için doğrudan ultralytics YOLO modeli döner. Diğer arka uçlar
+    için model ilk seferde dışa aktarılır ve önbellekten yüklenir; sınıf
+    adları dışa aktarılan modelin üst verisinden okunur (önbellek
+    isabetinde PyTorch modeli yüklenmez).
+
+    Parametreler:
+        weights (str): .pt ağırlık dosyası
+        backend (str): 'torch', 'onnx' veya 'openvino'
+        imgsz (int): Giriş boyutu (dışa aktarımda sabitlenir)
+        intra_threads (int): İşlem içi iş parçacığı sayısı
+        inter_threads (int): İşlemler arası iş parçacığı sayısı (ONNX)
+        cache_dir (str): Önbellek dizini
+
+    Dönüş:
+        detection.detect_images ile kullanılabilecek model
+
+    Hata:
+        ValueError: Bilinmeyen arka uç
+        RuntimeError: Gerekli kütüphane yüklü değilse
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen arka uç: {backend}")
+
+    if backend == 'torch':
+        return detection.load_model(weights)
+
+    if backend == 'onnx' and not ONNXRUNTIME_AVAILABLE:
+        raise RuntimeError("onnxruntime yüklü değil! (pip install onnxruntime)")
+    if backend == 'openvino' and not OPENVINO_AVAILABLE:
+        raise RuntimeError("openvino yüklü değil! (pip install openvino)")
+
+    path = export_cached(local_weights(weights), backend, imgsz, cache_dir)
+
+    if backend == 'onnx':
+        model = OnnxBackend(path, None, imgsz, intra_threads, inter_threads)
+    else:
+        model = OpenVinoBackend(path, None, imgsz, intra_threads)
+
+    model.identity = os.path.basename(path)
+    return model
@@ -0,0 +1,450 @@
+"""
+Tespit Hattı Performans Ölçümü (Benchmark)
+
+Yapılan bir değişikliğin hattı hızlandırıp yavaşlattığını anlamak için
+tekrarlanabilir ölçümler yapar. İnternet bağlantısı gerekmez: görüntüler
+sabit tohumla (seed) yapay olarak üretilir, model ağırlıkları yerel bir
+dosyadan okunur (indirilmez).
+
+Ölçülen Aşamalar:
+-----------------
+decode       : JPEG decode (görüntü boyutu × iş parçacığı sayısı)
+inference    : Model çağrısı (görüntü boyutu × batch boyutu × iş parçacığı)
+postprocess  : Kutu aktarımı + sınıf özeti + kayıt oluşturma (kutu sayısı)
+draw         : Kutu ve etiket çizimi (kutu sayısı)
+
+Her ölçüm için gecikme (p50/p95/ortalama, ms) ve verim (görüntü/sn)
+JSON olarak yazılır. Kaydedilmiş bir temel (baseline) sonuçla
+karşılaştırıldığında, verimi eşikten fazla düşen ölçümler gerileme
+olarak raporlanır ve program 1 koduyla çıkar.
+
+Kullanım:
+---------
+    python benchmark.py --weights yolov8n.pt --output sonuc.json
+    python benchmark.py --weights yolov8n.pt --baseline temel.json --threshold 0.10
+    python benchmark.py --skip-inference --sizes 640 1920 --threads 1 4
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import annotate
+import detection
+import profiling
+
+# ==================== SABİTLER ====================
+
+# Varsayılan tarama değerleri
+DEFAULT_SIZES = (640, 1280, 1920)
+DEFAULT_BATCH_SIZES = (1, 4, 8)
+DEFAULT_BOX_COUNTS = (10, 100, 500)
+DEFAULT_THREADS = (1, os.cpu_count() or 1)
+
+# Her ölçümün tekrar sayısı ve ölçüme katılmayan ısınma tekrarları
+DEFAULT_REPEAT = 20
+DEFAULT_WARMUP = 2
+
+# Verimdeki izin verilen en fazla düşüş (0.10 = %10)
+DEFAULT_THRESHOLD = 0.10
+
+# Yapay veriler için sabit tohum
+DEFAULT_SEED = 0
+
+# JPEG kodlama kalitesi
+JPEG_QUALITY = 90
+
+
+# ==================== YAPAY VERİ ====================
+
+def synthetic_image(size, rng):
+    """
+    Kare, doğal görüntüye benzer yapay bir görüntü üretir.
+
+    Düz gürültü JPEG'de gerçekçi olmayan oranda sıkıştığı için
+    renk geçişi, gürültü ve rastgele şekiller birlikte kullanılır.
+
+    Parametreler:
+        size (int): Kenar uzunluğu (piksel)
+        rng (numpy.random.Generator): Rastgele sayı üreteci
+
+    Dönüş:
+        numpy.ndarray: BGR görüntü
+    """
+    ramp = np.linspace(0, 255, size, dtype=np.float32)
+    img = np.dstack([
+        np.tile(ramp, (size, 1)),
+        np.tile(ramp[:, None], (1, size)),
+        np.full((size, size), 128, np.float32),
+    ])
+    img += rng.normal(0, 12, img.shape).astype(np.float32)
+    img = np.clip(img, 0, 255).astype(np.uint8)
+
+    for _ in range(20):
+        x, y = (int(v) for v in rng.integers(0, size, 2))
+        r = int(rng.integers(size // 40 + 1, size // 8 + 2))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.circle(img, (x, y), r, color, -1)
+
+    return img
+
+
+class _SyntheticTensor:
+    """NumPy dizisini torch tensörü arayüzüyle (cpu().numpy()) sunar."""
+
+    def __init__(self, array):
+        self._array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+
+class _SyntheticBoxes:
+    """ultralytics Boxes nesnesinin from_result için gereken kısmı."""
+
+    def __init__(self, data):
+        self.data = _SyntheticTensor(data)
+        self._n = len(data)
+
+    def __len__(self):
+        return self._n
+
+
+class _SyntheticResult:
+    """ultralytics Results nesnesinin from_result için gereken kısmı."""
+
+    def __init__(self, data, names):
+        self.boxes = _SyntheticBoxes(data)
+        self.names = names
+
+
+def synthetic_result(count, size, rng, num_classes=annotate.NUM_CLASSES):
+    """
+    Belirli sayıda kutu içeren yapay bir model sonucu üretir.
+
+    Parametreler:
+        count (int): Kutu sayısı
+        size (int): Görüntü kenar uzunluğu
+        rng (numpy.random.Generator): Rastgele sayı üreteci
+        num_classes (int): Sınıf sayısı
+
+    Dönüş:
+        Detections.from_result ile kullanılabilecek sonuç nesnesi
+    """
+    xy = rng.uniform(0, size * 0.9, (count, 2))
+    wh = rng.uniform(size * 0.01, size * 0.1, (count, 2))
+    data = np.column_stack([
+        xy, np.minimum(xy + wh, size),
+        rng.uniform(0.25, 1.0, count),
+        rng.integers(0, num_classes, count),
+    ]).astype(np.float32)
+    names = {i: f"class_{i}" for i in range(num_classes)}
+    return _SyntheticResult(data, names)
+
+
+# ==================== ÖLÇÜM ====================
+
+def measure(func, repeat, warmup, items=1):
+    """
+    Bir fonksiyonu tekrar tekrar çalıştırıp süre istatistiklerini hesaplar.
+
+    Parametreler:
+        func (callable): Ölçülecek fonksiyon (argümansız)
+        repeat (int): Ölçülen tekrar sayısı
+        warmup (int): Ölçüme katılmayan ilk tekrar sayısı
+        items (int): Bir çağrıda işlenen görüntü sayısı (verim için)
+
+    Dönüş:
+        dict: latency_ms (p50/p95/mean) ve throughput (görüntü/sn)
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    return {
+        'latency_ms': {
+            'p50': round(1000 * profiling.percentile(samples, 50), 4),
+            'p95': round(1000 * profiling.percentile(samples, 95), 4),
+            'mean': round(1000 * mean, 4),
+        },
+        'throughput': round(items / mean, 3) if mean > 0 else 0.0,
+    }
+
+
+def set_torch_threads(threads):
+    """PyTorch'un işlem içi iş parçacığı sayısını ayarlar (kuruluysa)."""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+# ==================== BENCHMARK AŞAMALARI ====================
+
+def bench_decode(sizes, threads, repeat, warmup, rng):
+    """JPEG decode verimini görüntü boyutu ve iş parçacığı sayısına göre ölçer."""
+    results = []
+    for size in sizes:
+        ok, encoded = cv2.imencode(
+            '.jpg', synthetic_image(size, rng),
+            [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+        )
+        data = encoded.tobytes()
+
+        for t in threads:
+            # Her iş parçacığı bir görüntü decode eder
+            with ThreadPoolExecutor(max_workers=t) as pool:
+                def run():
+                    list(pool.map(detection.decode_image, [data] * t))
+
+                stats = measure(run, repeat, warmup, items=t)
+
+            results.append({
+                'name': 'decode',
+                'params': {'size': size, 'threads': t},
+                **stats
+            })
+    return results
+
+
+def bench_inference(model, sizes, batch_sizes, threads, repeat, warmup, rng):
+    """Model çağrısını görüntü boyutu, batch ve iş parçacığına göre ölçer."""
+    results = []
+    images = {size: synthetic_image(size, rng) for size in sizes}
+
+    for t in threads:
+        set_torch_threads(t)
+        for size in sizes:
+            for batch in batch_sizes:
+                batch_images = [images[size]] * batch
+
+                def run():
+                    detection.detect_images(model, batch_images)
+
+                stats = measure(run, repeat, warmup, items=batch)
+                results.append({
+                    'name': 'inference',
+                    'params': {'size': size, 'batch': batch, 'threads': t},
+                    **stats
+                })
+    return results
+
+
+def bench_postprocess(box_counts, repeat, warmup, rng, size=1920):
+    """Son işleme ve çizimi kutu sayısına göre ölçer."""
+    results = []
+    canvas = synthetic_image(size, rng)
+
+    for count in box_counts:
+        result = synthetic_result(count, size, rng)
+
+        def post():
+            dets = detection.Detections.from_result(result)
+            dets.class_summary()
+            dets.to_records()
+
+        stats = measure(post, repeat, warmup)
+        results.append({
+            'name': 'postprocess', 'params': {'boxes': count}, **stats
+        })
+
+        dets = detection.Detections.from_result(result)
+        for labels in (True, False):
+            def draw():
+                annotate.draw_detections(canvas, dets, labels=labels)
+
+            stats = measure(draw, repeat, warmup)
+            results.append({
+                'name': 'draw',
+                'params': {'boxes': count, 'labels': labels},
+                **stats
+            })
+    return results
+
+
+# ==================== KARŞILAŞTIRMA ====================
+
+def result_key(result):
+    """Bir ölçümü tanımlayan anahtar (ad + sıralı parametreler)."""
+    params = ','.join(f"{k}={v}" for k, v in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]"
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Sonuçları temel sonuçlarla karşılaştırır.
+
+    Parametreler:
+        current (dict): Yeni sonuçlar
+        baseline (dict): Temel sonuçlar
+        threshold (float): İzin verilen en fazla verim düşüşü oranı
+
+    Dönüş:
+        list: (anahtar, temel verim, yeni verim, değişim oranı, gerileme mi)
+    """
+    base = {result_key(r): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current['results']:
+        key = result_key(result)
+        if key not in base:
+            continue
+        old = base[key]['throughput']
+        new = result['throughput']
+        change = (new - old) / old if old else 0.0
+        rows.append((key, old, new, change, change < -threshold))
+    return rows
+
+
+def environment():
+    """Ölçüm ortamının özet bilgisi (karşılaştırma için kaydedilir)."""
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+    }
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı, 1 = gerileme bulundu)
+    """
+    parser = argparse.ArgumentParser(
+        description="YOLO tespit hattı performans ölçümü"
+    )
+    parser.add_argument('--weights',
+                        help="Yerel model ağırlık dosyası (indirilmez)")
+    parser.add_argument('--backend', choices=('torch', 'onnx', 'openvino'),
+                        default='torch', help="Çıkarım arka ucu")
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=list(DEFAULT_SIZES), help="Görüntü boyutları")
+    parser.add_argument('--batch-sizes', type=int, nargs='+',
+                        default=list(DEFAULT_BATCH_SIZES), help="Batch boyutları")
+    parser.add_argument('--box-counts', type=int, nargs='+',
+                        default=list(DEFAULT_BOX_COUNTS), help="Kutu sayıları")
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=sorted(set(DEFAULT_THREADS)),
+                        help="İş parçacığı sayıları")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="Ölçüm başına tekrar sayısı")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                        help="Ölçüme katılmayan ısınma tekrarı")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help="Yapay veri tohumu")
+    parser.add_argument('--skip-inference', action='store_true',
+                        help="Model ölçümlerini atla")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--baseline', help="Karşılaştırılacak temel JSON dosyası")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Gerileme sayılan verim düşüşü oranı")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+
+    print("Decode ölçülüyor...", file=sys.stderr)
+    results += bench_decode(args.sizes, args.threads, args.repeat,
+                            args.warmup, rng)
+
+    print("Son işleme ve çizim ölçülüyor...", file=sys.stderr)
+    results += bench_postprocess(args.box_counts, args.repeat, args.warmup, rng)
+
+    if not args.skip_inference:
+        if not args.weights or not os.path.isfile(args.weights):
+            print("Model ölçümü atlandı: yerel --weights dosyası bulunamadı.",
+                  file=sys.stderr)
+        else:
+            print("Model çağrısı ölçülüyor...", file=sys.stderr)
+            if args.backend == 'torch':
+                model = detection.load_model(args.weights)
+            else:
+                import backends
+
+                model = backends.load_backend(args.weights, args.backend)
+            results += bench_inference(
+                model, args.sizes, args.batch_sizes, args.threads,
+                args.repeat, args.warmup, rng
+            )
+
+    report = {
+        'environment': environment(),
+        'config': {
+            'weights': os.path.basename(args.weights) if args.weights else None,
+            'backend': args.backend,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    for result in results:
+        print(
+            f"{result_key(result):<48} "
+            f"p50 {result['latency_ms']['p50']:>9.2f} ms  "
+            f"{result['throughput']:>10.1f} görüntü/sn",
+            file=sys.stderr
+        )
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    print("\nTemel sonuçlarla karşılaştırma:", file=sys.stderr)
+    for key, old, new, change, regressed in compare(report, baseline,
+                                                    args.threshold):
+        mark = 'GERİLEME' if regressed else 'ok'
+        regressions += regressed
+        print(f"{key:<48} {old:>10.1f} → {new:>10.1f} ({change:+.1%}) {mark}",
+              file=sys.stderr)
+
+    if regressions:
+        print(f"\n{regressions} ölçümde %{args.threshold * 100:.0f} üzeri "
+              f"gerileme var.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
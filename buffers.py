@@ -0,0 +1,203 @@
+"""
+Yeniden Kullanılabilir Görüntü Tamponları
+
+Bir görüntü dosyadan ekrana giderken her adımda yeni bir dizi ayrılıyordu:
+
+    f.read() → np.frombuffer → imdecode → resize → copy (çizim için)
+    → cvtColor → Image.fromarray → ImageTk.PhotoImage
+
+Bu modül bu kopyaların çoğunu kaldırır:
+
+• map_file: Dosya f.read() ile belleğe kopyalanmaz; mmap ile eşlenir
+  ve imdecode doğrudan eşlenmiş sayfalardan okur.
+• BufferPool: Gösterim boyutuna küçültme, çizim tuvali ve RGB dönüşümü
+  her seferinde yeni dizi ayırmak yerine adlandırılmış, önceden ayrılmış
+  dizilere yazar (cv2.resize / cv2.cvtColor 'dst' parametresi). Boyut
+  değişmedikçe aynı dizi tekrar kullanılır.
+• DisplaySurface: Her görüntü için yeni bir ImageTk.PhotoImage
+  oluşturmak yerine mevcut PhotoImage'ın içeriği paste ile güncellenir.
+
+Not: OpenCV'nin Python arayüzü imdecode için hedef dizi kabul etmez;
+decode edilen görüntü bu yüzden her zaman yeni bir dizidir.
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import mmap
+import threading
+import contextlib
+
+import cv2
+import numpy as np
+
+import profiling
+
+
+# ==================== DOSYA EŞLEME ====================
+
+@contextlib.contextmanager
+def map_file(path):
+    """
+    Dosyayı salt okunur olarak belleğe eşler.
+
+    Dosya içeriği kopyalanmaz. Eşlenen sayfalara 'read' aşamasında
+    sayfa başına bir bayt okunarak dokunulur; böylece diskten (veya
+    işletim sistemi önbelleğinden) okuma maliyeti 'decode' yerine
+    'read' aşamasında ölçülür.
+
+    Parametreler:
+        path (str): Dosya yolu
+
+    Dönüş:
+        Bağlam yöneticisi: Buffer protokolünü destekleyen salt okunur veri
+    """
+    with open(path, 'rb') as f:
+        # Boş dosyalar eşlenemez
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+
+        with profiling.stage('read'):
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            # Her sayfadan bir bayt okunur (sayfa hatası burada ödenir);
+            # geçici görünüm eşleme kapanmadan önce serbest kalır
+            np.frombuffer(mapped, np.uint8)[::mmap.PAGESIZE].sum()
+        try:
+            yield mapped
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                # Veriye bakan bir dizi hâlâ yaşıyorsa eşleme onunla kapanır
+                pass
+
+
+# ==================== TAMPON HAVUZU ====================
+
+class BufferPool:
+    """
+    Adlandırılmış, yeniden kullanılabilir NumPy dizileri.
+
+    Her ad (örn. 'display', 'canvas', 'rgb') için tek bir dizi tutulur;
+    istenen boyut veya tip değişirse dizi yeniden ayrılır.
+
+    Yalnızca tampon seçimi (get) iş parçacığı güvenlidir; döndürülen
+    diziler paylaşılır ve aynı adla yapılan sonraki çağrı içeriklerinin
+    üzerine yazar. Bir tampon başka bir iş parçacığına verilecekse
+    (örn. arka plan tespit işi) önce kopyalanmalı veya her iş parçacığı
+    kendi adını kullanmalıdır.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        İstenen boyutta bir tampon döndürür (içeriği tanımsızdır).
+
+        Parametreler:
+            name (str): Tampon adı
+            shape (tuple): Dizi boyutu
+            dtype: Dizi tipi
+
+        Dönüş:
+            numpy.ndarray: Yeniden kullanılan veya yeni ayrılan dizi
+        """
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        with self._lock:
+            buffer = self._buffers.get(name)
+            if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+                buffer = np.empty(shape, dtype)
+                self._buffers[name] = buffer
+                self.allocations += 1
+            return buffer
+
+    def resize(self, name, image, size, interpolation=cv2.INTER_AREA):
+        """
+        Görüntüyü verilen boyuta küçültüp adlandırılmış tampona yazar.
+
+        Parametreler:
+            name (str): Hedef tampon adı
+            image (numpy.ndarray): Kaynak görüntü
+            size (tuple): (genişlik, yükseklik)
+            interpolation (int): OpenCV interpolasyon yöntemi
+
+        Dönüş:
+            numpy.ndarray: Hedef tampon
+        """
+        width, height = size
+        dst = self.get(name, (height, width) + image.shape[2:], image.dtype)
+        with profiling.stage('resize'):
+            cv2.resize(image, (width, height), dst=dst,
+                       interpolation=interpolation)
+        return dst
+
+    def copy(self, name, image):
+        """
+        Görüntüyü adlandırılmış tampona kopyalar (yeni dizi ayırmadan).
+
+        Dönüş:
+            numpy.ndarray: Hedef tampon
+        """
+        dst = self.get(name, image.shape, image.dtype)
+        np.copyto(dst, image)
+        return dst
+
+    def to_rgb(self, name, image):
+        """
+        BGR görüntüyü RGB'ye çevirip adlandırılmış tampona yazar.
+
+        Dönüş:
+            numpy.ndarray: Hedef tampon
+        """
+        dst = self.get(name, image.shape, image.dtype)
+        with profiling.stage('color'):
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=dst)
+        return dst
+
+
+# ==================== TKINTER GÖSTERİM YÜZEYİ ====================
+
+class DisplaySurface:
+    """
+    Bir Tk Label'ında gösterilen ve yeniden kullanılan PhotoImage.
+
+    Boyut aynı kaldıkça yeni PhotoImage oluşturulmaz; piksel verisi
+    mevcut görüntüye paste ile yazılır.
+    """
+
+    def __init__(self, label, photo=None):
+        """
+        Parametreler:
+            label: Görüntünün gösterildiği tkinter Label
+            photo (ImageTk.PhotoImage): Başlangıç görüntüsü (örn. placeholder)
+        """
+        self.label = label
+        self.photo = photo
+
+    def show(self, rgb):
+        """
+        RGB görüntüyü gösterir.
+
+        Parametreler:
+            rgb (numpy.ndarray): RGB formatında görüntü
+        """
+        from PIL import Image, ImageTk
+
+        with profiling.stage('photoimage'):
+            image = Image.fromarray(rgb)
+            if (self.photo is not None
+                    and (self.photo.width(), self.photo.height()) == image.size):
+                self.photo.paste(image)
+                return
+
+            self.photo = ImageTk.PhotoImage(image)
+
+        self.label.config(image=self.photo)
+        self.label.image = self.photo  # Referansı tut (garbage collection önleme)
@@ -0,0 +1,330 @@
+"""
+Tespit Sonucu Önbelleği (İçerik Adresli)
+
+Aynı görüntü tekrar işlendiğinde (kullanıcı YOLO'ya yeniden bastığında
+veya toplu işlerde aynı dosya tekrar geldiğinde) tam ileri geçiş yeniden
+hesaplanmaz. Sonuçlar şu anahtarla saklanır:
+
+    özet(decode edilmiş piksel verisi + boyut) + model kimliği
+    + güven eşiği + giriş boyutu
+
+Dosya adı veya yolu anahtara girmez; farklı adla kaydedilmiş aynı
+görüntü de önbellekten gelir.
+
+Katmanlar:
+----------
+1. Bellek: LRU (en uzun süre kullanılmayan çıkarılır); hem kayıt sayısı
+   hem de toplam bayt ile sınırlıdır.
+2. Disk (opsiyonel): SQLite dosyası; program yeniden başlatıldığında da
+   korunur. Diskte bulunan kayıt belleğe de alınır.
+
+Sayaçlar: hits (bellek), disk_hits, misses, evictions.
+
+Kullanım:
+---------
+    result_cache = cache.DetectionCache(path='tespitler.sqlite')
+    model = cache.CachedModel(detection.load_model(), result_cache)
+    dets = detection.detect_images(model, images)   # önbellekli
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import detection
+
+# ==================== SABİTLER ====================
+
+# Bellek katmanındaki en fazla kayıt sayısı
+DEFAULT_MAX_ENTRIES = 4096
+
+# Bellek katmanının en fazla boyutu (bayt)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Her kayıt için sabit ek yük tahmini (Python nesneleri, anahtar)
+_ENTRY_OVERHEAD = 512
+
+
+# ==================== ANAHTAR OLUŞTURMA ====================
+
+def image_digest(image):
+    """
+    Decode edilmiş görüntünün içerik özetini hesaplar.
+
+    Parametreler:
+        image (numpy.ndarray): Görüntü
+
+    Dönüş:
+        str: Onaltılık özet
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((image.shape, image.dtype.str)).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def model_identity(model):
+    """
+    Modeli tanımlayan kararlı bir kimlik üretir.
+
+    Ağırlık dosyası biliniyorsa dosya adı ve içerik özeti kullanılır;
+    böylece ağırlıklar değiştiğinde eski sonuçlar kullanılmaz.
+
+    Parametreler:
+        model: YOLO modeli veya arka uç
+
+    Dönüş:
+        str: Model kimliği
+    """
+    identity = getattr(model, 'identity', None)
+    if identity:
+        return identity
+
+    path = getattr(model, 'ckpt_path', None)
+    if path and os.path.isfile(path):
+        import backends
+
+        return f"{os.path.basename(path)}:{backends.file_hash(path)}"
+
+    return type(model).__name__
+
+
+def make_key(image, model_id, conf, imgsz):
+    """
+    Önbellek anahtarını oluşturur.
+
+    Parametreler:
+        image (numpy.ndarray): Decode edilmiş görüntü
+        model_id (str): Model kimliği
+        conf (float): Güven eşiği
+        imgsz (int): Giriş boyutu
+
+    Dönüş:
+        str: Anahtar
+    """
+    return f"{image_digest(image)}|{model_id}|{conf:.4f}|{imgsz or 0}"
+
+
+# ==================== ÖNBELLEK ====================
+
+def _entry_size(dets):
+    """Bir kaydın bellekte kapladığı yaklaşık bayt sayısı."""
+    return (dets.boxes.nbytes + dets.confidences.nbytes
+            + dets.class_ids.nbytes + _ENTRY_OVERHEAD)
+
+
+class DetectionCache:
+    """
+    İki katmanlı (bellek LRU + opsiyonel SQLite) tespit önbelleği.
+
+    Tüm metotlar iş parçacığı güvenlidir.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, path=None,
+                 max_disk_entries=None):
+        """
+        Parametreler:
+            max_entries (int): Bellekteki en fazla kayıt sayısı
+            max_bytes (int): Bellek katmanının en fazla boyutu (bayt)
+            path (str): SQLite dosyası (None ise disk katmanı kapalı)
+            max_disk_entries (int): Diskteki en fazla kayıt sayısı
+                (None ise sınırsız)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS detections ("
+                " key TEXT PRIMARY KEY,"
+                " boxes BLOB, confidences BLOB, class_ids BLOB,"
+                " names TEXT, last_access REAL)"
+            )
+            self._db.commit()
+
+    # ---------- Bellek katmanı ----------
+
+    def _remember(self, key, dets):
+        """Kaydı bellek katmanına ekler ve sınırları aşan kayıtları çıkarır."""
+        if key in self._entries:
+            self._bytes -= _entry_size(self._entries.pop(key))
+
+        self._entries[key] = dets
+        self._bytes += _entry_size(dets)
+
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= _entry_size(old)
+            self.evictions += 1
+
+    # ---------- Disk katmanı ----------
+
+    def _load(self, key):
+        row = self._db.execute(
+            "SELECT boxes, confidences, class_ids, names FROM detections "
+            "WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._db.execute(
+            "UPDATE detections SET last_access = ? WHERE key = ?",
+            (time.time(), key)
+        )
+        boxes, confidences, class_ids, names = row
+        names = {int(k): v for k, v in json.loads(names).items()}
+        return detection.Detections(
+            np.frombuffer(boxes, np.int32),
+            np.frombuffer(confidences, np.float32),
+            np.frombuffer(class_ids, np.int32),
+            names
+        )
+
+    def _store(self, key, dets):
+        self._db.execute(
+            "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?)",
+            (key, dets.boxes.tobytes(), dets.confidences.tobytes(),
+             dets.class_ids.tobytes(),
+             json.dumps({int(k): v for k, v in dets.names.items()}),
+             time.time())
+        )
+
+        if self.max_disk_entries is not None:
+            # En uzun süre erişilmeyen kayıtları sil
+            cursor = self._db.execute(
+                "DELETE FROM detections WHERE key IN ("
+                " SELECT key FROM detections ORDER BY last_access DESC"
+                " LIMIT -1 OFFSET ?)", (self.max_disk_entries,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+    # ---------- Genel arayüz ----------
+
+    def get(self, key):
+        """
+        Anahtara karşılık gelen tespitleri döndürür.
+
+        Dönüş:
+            Detections veya None (önbellekte yoksa)
+        """
+        with self._lock:
+            dets = self._entries.get(key)
+            if dets is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dets
+
+            if self._db is not None:
+                dets = self._load(key)
+                if dets is not None:
+                    self._remember(key, dets)
+                    self.disk_hits += 1
+                    return dets
+
+            self.misses += 1
+            return None
+
+    def put(self, key, dets):
+        """Tespitleri önbelleğe ekler."""
+        with self._lock:
+            self._remember(key, dets)
+            if self._db is not None:
+                self._store(key, dets)
+
+    def flush(self):
+        """Disk katmanındaki bekleyen yazmaları kalıcı hale getirir."""
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+
+    def close(self):
+        """Disk katmanını kapatır."""
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def stats(self):
+        """
+        Önbellek sayaçlarını döndürür.
+
+        Dönüş:
+            dict: hits, disk_hits, misses, evictions, entries, bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+# ==================== ÖNBELLEKLİ MODEL ====================
+
+class CachedModel:
+    """
+    Bir modeli önbellekle saran arka uç.
+
+    detection.detect_images bu nesnenin detect() metodunu çağırır;
+    yalnızca önbellekte bulunmayan görüntüler gerçek modele tek bir
+    batch halinde verilir.
+    """
+
+    def __init__(self, model, result_cache, model_id=None):
+        """
+        Parametreler:
+            model: YOLO modeli veya arka uç
+            result_cache (DetectionCache): Kullanılacak önbellek
+            model_id (str): Model kimliği (None ise otomatik hesaplanır)
+        """
+        self.model = model
+        self.cache = result_cache
+        self.identity = model_id or model_identity(model)
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None):
+        """
+        Görüntüleri önbellek üzerinden işler.
+
+        Dönüş:
+            list: Her görüntü için Detections
+        """
+        keys = [make_key(img, self.identity, conf, imgsz) for img in images]
+        results = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, dets in enumerate(results) if dets is None]
+        if missing:
+            computed = detection.detect_images(
+                self.model, [images[i] for i in missing], conf, imgsz
+            )
+            for i, dets in zip(missing, computed):
+                self.cache.put(keys[i], dets)
+                results[i] = dets
+            self.cache.flush()
+
+        return results
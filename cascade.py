@@ -0,0 +1,393 @@
+"""
+Kademeli (Adaptif) Çıkarım
+
+Görüntülerin çoğu küçük modelle (yolov8n) doğru işlenir; yalnızca zor
+görüntüler büyük modele (veya daha yüksek çözünürlüğe) gönderilir.
+Böylece görüntü başına ortalama maliyet düşer, sonuçlar büyük modele
+yakın kalır.
+
+Kademeler:
+----------
+Her kademe bir model adı ve opsiyonel giriş boyutudur:
+    'yolov8n'        → nano, varsayılan giriş boyutu
+    'yolov8n@1280'   → nano, 1280 piksel giriş
+    'yolov8m'        → medium
+
+İlk kademe tüm görüntüleri işler. Bir görüntü aşağıdaki durumlardan
+biri varsa bir sonraki kademeye yükseltilir (escalation):
+• uncertain   : Güveni belirsizlik bandında [low, high) olan tespit
+                sayısı max_uncertain'dan fazla (varsayılan: 2)
+• few_classes : Güven eşiğini geçen farklı sınıf sayısı min_classes'tan
+                az (varsayılan kapalı; gerçek görüntülerin çoğunda
+                5'ten az sınıf bulunur ve hemen her görüntü
+                yükseltilir)
+
+Varsayılanlar yükseltmeyi gerçekten belirsiz görüntülere sınırlar:
+tek bir zayıf kutu yüzünden görüntü büyük modele gitseydi neredeyse
+her görüntü iki modelde de çalışır, maliyet büyük modelin tek başına
+maliyetini aşardı.
+
+Birleştirme:
+------------
+Yükseltilen görüntüde sonraki kademenin tespitleri esas alınır.
+Önceki kademenin yüksek güvenli (≥ high) ve sonraki kademede aynı
+sınıftan örtüşen kutusu olmayan tespitleri korunur.
+
+İstatistikler:
+--------------
+Her kademe için giren görüntü sayısı, yükseltme oranı, yükseltme
+nedenleri ve görüntü başına süre; toplamda görüntü başına ortalama
+maliyet (stats()).
+
+Kullanım:
+---------
+    models = registry.ModelRegistry()
+    model = CascadeModel(models, ['yolov8n', 'yolov8m'])
+    dets = detection.detect_images(model, images)
+    print(model.stats())
+
+    python cascade.py resimler/ --stages yolov8n yolov8m --compare
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import sys
+import json
+import time
+import argparse
+import threading
+
+import numpy as np
+
+import detection
+import profiling
+import registry
+import tracker
+
+# ==================== SABİTLER ====================
+
+# Arayüzde kademeli modu seçen ad
+AUTO = 'auto'
+
+# Varsayılan kademeler (küçükten büyüğe)
+DEFAULT_STAGES = ('yolov8n', 'yolov8m')
+
+# Belirsizlik bandı (güven skoru): [low, high). Alt sınır çıktı güven
+# eşiğidir; eşiğin altındaki zayıf adaylar hemen her görüntüde bulunur
+DEFAULT_BAND = (detection.DEFAULT_CONF, 0.5)
+
+# Bantta izin verilen tespit sayısı (fazlası görüntüyü yükseltir)
+DEFAULT_MAX_UNCERTAIN = 2
+
+# Önceki kademenin kutusunun sonraki kademede karşılığı sayılması için IoU
+MERGE_IOU = 0.5
+
+# Yükseltme nedenleri
+REASONS = ('uncertain', 'few_classes')
+
+
+def parse_stage(spec):
+    """
+    Kademe tanımını ayrıştırır.
+
+    Parametreler:
+        spec (str veya tuple): 'yolov8m', 'yolov8n@1280' veya (ad, boyut)
+
+    Dönüş:
+        tuple: (model adı, giriş boyutu veya None)
+
+    Hata:
+        ValueError: Giriş boyutu sayı değilse
+    """
+    if isinstance(spec, tuple):
+        return spec
+    name, _, size = spec.partition('@')
+    return name, int(size) if size else None
+
+
+def merge_stages(previous, current, keep_conf, iou=MERGE_IOU):
+    """
+    Önceki kademenin güvenli tespitlerini sonraki kademeninkilere ekler.
+
+    Parametreler:
+        previous (Detections): Önceki kademe
+        current (Detections): Sonraki kademe (esas alınır)
+        keep_conf (float): Önceki kademeden korunacak en düşük güven
+        iou (float): Aynı nesne sayılması için en düşük IoU
+
+    Dönüş:
+        Detections: Birleştirilmiş tespitler
+    """
+    previous = previous.filter(min_conf=keep_conf)
+    if not len(previous):
+        return current
+
+    scores = tracker.iou_matrix(previous.boxes, current.boxes)
+    scores[previous.class_ids[:, None] != current.class_ids[None, :]] = 0
+    covered = (scores >= iou).any(axis=1)
+    return detection.Detections.concatenate(
+        [current, previous.select(~covered)], current.names or previous.names
+    )
+
+
+# ==================== KADEMELİ MODEL ====================
+
+class CascadeModel:
+    """
+    Kademeli çıkarım yapan arka uç.
+
+    detection.detect_images bu nesnenin detect() metodunu çağırır.
+    Modeller kayıt defterinden alınır; büyük model yalnızca ilk
+    yükseltmede yüklenir.
+    """
+
+    def __init__(self, models, stages=DEFAULT_STAGES, band=DEFAULT_BAND,
+                 min_classes=0, max_uncertain=DEFAULT_MAX_UNCERTAIN,
+                 merge_iou=MERGE_IOU):
+        """
+        Parametreler:
+            models (registry.ModelRegistry): Model kayıt defteri
+            stages (list): Kademeler (bkz. parse_stage), küçükten büyüğe
+            band (tuple): Belirsizlik bandı (low, high)
+            min_classes (int): Bu sayıdan az farklı sınıf varsa yükselt
+                (0: kontrol yok)
+            max_uncertain (int): Banttaki izin verilen tespit sayısı
+            merge_iou (float): Birleştirmede örtüşme eşiği
+
+        Hata:
+            ValueError: Kademe yoksa veya bant geçersizse
+            KeyError: Bilinmeyen model adı
+        """
+        self.stages = [parse_stage(spec) for spec in stages]
+        if not self.stages:
+            raise ValueError("En az bir kademe gerekli")
+        if not 0 <= band[0] < band[1] <= 1:
+            raise ValueError(f"Geçersiz belirsizlik bandı: {band}")
+
+        self.models = models
+        self.stages = [(models.resolve(name), size)
+                       for name, size in self.stages]
+        self.band = tuple(band)
+        self.min_classes = min_classes
+        self.max_uncertain = max_uncertain
+        self.merge_iou = merge_iou
+
+        # Önbellek anahtarı tüm ayarları içerir
+        self.identity = 'cascade:{}|{:g}-{:g}|{}|{}'.format(
+            '>'.join(f"{name}@{size or 0}" for name, size in self.stages),
+            self.band[0], self.band[1], min_classes, max_uncertain
+        )
+
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Kademe istatistiklerini sıfırlar."""
+        with self._lock:
+            self._entered = [0] * len(self.stages)
+            self._escalated = [0] * len(self.stages)
+            self._seconds = [0.0] * len(self.stages)
+            self._reasons = [dict.fromkeys(REASONS, 0) for _ in self.stages]
+
+    def escalation_reasons(self, dets, conf):
+        """
+        Görüntünün bir sonraki kademeye yükseltilme nedenleri.
+
+        Parametreler:
+            dets (Detections): Kademenin tespitleri (bant altı dahil)
+            conf (float): Çıktı güven eşiği
+
+        Dönüş:
+            list: REASONS içinden nedenler (boşsa yükseltme yok)
+        """
+        low, high = self.band
+        reasons = []
+
+        uncertain = (dets.confidences >= low) & (dets.confidences < high)
+        if np.count_nonzero(uncertain) > self.max_uncertain:
+            reasons.append('uncertain')
+
+        if self.min_classes:
+            confident = dets.class_ids[dets.confidences >= conf]
+            if len(np.unique(confident)) < self.min_classes:
+                reasons.append('few_classes')
+        return reasons
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None):
+        """
+        Görüntüleri kademeli olarak işler.
+
+        Parametreler:
+            images (list): BGR görüntüler
+            conf (float): Çıktı güven eşiği
+            imgsz (int): Giriş boyutu belirtilmeyen kademelerin boyutu
+
+        Dönüş:
+            list: Her görüntü için Detections (giriş sırasıyla)
+        """
+        # Bant altındaki tespitler de görülmeli: model düşük eşikle çalışır
+        low = min(self.band[0], conf)
+        last = len(self.stages) - 1
+
+        results = [None] * len(images)
+        pending = list(range(len(images)))
+
+        for k, (name, size) in enumerate(self.stages):
+            start = time.perf_counter()
+            with profiling.stage(f'cascade.{k}.{name}'):
+                stage_results = self.models.detect(
+                    [images[i] for i in pending], low, size or imgsz,
+                    model=name
+                )
+            elapsed = time.perf_counter() - start
+
+            escalate = []
+            reasons = dict.fromkeys(REASONS, 0)
+            for i, dets in zip(pending, stage_results):
+                if k < last:
+                    found = self.escalation_reasons(dets, conf)
+                    if found:
+                        escalate.append(i)
+                        for reason in found:
+                            reasons[reason] += 1
+
+                if results[i] is None:
+                    results[i] = dets
+                else:
+                    results[i] = merge_stages(results[i], dets,
+                                              self.band[1], self.merge_iou)
+
+            with self._lock:
+                self._entered[k] += len(pending)
+                self._escalated[k] += len(escalate)
+                self._seconds[k] += elapsed
+                for reason, count in reasons.items():
+                    self._reasons[k][reason] += count
+
+            pending = escalate
+            if not pending:
+                break
+
+        return [dets.filter(min_conf=conf) for dets in results]
+
+    def stats(self):
+        """
+        Kademe ve maliyet istatistikleri.
+
+        Dönüş:
+            dict: images, ms_per_image, final_stage_rate ve her kademe
+            için model, imgsz, images, escalated, escalation_rate,
+            reasons, ms_per_image
+        """
+        with self._lock:
+            images = self._entered[0]
+            stages = [
+                {
+                    'model': name,
+                    'imgsz': size,
+                    'images': entered,
+                    'escalated': escalated,
+                    'escalation_rate': round(escalated / entered, 4)
+                    if entered else 0.0,
+                    'reasons': dict(reasons),
+                    'ms_per_image': round(1000 * seconds / entered, 3)
+                    if entered else 0.0,
+                }
+                for (name, size), entered, escalated, seconds, reasons in zip(
+                    self.stages, self._entered, self._escalated,
+                    self._seconds, self._reasons
+                )
+            ]
+            total = sum(self._seconds)
+            return {
+                'images': images,
+                # Görüntü başına ortalama maliyet (tüm kademeler dahil)
+                'ms_per_image': round(1000 * total / images, 3)
+                if images else 0.0,
+                # Son kademeye kadar yükseltilen görüntülerin oranı
+                'final_stage_rate': round(self._entered[-1] / images, 4)
+                if images else 0.0,
+                'stages': stages,
+            }
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="Kademeli çıkarım: yükseltme oranları ve büyük modele "
+                    "göre doğruluk/maliyet"
+    )
+    parser.add_argument('sources', nargs='+',
+                        help="Görüntü dizini veya dosya yolları")
+    parser.add_argument('--stages', nargs='+', default=list(DEFAULT_STAGES),
+                        help="Kademeler (örn. yolov8n yolov8n@1280 yolov8m)")
+    parser.add_argument('--band', nargs=2, type=float,
+                        default=list(DEFAULT_BAND), metavar=('LOW', 'HIGH'),
+                        help="Belirsizlik bandı")
+    parser.add_argument('--min-classes', type=int, default=0,
+                        help="Bu sayıdan az farklı sınıf varsa yükselt")
+    parser.add_argument('--max-uncertain', type=int,
+                        default=DEFAULT_MAX_UNCERTAIN,
+                        help="Bantta izin verilen tespit sayısı")
+    parser.add_argument('--conf', type=float, default=detection.DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--batch-size', type=int,
+                        default=detection.DEFAULT_BATCH_SIZE,
+                        help="Model çağrısı başına görüntü sayısı")
+    parser.add_argument('--compare', action='store_true',
+                        help="Son kademe modeliyle tek başına karşılaştır "
+                             "(doğruluk ve hızlanma)")
+    parser.add_argument('--output', help="Raporun yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    paths = detection.list_images(args.sources)
+    if not paths:
+        print("İşlenecek görüntü bulunamadı.", file=sys.stderr)
+        return 1
+
+    models = registry.ModelRegistry()
+    model = CascadeModel(models, args.stages, args.band, args.min_classes,
+                         args.max_uncertain)
+
+    report = {}
+    if args.compare:
+        import quantize
+
+        images = [img for img in map(detection.read_image, paths)
+                  if img is not None]
+        # Referans, son kademenin giriş boyutuyla çalışır; kademeli model
+        # kendi kademe boyutlarını kullanır. Isınma istatistiklere girmez.
+        name, size = model.stages[-1]
+        with models.use(name) as large:
+            report['comparison'] = quantize.drift_report(
+                large, model, images, args.conf,
+                labels=(name, 'cascade'), sizes=(size, None)
+            )
+    else:
+        for _, _, error in detection.detect_paths(model, paths, args.conf,
+                                                  args.batch_size):
+            if error is not None:
+                print(error, file=sys.stderr)
+
+    report['cascade'] = model.stats()
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
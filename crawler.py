@@ -0,0 +1,434 @@
+"""
+Artımlı ve Kaldığı Yerden Devam Eden Dizin Tarayıcı
+
+Büyük ve sürekli büyüyen bir dizin ağacında yalnızca yeni veya
+değişmiş görüntüler işlenir. İşlenen her dosya bir manifest
+(SQLite) dosyasına kaydedilir:
+
+    yol, boyut, değişiklik zamanı (mtime), içerik özeti, durum, hata
+
+Atlama Kuralları:
+-----------------
+• Boyut ve mtime manifestteki ile aynıysa dosya açılmaz bile.
+• Boyut/mtime değişmiş ama içerik özeti aynıysa (örn. dosyaya yalnızca
+  dokunulmuş) yalnızca manifest güncellenir, tespit yapılmaz.
+• Decode edilemeyen dosyalar arayüzdeki gibi hata penceresi açmaz;
+  manifestte 'failed' olarak kayıtlıdır ve dosya değişmedikçe
+  (veya --retry-failed verilmedikçe) tekrar denenmez.
+
+Manifest her batch'ten sonra kalıcı hale getirilir; program çökerse
+en fazla son batch yeniden işlenir.
+
+İzleme Modu:
+------------
+--watch SANİYE ile ağaç belirtilen aralıklarla yeniden taranır
+(inotify benzeri yoklama). Hâlâ kopyalanmakta olan dosyaları
+yakalamamak için son değişikliği --settle saniyeden yeni olan
+dosyalar bir sonraki taramaya bırakılır.
+
+Kullanım:
+---------
+    python crawler.py /veri/resimler --manifest manifest.sqlite
+    python crawler.py /veri/resimler --watch 10 --export sonuclar.csv --resume
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+import buffers
+import detection
+
+# ==================== SABİTLER ====================
+
+# Varsayılan manifest dosyası
+DEFAULT_MANIFEST = 'manifest.sqlite'
+
+# Son değişikliğinden bu yana en az bu kadar saniye geçmemiş dosyalar
+# henüz yazılıyor olabilir; sonraki taramaya bırakılır
+DEFAULT_SETTLE = 2.0
+
+# Dosya durumları
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+# ==================== DOSYA TARAMA ====================
+
+def walk_images(root):
+    """
+    Dizin ağacındaki görüntü dosyalarını özyinelemeli olarak listeler.
+
+    os.scandir kullanılır; dosya boyutu ve mtime ayrı bir stat
+    çağrısı gerektirmeden dizin girdisinden alınır.
+
+    Parametreler:
+        root (str): Kök dizin (veya tek bir dosya)
+
+    Dönüş:
+        generator: (yol, boyut, mtime_ns) üçlüleri (sıralı)
+    """
+    if os.path.isfile(root):
+        st = os.stat(root)
+        yield root, st.st_size, st.st_mtime_ns
+        return
+
+    try:
+        entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except OSError:
+        return
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_images(entry.path)
+            elif entry.name.lower().endswith(detection.IMAGE_EXTENSIONS):
+                st = entry.stat()
+                yield entry.path, st.st_size, st.st_mtime_ns
+        except OSError:
+            # Tarama sırasında silinen dosya
+            continue
+
+
+def read_and_hash(path):
+    """
+    Dosyayı bir kez okuyup hem içerik özetini hem görüntüyü üretir.
+
+    Parametreler:
+        path (str): Görüntü dosyası
+
+    Dönüş:
+        tuple: (onaltılık özet, görüntü veya None, hata mesajı veya None)
+    """
+    try:
+        with buffers.map_file(path) as data:
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            img = detection.decode_image(data)
+    except (OSError, ValueError, cv2.error) as e:
+        return None, None, str(e)
+
+    if img is None:
+        return digest, None, "Görüntü decode edilemedi"
+    return digest, img, None
+
+
+# ==================== MANİFEST ====================
+
+class Manifest:
+    """İşlenmiş dosyaların SQLite kaydı."""
+
+    def __init__(self, path=DEFAULT_MANIFEST):
+        """
+        Parametreler:
+            path (str): SQLite dosyası
+        """
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER, mtime_ns INTEGER, hash TEXT,"
+            " status TEXT, error TEXT, processed_at REAL)"
+        )
+        self._db.commit()
+
+    def lookup(self, path):
+        """
+        Dosyanın kaydını döndürür.
+
+        Dönüş:
+            tuple: (size, mtime_ns, hash, status) veya None
+        """
+        return self._db.execute(
+            "SELECT size, mtime_ns, hash, status FROM files WHERE path = ?",
+            (path,)
+        ).fetchone()
+
+    def record(self, path, size, mtime_ns, digest, status, error=None):
+        """Dosyanın işlenme sonucunu kaydeder (commit edilmez)."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, digest, status, error, time.time())
+        )
+
+    def forget(self, path):
+        """Dosyanın kaydını siler; sonraki taramada yeniden işlenir."""
+        self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def commit(self):
+        """Bekleyen kayıtları kalıcı hale getirir."""
+        self._db.commit()
+
+    def counts(self):
+        """
+        Durum başına dosya sayısı.
+
+        Dönüş:
+            dict: durum → sayı
+        """
+        return dict(self._db.execute(
+            "SELECT status, COUNT(*) FROM files GROUP BY status"
+        ).fetchall())
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+
+# ==================== TARAYICI ====================
+
+class Crawler:
+    """
+    Dizin ağacını tarar ve yalnızca yeni/değişmiş görüntüleri işler.
+    """
+
+    def __init__(self, model, manifest, conf=detection.DEFAULT_CONF,
+                 batch_size=detection.DEFAULT_BATCH_SIZE, imgsz=None,
+                 read_workers=4, settle=DEFAULT_SETTLE, retry_failed=False,
+                 on_result=None, before_commit=None):
+        """
+        Parametreler:
+            model: Yüklenmiş model (detection.detect_images ile uyumlu)
+            manifest (Manifest): İşlenmiş dosya kaydı
+            conf (float): Minimum güven eşiği
+            batch_size (int): Model çağrısı başına görüntü sayısı
+            imgsz (int): Model giriş boyutu
+            read_workers (int): Paralel okuma/decode iş parçacığı sayısı
+            settle (float): Yeni değişmiş dosyaları bekletme süresi (sn)
+            retry_failed (bool): Değişmemiş hatalı dosyaları yeniden dene
+            on_result (callable): on_result(yol, Detections, hata) —
+                her dosya için çağrılır (hata varsa Detections None)
+            before_commit (callable): Manifest her batch'te kalıcı hale
+                getirilmeden önce çağrılır; on_result ile yazılan
+                sonuçları diske aktarmalıdır (örn. exporter.flush).
+                Aksi halde çökme sonrası 'done' işaretli dosyaların
+                sonuçları kaybolur.
+        """
+        self.model = model
+        self.manifest = manifest
+        self.conf = conf
+        self.batch_size = batch_size
+        self.imgsz = imgsz
+        self.settle = settle
+        self.retry_failed = retry_failed
+        self.on_result = on_result
+        self.before_commit = before_commit
+        self._pool = ThreadPoolExecutor(max_workers=max(1, read_workers),
+                                        thread_name_prefix='crawl')
+
+        # Son taramanın sayaçları
+        self.stats = {}
+
+    def _needs_processing(self, path, size, mtime_ns):
+        """Boyut/mtime kontrolü (dosya açılmadan)."""
+        row = self.manifest.lookup(path)
+        if row is None:
+            return True
+        old_size, old_mtime, _, status = row
+        if (old_size, old_mtime) != (size, mtime_ns):
+            return True
+        return status == STATUS_FAILED and self.retry_failed
+
+    def pending(self, roots):
+        """
+        İşlenmesi gereken dosyaları listeler.
+
+        Dönüş:
+            generator: (yol, boyut, mtime_ns) üçlüleri
+        """
+        cutoff = time.time_ns() - int(self.settle * 1e9)
+        for root in roots:
+            for path, size, mtime_ns in walk_images(root):
+                if mtime_ns > cutoff:
+                    self.stats['unsettled'] += 1
+                    continue
+                if self._needs_processing(path, size, mtime_ns):
+                    yield path, size, mtime_ns
+                else:
+                    self.stats['skipped'] += 1
+
+    def _process_batch(self, batch):
+        """Bir batch dosyayı okur, tespit yapar ve manifeste yazar."""
+        loaded = list(self._pool.map(lambda item: read_and_hash(item[0]),
+                                     batch))
+
+        images, valid = [], []
+        for (path, size, mtime_ns), (digest, img, error) in zip(batch, loaded):
+            if error is not None:
+                self.manifest.record(path, size, mtime_ns, digest,
+                                     STATUS_FAILED, error)
+                self.stats['failed'] += 1
+                if self.on_result is not None:
+                    self.on_result(path, None, error)
+                continue
+
+            row = self.manifest.lookup(path)
+            if (row is not None and row[2] == digest
+                    and row[3] == STATUS_DONE):
+                # İçerik aynı: yalnızca boyut/mtime güncellenir
+                self.manifest.record(path, size, mtime_ns, digest,
+                                     STATUS_DONE)
+                self.stats['unchanged'] += 1
+                continue
+
+            images.append(img)
+            valid.append((path, size, mtime_ns, digest))
+
+        results = detection.detect_images(self.model, images, self.conf,
+                                          self.imgsz) if images else []
+        for (path, size, mtime_ns, digest), dets in zip(valid, results):
+            if self.on_result is not None:
+                self.on_result(path, dets, None)
+            self.manifest.record(path, size, mtime_ns, digest, STATUS_DONE)
+            self.stats['processed'] += 1
+
+        # Önce sonuçlar diske aktarılır, sonra manifest kalıcı hale
+        # getirilir; çökmede 'done' kaydı olup sonucu olmayan dosya kalmaz
+        if self.before_commit is not None:
+            self.before_commit()
+        self.manifest.commit()
+
+    def scan(self, roots):
+        """
+        Ağaçları bir kez tarar ve bekleyen dosyaları işler.
+
+        Parametreler:
+            roots (list): Kök dizinler
+
+        Dönüş:
+            dict: processed, unchanged, skipped, failed, unsettled sayaçları
+        """
+        self.stats = dict.fromkeys(
+            ('processed', 'unchanged', 'skipped', 'failed', 'unsettled'), 0
+        )
+        for batch in detection.batched(self.pending(roots), self.batch_size):
+            self._process_batch(batch)
+        return dict(self.stats)
+
+    def watch(self, roots, interval, stop=None):
+        """
+        Ağaçları belirtilen aralıklarla yeniden tarar.
+
+        Parametreler:
+            roots (list): Kök dizinler
+            interval (float): Taramalar arası bekleme (saniye)
+            stop (threading.Event): Set edilince izleme biter
+
+        Dönüş:
+            generator: Her taramanın sayaçları
+        """
+        while stop is None or not stop.is_set():
+            yield self.scan(roots)
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
+
+    def close(self):
+        self._pool.shutdown()
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="Yalnızca yeni/değişmiş görüntüleri işleyen dizin tarayıcı"
+    )
+    parser.add_argument('roots', nargs='+', help="Taranacak dizinler")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help="İşlenmiş dosya manifesti (SQLite)")
+    parser.add_argument('--weights', default=detection.DEFAULT_WEIGHTS,
+                        help="Model ağırlık dosyası")
+    parser.add_argument('--conf', type=float, default=detection.DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--batch-size', type=int,
+                        default=detection.DEFAULT_BATCH_SIZE,
+                        help="Model çağrısı başına görüntü sayısı")
+    parser.add_argument('--imgsz', type=int, default=None,
+                        help="Model giriş boyutu")
+    parser.add_argument('--read-workers', type=int, default=4,
+                        help="Paralel okuma/decode iş parçacığı sayısı")
+    parser.add_argument('--watch', type=float, default=None,
+                        help="Ağacı bu aralıkla (saniye) yeniden tara")
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE,
+                        help="Son değişikliği bundan yeni dosyaları bekletir")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help="Daha önce hata veren dosyaları yeniden dene")
+    parser.add_argument('--export',
+                        help="Sonuçları akış halinde bu dosyaya yaz "
+                             "(.jsonl, .csv veya .parquet dizini)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Mevcut --export dosyasına ekle")
+    args = parser.parse_args(argv)
+
+    model = detection.load_model(args.weights)
+
+    manifest = Manifest(args.manifest)
+
+    exporter = None
+    if args.export:
+        import export
+
+        exporter = export.open_exporter(args.export, resume=args.resume)
+        # Devam ederken çıktıdan silinen görüntüler manifestte 'done'
+        # kalırsa hiç yeniden işlenmez; sonuçları kalıcı olarak kaybolur
+        for path in exporter.truncated:
+            manifest.forget(path)
+        manifest.commit()
+
+    def on_result(path, dets, error):
+        if error is not None:
+            print(json.dumps({'image': path, 'error': error},
+                             ensure_ascii=False))
+        elif exporter is not None:
+            exporter.write(path, dets)
+        else:
+            print(json.dumps({'image': path, 'objects': dets.to_records()},
+                             ensure_ascii=False))
+
+    def before_commit():
+        if exporter is not None:
+            exporter.flush()
+        sys.stdout.flush()
+
+    crawler = Crawler(model, manifest, args.conf, args.batch_size, args.imgsz,
+                      args.read_workers, args.settle, args.retry_failed,
+                      on_result, before_commit)
+
+    try:
+        if args.watch is None:
+            scans = [crawler.scan(args.roots)]
+        else:
+            scans = crawler.watch(args.roots, args.watch)
+        for stats in scans:
+            print(f"Tarama: {json.dumps(stats)}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        crawler.close()
+        if exporter is not None:
+            exporter.close()
+        print(f"Manifest: {json.dumps(manifest.counts())}", file=sys.stderr)
+        manifest.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,975 @@
+"""
+YOLO Tespit Motoru (GUI'siz)
+
+Bu modül, Tkinter arayüzünden tamamen bağımsız çalışan tespit motorunu içerir.
+main.py içindeki arayüz de tespit işlemleri için bu modülü kullanır; böylece
+aynı kod bir sunucudan, cron görevinden veya komut satırından da çalıştırılabilir.
+
+Özellikler:
+-----------
+• Tek bir dizin veya görüntü yolu listesi kabul eder
+• Görüntüler modele gerçek toplu (batch) çağrılarla verilir
+  (her görüntü için ayrı model(...) çağrısı yapılmaz)
+• Dosya okuma/decode işlemi çıkarımla paralel yürütülür (pipeline.py)
+• İşlem sonunda saniyedeki görüntü sayısı (images/sec) raporlanır
+
+Komut Satırı Kullanımı:
+-----------------------
+    python detection.py resimler/ --batch-size 8 --conf 0.25
+    python detection.py a.jpg b.jpg c.png
+
+Her görüntü için bir satır JSON (JSON Lines) standart çıktıya yazılır,
+özet bilgiler ise standart hata çıktısına (stderr) yazılır.
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+import buffers
+import profiling
+
+# ultralytics: YOLOv8 modeli için (opsiyonel bağımlılık)
+try:
+    from ultralytics import YOLO
+
+    YOLO_AVAILABLE = True
+except ImportError:
+    YOLO_AVAILABLE = False
+
+# ==================== SABİTLER ====================
+
+# Varsayılan model ağırlıkları (nano: en hızlı sürüm)
+DEFAULT_WEIGHTS = 'yolov8n.pt'
+
+# Varsayılan güven eşiği (0.25 = %25)
+DEFAULT_CONF = 0.25
+
+# Tek bir model çağrısında işlenecek görüntü sayısı
+DEFAULT_BATCH_SIZE = 8
+
+# Model giriş boyutu (YOLOv8 varsayılanı); ısınma geçişlerinde kullanılır
+DEFAULT_IMGSZ = 640
+
+# Desteklenen görüntü uzantıları (dosya seçme dialoguyla aynı)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp')
+
+
+# ==================== MODEL YÜKLEME ====================
+
+def load_model(weights=DEFAULT_WEIGHTS):
+    """
+    YOLO modelini yükler.
+
+    Parametreler:
+        weights (str): Model ağırlık dosyası (örn. 'yolov8n.pt')
+
+    Dönüş:
+        YOLO: Yüklenmiş YOLO modeli
+
+    Hata:
+        RuntimeError: ultralytics kütüphanesi yüklü değilse
+    """
+    if not YOLO_AVAILABLE:
+        raise RuntimeError(
+            "YOLO kütüphanesi yüklü değil! "
+            "Kurulum için: pip install ultralytics"
+        )
+
+    # İlk çalıştırmada model otomatik indirilir (~6MB)
+    return YOLO(weights)
+
+
+def warmup(model, imgsz=DEFAULT_IMGSZ, runs=1, batch_size=1):
+    """
+    Modeli boş (siyah) görüntülerle ısıtır.
+
+    İlk model çağrısı; grafik oluşturma, bellek ayırıcı hazırlığı ve
+    ön işleme kurulumu nedeniyle sonraki çağrılardan kat kat yavaştır.
+    Bu maliyet ilk gerçek görüntü gelmeden önce ödenir.
+
+    Parametreler:
+        model: Yüklenmiş YOLO modeli
+        imgsz (int): Isınma görüntülerinin kenar uzunluğu (giriş boyutu)
+        runs (int): İleri geçiş sayısı
+        batch_size (int): Her geçişteki görüntü sayısı
+
+    Dönüş:
+        float: Isınma süresi (saniye)
+    """
+    dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(runs):
+        detect_images(model, [dummy] * batch_size, imgsz=imgsz)
+    return time.perf_counter() - start
+
+
+# ==================== GÖRÜNTÜ OKUMA ====================
+
+# Tek bir dosyanın okunması/decode edilmesi sırasında oluşabilecek
+# hatalar (boş dosyada cv2.imdecode cv2.error fırlatır). Bu hatalar
+# toplu işleri durdurmaz; dosya hata mesajıyla raporlanır.
+READ_ERRORS = (OSError, ValueError, cv2.error)
+
+# Küçültme oranı → OpenCV okuma bayrağı. JPEG'de küçültme decode
+# sırasında (libjpeg DCT ölçekleme) yapılır; tam çözünürlüklü görüntü
+# hiç oluşturulmaz.
+REDUCED_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# Görüntü boyutunu taşıyan JPEG SOF işaretçileri
+# (0xC4 DHT, 0xC8 JPG ve 0xCC DAC bu aralıkta olduğu halde SOF değildir)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def jpeg_size(data):
+    """
+    JPEG başlığından görüntü boyutunu okur (decode yapmadan).
+
+    Parametreler:
+        data: Dosyanın ham içeriği (bytes, mmap veya buffer)
+
+    Dönüş:
+        tuple: (genişlik, yükseklik) veya None (JPEG değilse/okunamazsa)
+    """
+    if data[:2] != b'\xff\xd8':
+        return None
+
+    pos = 2
+    end = len(data)
+    while pos + 4 <= end:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        # Dolgu baytı
+        if marker == 0xFF:
+            pos += 1
+            continue
+        # Uzunluk alanı olmayan işaretçiler
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            pos += 2
+            continue
+        # Boyut bilgisinden önce tarama verisi başladıysa vazgeç
+        if marker == 0xDA:
+            return None
+
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > end:
+                return None
+            height = int.from_bytes(data[pos + 5:pos + 7], 'big')
+            width = int.from_bytes(data[pos + 7:pos + 9], 'big')
+            return (width, height) if width and height else None
+
+        pos += 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+    return None
+
+
+def reduction_factor(size, target):
+    """
+    Uzun kenarı target'tan küçük düşürmeyen en büyük küçültme oranı.
+
+    Parametreler:
+        size (tuple): Orijinal (genişlik, yükseklik)
+        target (int): Gereken en küçük uzun kenar (örn. model giriş boyutu)
+
+    Dönüş:
+        int: 1, 2, 4 veya 8
+    """
+    for factor in (8, 4, 2):
+        if max(size) // factor >= target:
+            return factor
+    return 1
+
+
+def decode_image(data, target=None):
+    """
+    Bellekteki dosya içeriğini OpenCV görüntüsüne çevirir.
+
+    Parametreler:
+        data (bytes): Dosyanın ham içeriği
+        target (int): Verilirse JPEG dosyaları uzun kenarı bu değerden
+            küçük olmayacak şekilde küçültülerek decode edilir
+            (None ise tam çözünürlük)
+
+    Dönüş:
+        numpy.ndarray: BGR formatında görüntü veya None (decode edilemezse)
+    """
+    flags = cv2.IMREAD_COLOR
+    if target is not None:
+        size = jpeg_size(data)
+        if size is not None:
+            flags = REDUCED_FLAGS[reduction_factor(size, target)]
+
+    # Dosya içeriğini numpy array'e çevir
+    file_bytes = np.frombuffer(data, np.uint8)
+    # OpenCV ile görüntüyü decode et (BGR formatında)
+    with profiling.stage('decode'):
+        return cv2.imdecode(file_bytes, flags)
+
+
+def read_image_reduced(path, target):
+    """
+    Görüntüyü gereğinden büyük olmayan bir çözünürlükte okur.
+
+    Büyük JPEG'lerde (20-50 MP fotoğraflar) orijinal boyut önce
+    başlıktan okunur, ardından 1/2, 1/4 veya 1/8 ölçekte decode edilir.
+    Decode süresi ve bellek kullanımı yaklaşık ölçeğin karesiyle azalır.
+
+    Parametreler:
+        path (str): Görüntü dosyasının yolu
+        target (int): Gereken en küçük uzun kenar
+
+    Dönüş:
+        tuple: (görüntü veya None, orijinal (genişlik, yükseklik))
+    """
+    with buffers.map_file(path) as data:
+        size = jpeg_size(data)
+        img = decode_image(data, target)
+
+    if img is None:
+        return None, size
+
+    height, width = img.shape[:2]
+    if size is None:
+        return img, (width, height)
+
+    # EXIF yönlendirmesi uygulandıysa başlıktaki boyutlar yer değiştirir
+    if (size[0] > size[1]) != (width > height):
+        size = (size[1], size[0])
+    return img, size
+
+
+def read_image(path):
+    """
+    Görüntü dosyasını okur ve decode eder.
+
+    Dosya binary modda belleğe eşlenir (mmap) ve doğrudan eşlenmiş
+    sayfalardan decode edilir; içerik ayrıca bir bytes nesnesine
+    kopyalanmaz. Bu yöntem Unicode karakterli dosya yollarını da
+    destekler (cv2.imread desteklemez).
+
+    Parametreler:
+        path (str): Görüntü dosyasının yolu
+
+    Dönüş:
+        numpy.ndarray: BGR formatında görüntü veya None (decode edilemezse)
+    """
+    with buffers.map_file(path) as data:
+        return decode_image(data)
+
+
+def list_images(source):
+    """
+    İşlenecek görüntü yollarının listesini oluşturur.
+
+    Parametreler:
+        source: Bir dizin yolu, tek bir dosya yolu veya yol listesi
+
+    Dönüş:
+        list: Sıralı görüntü yolları listesi
+    """
+    # Tek bir yol verildiyse listeye çevir
+    if isinstance(source, (str, os.PathLike)):
+        source = [source]
+
+    paths = []
+    for item in source:
+        item = os.fspath(item)
+        if os.path.isdir(item):
+            # Dizindeki desteklenen uzantılı dosyaları topla
+            for name in sorted(os.listdir(item)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.join(item, name))
+        else:
+            paths.append(item)
+
+    return paths
+
+
+def batched(items, batch_size):
+    """
+    Bir diziyi batch_size boyutlu parçalara böler.
+
+    Parametreler:
+        items: Herhangi bir iterable
+        batch_size (int): Parça boyutu
+
+    Dönüş:
+        generator: Her adımda en fazla batch_size elemanlı liste
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ==================== SONUÇLARIN İŞLENMESİ ====================
+
+class Detections:
+    """
+    Tek bir görüntüye ait tespitleri sütun (columnar) yapısında tutar.
+
+    Her tespit için ayrı bir dict oluşturmak yerine tüm kutular bitişik
+    NumPy dizilerinde saklanır. Filtreleme, alan hesabı ve sınıf adı
+    eşleme gibi işlemler dizi işlemleriyle tek seferde yapılır.
+
+    Sütunlar:
+        boxes (N×4, int32): [x1, y1, x2, y2] koordinatları
+        confidences (N, float32): Güven skorları (0-1 arası)
+        class_ids (N, int32): Sınıf indeksleri (0-79 arası)
+        names (dict): Sınıf indeksi → sınıf adı eşlemesi
+    """
+
+    __slots__ = ('boxes', 'confidences', 'class_ids', 'names')
+
+    def __init__(self, boxes=None, confidences=None, class_ids=None,
+                 names=None):
+        self.boxes = np.ascontiguousarray(
+            np.zeros((0, 4)) if boxes is None else boxes, dtype=np.int32
+        ).reshape(-1, 4)
+        self.confidences = np.ascontiguousarray(
+            np.zeros(0) if confidences is None else confidences,
+            dtype=np.float32
+        ).reshape(-1)
+        self.class_ids = np.ascontiguousarray(
+            np.zeros(0) if class_ids is None else class_ids, dtype=np.int32
+        ).reshape(-1)
+        self.names = names if names is not None else {}
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        YOLO sonucunu tek bir toplu dönüşümle Detections'a çevirir.
+
+        result.boxes.data tensörü [x1, y1, x2, y2, conf, cls] sütunlarını
+        içerir; cihazdan (GPU/CPU) NumPy'a tek seferde aktarılır.
+
+        Parametreler:
+            result: ultralytics Results nesnesi
+
+        Dönüş:
+            Detections: Tespitler
+        """
+        if result.boxes is None or len(result.boxes) == 0:
+            return cls(names=result.names)
+
+        # Tek bir cihaz → NumPy aktarımı
+        data = result.boxes.data.cpu().numpy()
+
+        return cls(
+            boxes=data[:, :4].astype(np.int32),
+            confidences=data[:, 4],
+            class_ids=data[:, 5].astype(np.int32),
+            names=result.names
+        )
+
+    def __len__(self):
+        return len(self.confidences)
+
+    @property
+    def areas(self):
+        """Kutu alanları (piksel²), vektörel olarak hesaplanır."""
+        widths = self.boxes[:, 2] - self.boxes[:, 0]
+        heights = self.boxes[:, 3] - self.boxes[:, 1]
+        return widths.astype(np.int64) * heights
+
+    @property
+    def class_names(self):
+        """Her tespitin sınıf adı (sınıf tablosundan toplu eşleme)."""
+        if not len(self):
+            return np.array([], dtype=object)
+        table = np.array(
+            [self.names.get(i, str(i)) for i in range(self.class_ids.max() + 1)],
+            dtype=object
+        )
+        return table[self.class_ids]
+
+    def scaled(self, sx, sy):
+        """
+        Kutu koordinatlarını verilen oranlarla ölçekler.
+
+        Tespitleri bir görüntü boyutundan diğerine (örn. tam çözünürlükten
+        300x300 gösterim boyutuna) eşlemek için kullanılır.
+
+        Parametreler:
+            sx (float): Yatay ölçek oranı
+            sy (float): Dikey ölçek oranı
+
+        Dönüş:
+            Detections: Ölçeklenmiş tespitler
+        """
+        scale = np.array([sx, sy, sx, sy], dtype=np.float32)
+        return Detections(
+            np.rint(self.boxes * scale), self.confidences,
+            self.class_ids, self.names
+        )
+
+    def offset(self, dx, dy):
+        """
+        Kutu koordinatlarını verilen miktarda kaydırır.
+
+        Bir döşeme (tile) veya kırpılmış bölgede yapılan tespitleri
+        tam görüntü koordinatlarına taşımak için kullanılır.
+
+        Parametreler:
+            dx (int): Yatay kaydırma (piksel)
+            dy (int): Dikey kaydırma (piksel)
+
+        Dönüş:
+            Detections: Kaydırılmış tespitler
+        """
+        shift = np.array([dx, dy, dx, dy], dtype=np.int32)
+        return Detections(
+            self.boxes + shift, self.confidences, self.class_ids, self.names
+        )
+
+    @classmethod
+    def concatenate(cls, parts, names=None):
+        """
+        Birden fazla Detections nesnesini tek bir nesnede birleştirir.
+
+        Parametreler:
+            parts (list): Detections nesneleri
+            names (dict): Sınıf adları (None ise ilk parçanınki kullanılır)
+
+        Dönüş:
+            Detections: Birleştirilmiş tespitler
+        """
+        parts = list(parts)
+        if names is None:
+            names = parts[0].names if parts else {}
+        if not parts:
+            return cls(names=names)
+        return cls(
+            np.concatenate([p.boxes for p in parts]),
+            np.concatenate([p.confidences for p in parts]),
+            np.concatenate([p.class_ids for p in parts]),
+            names
+        )
+
+    def select(self, index):
+        """
+        Maske veya indeks dizisine göre tespitlerin alt kümesini döndürür.
+
+        Parametreler:
+            index: Boolean maske veya indeks dizisi
+
+        Dönüş:
+            Detections: Seçilen tespitler
+        """
+        return Detections(
+            self.boxes[index], self.confidences[index],
+            self.class_ids[index], self.names
+        )
+
+    def filter(self, min_conf=None, classes=None, min_area=None):
+        """
+        Tespitleri vektörel maske ile filtreler.
+
+        Parametreler:
+            min_conf (float): Minimum güven skoru
+            classes (iterable): Tutulacak sınıf indeksleri
+            min_area (int): Minimum kutu alanı (piksel²)
+
+        Dönüş:
+            Detections: Filtrelenmiş tespitler
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if min_conf is not None:
+            mask &= self.confidences >= min_conf
+        if classes is not None:
+            mask &= np.isin(self.class_ids, list(classes))
+        if min_area is not None:
+            mask &= self.areas >= min_area
+        return self.select(mask)
+
+    def class_summary(self):
+        """
+        Sınıf bazında tespit sayısı ve en yüksek güven skorunu hesaplar.
+
+        Dönüş:
+            list: (sınıf adı, adet, en yüksek güven) üçlüleri,
+            adede göre azalan sırada
+        """
+        if not len(self):
+            return []
+
+        ids, inverse, counts = np.unique(
+            self.class_ids, return_inverse=True, return_counts=True
+        )
+        max_conf = np.zeros(len(ids), dtype=np.float32)
+        np.maximum.at(max_conf, inverse, self.confidences)
+
+        order = np.argsort(-counts, kind='stable')
+        return [
+            (self.names.get(int(ids[i]), str(ids[i])), int(counts[i]),
+             float(max_conf[i]))
+            for i in order
+        ]
+
+    def to_records(self):
+        """
+        Tespitleri kayıt (dict) listesine çevirir (JSON çıktısı için).
+
+        Her kayıt: class, class_id, confidence, bbox, area.
+
+        Dönüş:
+            list: Tespit kayıtları
+        """
+        return [
+            {
+                'class': name,  # Nesne sınıfı
+                'class_id': class_id,  # Sınıf indeksi (0-79)
+                'confidence': confidence,  # Güven skoru
+                'bbox': tuple(bbox),  # Sınırlayıcı kutu
+                'area': area  # Alan (piksel²)
+            }
+            for name, class_id, confidence, bbox, area in zip(
+                self.class_names.tolist(), self.class_ids.tolist(),
+                self.confidences.tolist(), self.boxes.tolist(),
+                self.areas.tolist()
+            )
+        ]
+
+
+# ==================== TOPLU TESPİT ====================
+
+def detect_images(model, images, conf=DEFAULT_CONF, imgsz=None):
+    """
+    Bir grup görüntüyü tek bir model çağrısıyla işler.
+
+    Görüntüler önceden küçültülmeden, orijinal çözünürlükte verilmelidir.
+    Model her görüntüyü kendi giriş boyutuna letterbox ile getirir
+    (en-boy oranı korunur) ve kutuları orijinal koordinatlara geri eşler.
+
+    Parametreler:
+        model: Yüklenmiş YOLO modeli veya detect() metodu olan bir
+            arka uç (bkz. backends.py)
+        images (list): BGR formatında görüntüler
+        conf (float): Minimum güven eşiği
+        imgsz (int): Model giriş boyutu (None ise modelin varsayılanı, 640)
+
+    Dönüş:
+        list: Her görüntü için Detections nesnesi
+    """
+    if not images:
+        return []
+
+    # ONNX / OpenVINO arka uçları kendi ön ve son işlemelerini yapar
+    if hasattr(model, 'detect'):
+        return model.detect(list(images), conf, imgsz)
+
+    # Liste halinde verilen görüntüler tek bir batch olarak işlenir
+    kwargs = {'imgsz': imgsz} if imgsz else {}
+    results = model(list(images), conf=conf, verbose=False, **kwargs)
+
+    detections = []
+    for result in results:
+        # ultralytics her sonuç için aşama sürelerini (ms) raporlar
+        speed = getattr(result, 'speed', None)
+        if profiling.PROFILER.enabled and speed:
+            profiling.record('preprocess', speed.get('preprocess', 0) / 1000)
+            profiling.record('inference', speed.get('inference', 0) / 1000)
+            profiling.record('nms', speed.get('postprocess', 0) / 1000)
+
+        with profiling.stage('extract'):
+            detections.append(Detections.from_result(result))
+
+    return detections
+
+
+def detect_paths(model, paths, conf=DEFAULT_CONF,
+                 batch_size=DEFAULT_BATCH_SIZE, postprocess=None, imgsz=None):
+    """
+    Görüntü dosyalarını okuyup toplu halde tespit yapar.
+
+    Okunamayan dosyalar atlanmaz; hata bilgisiyle birlikte döndürülür.
+
+    Parametreler:
+        model: Yüklenmiş YOLO modeli
+        paths (list): Görüntü dosyası yolları
+        conf (float): Minimum güven eşiği
+        batch_size (int): Model çağrısı başına görüntü sayısı
+        postprocess (callable): Opsiyonel son işlem fonksiyonu;
+            postprocess(yol, görüntü, tespitler) şeklinde çağrılır
+        imgsz (int): Model giriş boyutu (None ise modelin varsayılanı)
+
+    Dönüş:
+        generator: (yol, Detections, hata mesajı) üçlüleri
+    """
+    for batch_paths in batched(paths, batch_size):
+        images = []
+        valid_paths = []
+
+        for path in batch_paths:
+            try:
+                img = read_image(path)
+            except READ_ERRORS as e:
+                yield path, None, str(e) or type(e).__name__
+                continue
+
+            if img is None:
+                yield path, None, "Görüntü decode edilemedi"
+                continue
+
+            images.append(img)
+            valid_paths.append(path)
+
+        results = detect_images(model, images, conf, imgsz)
+        for path, img, objects in zip(valid_paths, images, results):
+            if postprocess is not None:
+                postprocess(path, img, objects)
+            yield path, objects, None
+
+
+# ==================== KOMUT SATIRI ====================
+
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="GUI'siz YOLO toplu nesne tespiti"
+    )
+    parser.add_argument('sources', nargs='+',
+                        help="Görüntü dizini veya dosya yolları")
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS,
+                        help="Model ağırlık dosyası")
+    parser.add_argument('--conf', type=float, default=DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--backend', choices=('torch', 'onnx', 'openvino'),
+                        default='torch',
+                        help="Çıkarım arka ucu (onnx/openvino: dışa "
+                             "aktarılıp önbelleğe alınır)")
+    parser.add_argument('--int8', choices=('dynamic', 'static'),
+                        help="INT8 nicemlenmiş ONNX modeli kullan "
+                             "(--backend onnx; bkz. quantize.py)")
+    parser.add_argument('--calib',
+                        help="Statik INT8 için kalibrasyon görüntüleri klasörü")
+    parser.add_argument('--large-model',
+                        help="Büyük görüntüler için ikinci model "
+                             "(örn. yolov8m; bkz. registry.py)")
+    parser.add_argument('--large-pixels', type=float, default=4.0,
+                        help="--large-model'e yönlendirme eşiği (megapiksel)")
+    parser.add_argument('--cascade', nargs='+', metavar='STAGE',
+                        help="Kademeli çıkarım: --weights ile başla, "
+                             "belirsiz görüntüleri bu kademelere yükselt "
+                             "(örn. yolov8m veya yolov8n@1280)")
+    parser.add_argument('--cascade-band', nargs=2, type=float,
+                        metavar=('LOW', 'HIGH'), default=None,
+                        help="Yükseltme için belirsizlik bandı "
+                             "(varsayılan: 0.25 0.5)")
+    parser.add_argument('--min-classes', type=int, default=0,
+                        help="Bu sayıdan az farklı sınıf bulunursa yükselt")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="Arka uç iş parçacığı sayısı "
+                             "(varsayılan: çekirdek sayısı)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Model çağrısı başına görüntü sayısı")
+    parser.add_argument('--decode-workers', type=int, default=4,
+                        help="Paralel okuma/decode iş parçacığı sayısı "
+                             "(0: sıralı işleme)")
+    parser.add_argument('--processes', type=int, default=0,
+                        help="Çekirdeklere sabitlenmiş işçi süreç sayısı "
+                             "(0: tek süreç; --batch-size işçi başınadır)")
+    parser.add_argument('--imgsz', type=int, default=None,
+                        help="Model giriş boyutu (varsayılan: 640, "
+                             "görüntüler tam çözünürlükte verilir)")
+    parser.add_argument('--tile', type=int, default=None, metavar='PIXELS',
+                        help="Büyük görüntüleri bu boyutta örtüşen "
+                             "döşemelere bölerek işle (bkz. tiling.py; "
+                             "--imgsz verilmezse model girişi de bu olur)")
+    parser.add_argument('--tile-overlap', type=float, default=None,
+                        help="Döşemeler arası örtüşme oranı "
+                             "(varsayılan: 0.2)")
+    parser.add_argument('--tile-merge', choices=('nms', 'wbf'),
+                        default='nms',
+                        help="Döşeme sınırlarındaki kutuları birleştirme "
+                             "yöntemi")
+    parser.add_argument('--warmup', type=int, default=0,
+                        help="Zaman ölçümünden önce yapılacak ısınma "
+                             "geçişi sayısı")
+    parser.add_argument('--cache',
+                        help="Sonuç önbelleği için SQLite dosyası "
+                             "(tekrar gelen görüntüler yeniden işlenmez)")
+    parser.add_argument('--profile',
+                        help="Aşama sürelerini (p50/p95/p99) bu JSON "
+                             "dosyasına yaz")
+    parser.add_argument('--profile-capture', action='store_true',
+                        help="cProfile ve tracemalloc ile ayrıntılı profil "
+                             "çıkar (--profile ile birlikte)")
+    parser.add_argument('--save-dir',
+                        help="Çizim yapılmış görüntülerin kaydedileceği dizin")
+    parser.add_argument('--no-labels', action='store_true',
+                        help="Kaydedilen görüntülere yalnızca kutuları çiz")
+    parser.add_argument('--export',
+                        help="Sonuçları akış halinde bu dosyaya yaz "
+                             "(.jsonl, .csv veya .parquet dizini)")
+    parser.add_argument('--export-format', choices=('jsonl', 'csv', 'parquet'),
+                        help="Dışa aktarım biçimi (varsayılan: uzantıdan)")
+    parser.add_argument('--store',
+                        help="Sonuçları sorgulanabilir tespit deposuna yaz "
+                             "(dizin; bkz. store.py)")
+    parser.add_argument('--resume', action='store_true',
+                        help="--export dosyasındaki (yoksa --store "
+                             "deposundaki) görüntüleri atla, kaldığı "
+                             "yerden devam et; mevcut depoya ekle")
+    args = parser.parse_args(argv)
+
+    if (args.large_model or args.cascade) and (args.int8
+                                               or args.processes > 0):
+        parser.error("--large-model/--cascade, --int8 ve --processes ile "
+                     "birlikte kullanılamaz")
+    if args.large_model and args.cascade:
+        parser.error("--large-model ve --cascade birlikte kullanılamaz")
+    if args.int8 and (args.backend != 'onnx' or args.processes > 0):
+        parser.error("--int8 yalnızca --backend onnx ile ve tek süreçte "
+                     "kullanılabilir")
+    if args.int8 == 'static' and not args.calib:
+        parser.error("--int8 static için --calib gerekli")
+
+    if args.tile and args.imgsz is None:
+        # Dışa aktarılan modeller döşeme boyutunda çalışsın
+        args.imgsz = args.tile
+
+    paths = list_images(args.sources)
+    if not paths:
+        print("İşlenecek görüntü bulunamadı.", file=sys.stderr)
+        return 1
+
+    exporter = None
+    if args.export:
+        import export
+
+        exporter = export.open_exporter(args.export, args.export_format,
+                                        resume=args.resume)
+
+    detection_store = None
+    if args.store:
+        import store
+
+        # Devam ederken önceki depo açılır; yeni sonuçlar ona eklenir
+        if args.resume and os.path.isfile(
+                os.path.join(args.store, 'meta.json')):
+            detection_store = store.DetectionStore.load(args.store)
+        else:
+            detection_store = store.DetectionStore()
+
+    if args.resume:
+        if exporter is not None:
+            done = exporter.completed
+        elif detection_store is not None:
+            done = detection_store
+        else:
+            done = ()
+        total = len(paths)
+        paths = [p for p in paths if p not in done]
+        if total != len(paths):
+            print(f"Devam: {total - len(paths)} görüntü zaten işlenmiş",
+                  file=sys.stderr)
+
+    pool = None
+    cascade_model = None
+    if args.processes > 0:
+        import workerpool
+
+        pool = model = workerpool.WorkerPool(
+            args.weights, args.backend, args.processes,
+            args.imgsz or DEFAULT_IMGSZ
+        )
+        # Her model çağrısı işçilere bölünür; işçi başına batch korunur
+        args.batch_size *= pool.processes
+    elif args.cascade:
+        import cascade
+        import registry
+
+        models = registry.ModelRegistry(
+            default=args.weights, backend=args.backend,
+            imgsz=args.imgsz or DEFAULT_IMGSZ, intra_threads=args.threads
+        )
+        cascade_model = model = cascade.CascadeModel(
+            models, [models.default] + args.cascade,
+            args.cascade_band or cascade.DEFAULT_BAND, args.min_classes
+        )
+    elif args.large_model:
+        import registry
+
+        # Görüntüler boyutlarına göre iki model arasında paylaştırılır;
+        # her model yalnızca ilk görüntüsü geldiğinde yüklenir
+        model = registry.ModelRegistry(
+            default=args.weights, backend=args.backend,
+            imgsz=args.imgsz or DEFAULT_IMGSZ, intra_threads=args.threads
+        )
+        model.route = registry.size_router(
+            model.resolve(args.large_model), int(args.large_pixels * 1e6)
+        )
+        # Önbellek anahtarı yönlendirme ayarını da içermeli
+        model.identity = (f"{model.default}+{model.resolve(args.large_model)}"
+                          f"@{args.large_pixels:g}MP")
+    elif args.backend == 'torch':
+        model = load_model(args.weights)
+    elif args.int8:
+        import quantize
+
+        model = quantize.load_quantized(
+            args.weights, args.imgsz or DEFAULT_IMGSZ, args.int8, args.calib,
+            intra_threads=args.threads
+        )
+    else:
+        import backends
+
+        model = backends.load_backend(
+            args.weights, args.backend, args.imgsz or DEFAULT_IMGSZ,
+            intra_threads=args.threads
+        )
+
+    if args.tile:
+        import tiling
+
+        # Her görüntü döşemelere bölünür; döşemeler --batch-size'lık
+        # gruplar halinde modele verilir
+        model = tiling.TiledModel(
+            model, args.tile,
+            tiling.DEFAULT_OVERLAP if args.tile_overlap is None
+            else args.tile_overlap,
+            args.batch_size, args.tile_merge
+        )
+
+    if args.warmup > 0:
+        seconds = warmup(model, args.imgsz or DEFAULT_IMGSZ, args.warmup,
+                         args.batch_size)
+        print(f"Isınma: {args.warmup} geçiş, {seconds:.2f} sn", file=sys.stderr)
+        # Isınma geçişleri yükseltme oranlarına karışmasın
+        if cascade_model is not None:
+            cascade_model.reset_stats()
+
+    result_cache = None
+    if args.cache:
+        import cache
+
+        result_cache = cache.DetectionCache(path=args.cache)
+        model = cache.CachedModel(model, result_cache)
+
+    postprocess = None
+    if args.save_dir:
+        import annotate
+
+        os.makedirs(args.save_dir, exist_ok=True)
+
+        def postprocess(path, img, objects):
+            # Çizimi doğrudan decode edilmiş görüntü üzerine yap (kopyasız)
+            output = annotate.draw_detections(
+                img, objects, labels=not args.no_labels, copy=False
+            )
+            out_path = os.path.join(args.save_dir, os.path.basename(path))
+            ok, encoded = cv2.imencode(os.path.splitext(out_path)[1], output)
+            if ok:
+                encoded.tofile(out_path)
+            return out_path
+
+    if args.profile:
+        profiling.PROFILER.reset()
+        if args.profile_capture:
+            profiling.PROFILER.start_capture()
+        else:
+            profiling.PROFILER.enabled = True
+
+    processed = 0
+    failed = 0
+    start = time.perf_counter()
+
+    if args.decode_workers > 0:
+        # Decode ve çıkarım aşamaları eş zamanlı çalışır
+        import pipeline
+
+        stream = (
+            item[:3] for item in pipeline.run_pipeline(
+                model, paths, args.conf, args.batch_size,
+                decode_workers=args.decode_workers,
+                postprocess=postprocess, imgsz=args.imgsz
+            )
+        )
+    else:
+        stream = detect_paths(model, paths, args.conf, args.batch_size,
+                              postprocess=postprocess, imgsz=args.imgsz)
+
+    try:
+        for path, objects, error in stream:
+            record = {'image': path}
+            if error is not None:
+                failed += 1
+                record['error'] = error
+            else:
+                processed += 1
+                # Devamda yeniden işlenen (çıktıdan kesilmiş) görüntü
+                # depoda zaten varsa mevcut kaydı korunur
+                if (detection_store is not None
+                        and path not in detection_store):
+                    detection_store.add(path, objects)
+                if exporter is not None:
+                    # Sonuç dışa aktarılır; standart çıktıya yalnızca
+                    # hatalar yazılır
+                    exporter.write(path, objects)
+                    continue
+                record['objects'] = objects.to_records()
+            print(json.dumps(record, ensure_ascii=False))
+    finally:
+        # Hata veya Ctrl+C durumunda o ana kadarki sonuçlar kaybolmaz
+        if exporter is not None:
+            exporter.close()
+        if detection_store is not None:
+            detection_store.save(args.store)
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0.0
+
+    print(
+        f"{processed} görüntü işlendi, {failed} hata, "
+        f"{elapsed:.2f} sn ({rate:.2f} görüntü/sn)",
+        file=sys.stderr
+    )
+
+    if cascade_model is not None:
+        print(f"Kademeler: {json.dumps(cascade_model.stats())}",
+              file=sys.stderr)
+
+    if result_cache is not None:
+        print(f"Önbellek: {json.dumps(result_cache.stats())}", file=sys.stderr)
+        result_cache.close()
+
+    if pool is not None:
+        pool.close()
+
+    if args.profile:
+        report = profiling.PROFILER.stop_capture()
+        profiling.PROFILER.to_json(args.profile)
+        print(profiling.PROFILER.format_table(), file=sys.stderr)
+        if report:
+            print(report, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+Tespit Sonuçlarının Akış Halinde Dışa Aktarımı
+
+Toplu işlerde sonuçlar bellekte biriktirilmez; her görüntü bittiğinde
+satırları dosyaya eklenir. Bellek kullanımı işlenen görüntü sayısından
+bağımsızdır (Parquet'te en fazla bir parça kadar satır tutulur).
+
+Biçimler:
+---------
+jsonl   : Her satır bir tespit (JSON nesnesi)
+csv     : Başlık satırlı, her satır bir tespit
+parquet : Tipli sütunlar (pyarrow gerekir). Parquet dosyasına ekleme
+          yapılamadığı için çıktı bir dizindir; satırlar belirli
+          aralıklarla kapatılan parça dosyalarına (part-NNNNN.parquet)
+          yazılır.
+
+Sütunlar:
+---------
+image, class_id, class_name, confidence, x1, y1, x2, y2, area
+
+Hiç tespit olmayan görüntüler için sınıf ve kutu alanları boş (null)
+tek bir satır yazılır; böylece görüntünün işlendiği kayıtlıdır.
+
+Kaldığı Yerden Devam (resume):
+------------------------------
+resume=True ile mevcut çıktı okunur ve tamamlanmış görüntüler
+'completed' kümesine alınır. Yarım kalmış son satır ile son görüntünün
+satırları (eksik yazılmış olabilir) silinir; bu görüntü yeniden işlenir.
+Silinen görüntü 'truncated' kümesinde bildirilir: kendi kaydını tutan
+çağıranlar (örn. crawler manifesti) bu görüntüyü yeniden işlenecek
+olarak işaretlemelidir. Parquet'te okunamayan (kapatılmamış) son parça
+silinir.
+
+Kullanım:
+---------
+    with export.open_exporter('sonuclar.csv', resume=True) as out:
+        for path, dets, error in detection.detect_paths(model, paths):
+            if error is None and path not in out.completed:
+                out.write(path, dets)
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import io
+import os
+import abc
+import csv
+import json
+import glob
+
+# pyarrow: Parquet çıktısı için (opsiyonel)
+# Kurulum: pip install pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# ==================== SABİTLER ====================
+
+# Çıktı sütunları (sırasıyla)
+COLUMNS = ('image', 'class_id', 'class_name', 'confidence',
+           'x1', 'y1', 'x2', 'y2', 'area')
+
+# Desteklenen biçimler
+FORMATS = ('jsonl', 'csv', 'parquet')
+
+# Metin biçimlerinde diske aktarma aralığı (görüntü sayısı)
+FLUSH_EVERY = 100
+
+# Parquet parça dosyası başına satır sayısı
+PART_ROWS = 65536
+
+
+# ==================== SATIR ÜRETİMİ ====================
+
+def detection_rows(image, dets):
+    """
+    Bir görüntünün tespitlerini çıktı satırlarına çevirir.
+
+    Parametreler:
+        image (str): Görüntü kimliği (dosya yolu)
+        dets (Detections): Tespitler
+
+    Dönüş:
+        list: Her tespit için COLUMNS sırasında değer tuple'ı
+        (tespit yoksa alanları None olan tek satır)
+    """
+    if not len(dets):
+        return [(image,) + (None,) * (len(COLUMNS) - 1)]
+
+    return [
+        (image, class_id, name, confidence, x1, y1, x2, y2, area)
+        for class_id, name, confidence, (x1, y1, x2, y2), area in zip(
+            dets.class_ids.tolist(), dets.class_names.tolist(),
+            dets.confidences.tolist(), dets.boxes.tolist(),
+            dets.areas.tolist()
+        )
+    ]
+
+
+def detect_format(path):
+    """
+    Dosya uzantısından çıktı biçimini belirler.
+
+    Dönüş:
+        str: 'jsonl', 'csv' veya 'parquet'
+
+    Hata:
+        ValueError: Uzantı tanınmıyorsa
+    """
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    if ext in ('csv', 'parquet'):
+        return ext
+    raise ValueError(f"Çıktı biçimi belirlenemedi: {path} "
+                     f"(desteklenen: {', '.join(FORMATS)})")
+
+
+# ==================== METİN BİÇİMLERİ ====================
+
+class TextExporter(abc.ABC):
+    """
+    JSON Lines ve CSV için ortak ekleme/devam etme mantığı.
+
+    Alt sınıflar _parse_image ve _format metotlarını tanımlar.
+    """
+
+    # Dosyanın başındaki başlık satırı sayısı
+    header_lines = 0
+
+    def __init__(self, path, resume=False, flush_every=FLUSH_EVERY):
+        """
+        Parametreler:
+            path (str): Çıktı dosyası
+            resume (bool): True ise mevcut dosyaya kaldığı yerden eklenir
+            flush_every (int): Kaç görüntüde bir diske aktarılacağı
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.completed = set()
+        self.truncated = set()   # Devam ederken satırları silinen görüntüler
+        self.rows = 0
+        self._pending = 0
+
+        if resume and os.path.isfile(path):
+            has_header = self._recover()
+            self._file = open(path, 'a', encoding='utf-8', newline='')
+            if not has_header:
+                self._write_header()
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+            self._write_header()
+
+    def _write_header(self):
+        pass
+
+    @abc.abstractmethod
+    def _parse_image(self, line):
+        """Bir satırdaki görüntü kimliğini döndürür (geçersizse hata)."""
+
+    @abc.abstractmethod
+    def _format(self, rows):
+        """Satırları metne çevirir."""
+
+    def _recover(self):
+        """
+        Mevcut dosyayı tarar, tamamlanmış görüntüleri toplar ve
+        yarım kalmış kuyruğu keser.
+
+        Dönüş:
+            bool: Başlık satırları eksiksiz ise True
+        """
+        keep = 0           # Kesilecek konum (son görüntünün ilk satırı)
+        last_image = None
+        last_rows = 0      # Son görüntünün satır sayısı
+        lines = 0
+
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for raw in f:
+                start = offset
+                offset += len(raw)
+                # Satır sonu yoksa yazma yarıda kalmıştır
+                if not raw.endswith(b'\n'):
+                    break
+                if lines < self.header_lines:
+                    lines += 1
+                    keep = offset
+                    continue
+                try:
+                    image = self._parse_image(raw.decode('utf-8'))
+                except (ValueError, KeyError, IndexError):
+                    break
+                if image != last_image:
+                    if last_image is not None:
+                        self.completed.add(last_image)
+                        self.rows += last_rows
+                    last_image = image
+                    last_rows = 0
+                    keep = start
+                last_rows += 1
+                lines += 1
+
+        # Son görüntünün satırları eksik olabilir: silinir, yeniden işlenir
+        if last_image is not None:
+            self.truncated.add(last_image)
+        with open(self.path, 'r+b') as f:
+            f.truncate(keep)
+        return lines >= self.header_lines
+
+    def write(self, image, dets):
+        """
+        Bir görüntünün tespitlerini dosyaya ekler.
+
+        Parametreler:
+            image (str): Görüntü kimliği (dosya yolu)
+            dets (Detections): Tespitler
+        """
+        rows = detection_rows(image, dets)
+        self._file.write(self._format(rows))
+        self.completed.add(image)
+        self.rows += len(rows)
+
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Bekleyen satırları diske aktarır."""
+        self._file.flush()
+        self._pending = 0
+
+    def close(self):
+        """Dosyayı kapatır."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlExporter(TextExporter):
+    """Her satırı bir tespit olan JSON Lines çıktısı."""
+
+    def _parse_image(self, line):
+        return json.loads(line)['image']
+
+    def _format(self, rows):
+        return ''.join(
+            json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n'
+            for row in rows
+        )
+
+
+class CsvExporter(TextExporter):
+    """Başlık satırlı CSV çıktısı (boş hücre = tespit yok)."""
+
+    header_lines = 1
+
+    def _write_header(self):
+        self._file.write(self._format([COLUMNS]))
+
+    def _parse_image(self, line):
+        return next(csv.reader([line]))[0]
+
+    def _format(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for row in rows:
+            writer.writerow(
+                ['' if v is None else f'{v:.6g}' if isinstance(v, float) else v
+                 for v in row]
+            )
+        return buffer.getvalue()
+
+
+# ==================== PARQUET ====================
+
+class ParquetExporter:
+    """
+    Tipli sütunlarla Parquet çıktısı (parça dosyalarından oluşan dizin).
+
+    Satırlar bellekte sütun listelerinde biriktirilir ve part_rows
+    satıra ulaşınca bir parça dosyası olarak yazılıp kapatılır.
+    """
+
+    def __init__(self, path, resume=False, part_rows=PART_ROWS):
+        """
+        Parametreler:
+            path (str): Çıktı dizini
+            resume (bool): True ise mevcut parçalara yenileri eklenir
+            part_rows (int): Parça dosyası başına satır sayısı
+
+        Hata:
+            RuntimeError: pyarrow yüklü değilse
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow yüklü değil! (pip install pyarrow)")
+
+        self.path = path
+        self.part_rows = part_rows
+        self.completed = set()
+        self.truncated = set()   # Okunamayan parçaların görüntüleri bilinmez
+        self.rows = 0
+        self.schema = pa.schema([
+            ('image', pa.string()),
+            ('class_id', pa.int32()),
+            ('class_name', pa.string()),
+            ('confidence', pa.float32()),
+            ('x1', pa.int32()),
+            ('y1', pa.int32()),
+            ('x2', pa.int32()),
+            ('y2', pa.int32()),
+            ('area', pa.int64()),
+        ])
+
+        os.makedirs(path, exist_ok=True)
+        parts = sorted(glob.glob(os.path.join(path, 'part-*.parquet')))
+        if resume:
+            for part in parts:
+                try:
+                    column = pq.read_table(part, columns=['image']).column(0)
+                except (pa.ArrowInvalid, OSError):
+                    # Kapatılmadan kalmış parça: silinir, yeniden işlenir
+                    os.remove(part)
+                    continue
+                self.completed.update(column.to_pylist())
+                self.rows += len(column)
+        else:
+            for part in parts:
+                os.remove(part)
+
+        self._next_part = len(glob.glob(os.path.join(path, 'part-*.parquet')))
+        self._columns = {name: [] for name in COLUMNS}
+        self._buffered = 0
+
+    def write(self, image, dets):
+        """Bir görüntünün tespitlerini ekler."""
+        for row in detection_rows(image, dets):
+            for name, value in zip(COLUMNS, row):
+                self._columns[name].append(value)
+        self.completed.add(image)
+        self._buffered += max(len(dets), 1)
+
+        if self._buffered >= self.part_rows:
+            self.flush()
+
+    def flush(self):
+        """Biriken satırları yeni bir parça dosyası olarak yazar."""
+        if not self._buffered:
+            return
+        table = pa.table(self._columns, schema=self.schema)
+        part = os.path.join(self.path, f'part-{self._next_part:05d}.parquet')
+        pq.write_table(table, part + '.tmp')
+        # Yarım yazılmış parça hiçbir zaman 'part-*.parquet' adını taşımaz
+        os.replace(part + '.tmp', part)
+
+        self._next_part += 1
+        self.rows += self._buffered
+        self._columns = {name: [] for name in COLUMNS}
+        self._buffered = 0
+
+    def close(self):
+        """Kalan satırları yazar."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==================== FABRİKA ====================
+
+def open_exporter(path, fmt=None, resume=False):
+    """
+    Biçime uygun dışa aktarıcıyı açar.
+
+    Parametreler:
+        path (str): Çıktı dosyası (parquet için dizin)
+        fmt (str): 'jsonl', 'csv' veya 'parquet' (None ise uzantıdan)
+        resume (bool): Kaldığı yerden devam et
+
+    Dönüş:
+        Dışa aktarıcı (write, flush, close, completed, truncated)
+
+    Hata:
+        ValueError: Bilinmeyen biçim
+        RuntimeError: Parquet için pyarrow yüklü değilse
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == 'jsonl':
+        return JsonlExporter(path, resume)
+    if fmt == 'csv':
+        return CsvExporter(path, resume)
+    if fmt == 'parquet':
+        return ParquetExporter(path, resume)
+    raise ValueError(f"Bilinmeyen biçim: {fmt}")
@@ -62,38 +62,150 @@ Geliştirici: BENGÜSU DUMAN
 import os
 # sys: Sistem işlemleri ve hata yakalama için
 import sys
+# time: Model yükleme ve ısınma sürelerini ölçmek için
+import time
+# contextlib: Kademeli model için boş bağlam yöneticisi
+import contextlib
+# concurrent.futures: Tespiti Tk ana döngüsü dışında çalıştırmak için
+from concurrent.futures import ThreadPoolExecutor
 # tkinter: GUI (Grafiksel Kullanıcı Arayüzü) oluşturmak için
 from tkinter import *
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 
-# cv2 (OpenCV): Görüntü işleme kütüphanesi
-import cv2
 # numpy: Sayısal hesaplamalar ve dizi işlemleri için
 import numpy as np
 # PIL: Python Imaging Library - Tkinter ile görüntü göstermek için
 from PIL import Image, ImageTk
 
+# detection: GUI'siz tespit motoru (model yükleme, decode, toplu tespit)
+import detection
+# annotate: Tespit kutularını ve etiketlerini çizme
+import annotate
+# video: Video dosyası / kamera akışında tespit
+import video
+# cache: Aynı görüntü için tespit sonuçlarını yeniden kullanma
+import cache
+# buffers: Yeniden kullanılan gösterim tamponları ve PhotoImage
+import buffers
+# profiling: Aşama bazlı süre ölçümü (p50/p95/p99)
+import profiling
+# registry: Birden fazla modeli bellek bütçesiyle tutan kayıt defteri
+import registry
+# cascade: Önce küçük model, gerekirse büyük model (kademeli çıkarım)
+import cascade
+
+import tiling
+
 # ultralytics: YOLOv8 modeli için
 # Kurulum: pip install ultralytics
-try:
-    from ultralytics import YOLO
-
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
+YOLO_AVAILABLE = detection.YOLO_AVAILABLE
+if not YOLO_AVAILABLE:
     print("UYARI: ultralytics kütüphanesi yüklü değil!")
     print("Kurulum için: pip install ultralytics")
 
 # ==================== GLOBAL DEĞİŞKENLER ====================
 
-# original_image: Yüklenen orijinal görüntüyü saklar (OpenCV formatında)
+# original_image: Yüklenen orijinal görüntüyü saklar (OpenCV formatında,
+# tam çözünürlükte - YOLO bu görüntü üzerinde çalışır)
 original_image = None
 
-# detected_objects: Tespit edilen nesnelerin listesi
-detected_objects = []
+# display_image: Ekranda gösterilen 300x300 küçültülmüş kopya
+display_image = None
+
+# original_size: Dosyadaki gerçek boyut (genişlik, yükseklik)
+# (original_image küçültülerek decode edildiyse ondan büyüktür)
+original_size = None
+
+# original_path: Yüklenen görüntünün dosya yolu (döşemeli tespit
+# dosyayı tam çözünürlükte kendisi açar)
+original_path = None
+
+# REDUCED_DECODE: True ise büyük JPEG'ler modelin giriş boyutundan küçük
+# düşmeyecek şekilde 1/2, 1/4 veya 1/8 ölçekte decode edilir; tam
+# çözünürlüklü görüntü hiç oluşturulmaz. Kutular tabloya dosyanın gerçek
+# koordinatlarında yazılır.
+REDUCED_DECODE = True
+
+# display_buffers: Gösterim için yeniden kullanılan diziler
+# ('display': küçültülmüş görüntü, 'canvas': çizim tuvali,
+#  'video': video karesi, 'rgb': Tkinter'a verilen RGB kopya)
+display_buffers = buffers.BufferPool()
+
+# display_surface: Görüntü alanındaki yeniden kullanılan PhotoImage
+# (arayüz oluşturulurken placeholder ile başlatılır)
+display_surface = None
+
+# DISPLAY_SIZE: Görüntü alanının boyutu (genişlik, yükseklik)
+DISPLAY_SIZE = (300, 300)
+
+# INFER_FULL_RESOLUTION: True ise model tam çözünürlüklü görüntüyü alır
+# ve kutular görüntüleme boyutuna ölçeklenir; False ise eski davranış
+# (300x300 görüntü üzerinde tespit) kullanılır
+INFER_FULL_RESOLUTION = True
+
+# detected_objects: Tespit edilen nesneler (sütun yapısında, bkz. Detections)
+detected_objects = detection.Detections()
+
+# model_registry: Yüklü YOLO modelleri (lazy loading - her model ilk
+# seçildiğinde yüklenir; bellek bütçesi aşılırsa en eski model çıkarılır,
+# bütçe YOLO_MODEL_BUDGET_MB ile ayarlanır)
+model_registry = registry.ModelRegistry()
+
+# selected_model: Arayüzde seçili model adı (örn. 'yolov8n' veya 'auto')
+selected_model = model_registry.default
+
+# cascade_model: 'auto' seçiliyken kullanılan kademeli model. Görüntü
+# önce yolov8n ile işlenir; yalnızca belirsiz tespitleri çoksa yolov8m
+# ile yeniden işlenir (bkz. cascade.py varsayılanları)
+cascade_model = cascade.CascadeModel(model_registry)
+
+# result_cache: Tespit sonuçlarının bellek içi LRU önbelleği
+# (aynı görüntüde YOLO'ya tekrar basıldığında model yeniden çalışmaz)
+result_cache = cache.DetectionCache()
+
+# yolo_executor: Tespit işlerini çalıştıran tek iş parçacıklı havuz
+# (Tk olay döngüsü tespit süresince donmaz). ultralytics tahmincisi iş
+# parçacığı güvenli olmadığından video dahil tüm model çağrıları bu
+# havuzdan geçer (bkz. SerializedModel)
+yolo_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='yolo')
+
+# yolo_job: Çalışan tespit işi (yoksa None)
+yolo_job = None
+
+# yolo_pending: İş sürerken görüntü değişip YOLO'ya tekrar basıldıysa True
+# (birden fazla tıklama tek bir yeniden çalıştırmada birleştirilir)
+yolo_pending = False
 
-# yolo_model: YOLO modeli (lazy loading - ihtiyaç olduğunda yüklenir)
-yolo_model = None
+# JOB_POLL_MS: Tespit işinin bitip bitmediğinin kontrol aralığı (milisaniye)
+JOB_POLL_MS = 50
+
+# PRELOAD_MODEL: True ise model, arayüz oluşturulurken arka planda yüklenir
+# ve ısıtılır (opt-in: "python main.py --preload" veya YOLO_PRELOAD=1)
+PRELOAD_MODEL = '--preload' in sys.argv or os.environ.get('YOLO_PRELOAD') == '1'
+
+# WARMUP_RUNS: Ön yüklemeden sonra yapılacak boş ileri geçiş sayısı
+WARMUP_RUNS = 2
+
+# profile_window: Açık profil paneli penceresi (yoksa None)
+profile_window = None
+
+# PROFILE_REFRESH_MS: Profil panelinin yenilenme aralığı (milisaniye)
+PROFILE_REFRESH_MS = 1000
+
+# video_detector: Çalışan video akışı (yoksa None)
+video_detector = None
+
+# video_model_name: Video akışı boyunca kayıt defterinde sabitlenen model
+# (kademeli modelde None; modeller çağrı başına sabitlenir)
+video_model_name = None
+
+# VIDEO_POLL_MS: Video sonuçlarının kontrol edilme aralığı (milisaniye)
+VIDEO_POLL_MS = 30
+
+# VIDEO_MOTION_GATE: Sabit kamera kayıtlarında model yalnızca hareketli
+# bölgelerde çalışır ('diff' veya 'mog2'; YOLO_MOTION_GATE ile açılır,
+# boşsa her kare işlenir)
+VIDEO_MOTION_GATE = os.environ.get('YOLO_MOTION_GATE') or None
 
 
 # ==================== YARDIMCI FONKSİYONLAR ====================
@@ -117,54 +229,180 @@ def create_placeholder(width=300, height=300):
     return ImageTk.PhotoImage(img)
 
 
-def load_yolo_model():
+def get_yolo_model(name=None):
     """
-    YOLOv8 modelini yükler (lazy loading).
+    YOLOv8 modelini Tk çağrısı yapmadan yükler (iş parçacığı güvenli).
 
-    Model ilk kullanımda yüklenir ve sonraki kullanımlar için
-    önbellekte tutulur. Bu, başlangıç süresini hızlandırır.
+    Model kullanımda işaretlenmez; bütçe aşılırsa sonraki bir yüklemede
+    bellekten çıkarılabilir. Yalnızca kısa süreli işler (ön yükleme ve
+    ısınma) içindir; modeli uzun süre tutan çağıranlar
+    acquire_yolo_model() kullanmalıdır.
 
-    YOLOv8 Model Boyutları:
-    - yolov8n.pt: Nano (en hızlı, en az doğru)
-    - yolov8s.pt: Small
-    - yolov8m.pt: Medium
-    - yolov8l.pt: Large
-    - yolov8x.pt: Extra Large (en yavaş, en doğru)
+    Parametreler:
+        name (str): Model adı (None ise arayüzde seçili model)
 
     Dönüş:
-        YOLO: Yüklenmiş YOLO modeli veya None (hata durumunda)
+        YOLO: Yüklenmiş YOLO modeli
+
+    Hata:
+        RuntimeError: ultralytics kütüphanesi yüklü değilse
     """
-    global yolo_model
+    name = name or selected_model
+    if name == cascade.AUTO:
+        return cascade_model
 
-    # Model zaten yüklüyse tekrar yükleme
-    if yolo_model is not None:
-        return yolo_model
+    # İlk çalıştırmada model otomatik indirilir (nano için ~6MB)
+    return model_registry.get(name)
 
-    # YOLO kütüphanesi yüklü değilse
-    if not YOLO_AVAILABLE:
-        messagebox.showerror(
-            "Hata",
-            "YOLO kütüphanesi yüklü değil!\n\n"
-            "Kurulum için terminalde çalıştırın:\n"
-            "pip install ultralytics"
-        )
-        return None
 
-    try:
-        # Bilgi mesajı göster
-        info_text.set("YOLO modeli yükleniyor... Lütfen bekleyin.")
-        root.update()
+def acquire_yolo_model(name=None):
+    """
+    Modeli yükler ve release_yolo_model() çağrılana kadar kayıt
+    defterinde sabitler (iş parçacığı güvenli).
+
+    Video akışı gibi modeli uzun süre kullanan işler içindir; bu sürede
+    başka bir modelin yüklenmesi kullanılan modeli bellekten çıkaramaz.
+
+    Parametreler:
+        name (str): Model adı (None ise arayüzde seçili model)
+
+    Dönüş:
+        tuple: (sabitlenen ad veya kademeli modelde None, model)
+    """
+    name = name or selected_model
+    if name == cascade.AUTO:
+        # Kademeli model her çağrıda kendi modellerini sabitler
+        return None, cascade_model
+    return model_registry.acquire(name)
+
+
+def release_yolo_model(name):
+    """
+    acquire_yolo_model() ile sabitlenen modeli serbest bırakır.
+
+    Parametreler:
+        name (str): acquire_yolo_model()'in döndürdüğü ad (None ise
+            bir şey yapılmaz)
+    """
+    if name is not None:
+        model_registry.release(name)
+
+
+class SerializedModel:
+    """
+    Model çağrılarını tek iş parçacıklı havuzda çalıştıran sarmalayıcı.
+
+    Video akışı aynı model nesnesini YOLO butonunun işleriyle paylaşır;
+    ultralytics tahmincisi eş zamanlı çağrılarda bozulur. detect()
+    çağrısı havuza gönderilir ve sonucu beklenir; böylece video ve
+    görüntü tespitleri hiçbir zaman aynı anda çalışmaz.
+    """
+
+    def __init__(self, model, executor):
+        """
+        Parametreler:
+            model: YOLO modeli veya detect() metodu olan bir arka uç
+            executor: Tek iş parçacıklı ThreadPoolExecutor
+        """
+        self.model = model
+        self.executor = executor
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None):
+        """Görüntüleri havuzda işler (bkz. detection.detect_images)."""
+        return self.executor.submit(
+            detection.detect_images, self.model, images, conf, imgsz
+        ).result()
+
+
+def model_ready(name):
+    """
+    Model bellekte mi? ('auto' için ilk kademe modeli kontrol edilir)
+
+    Parametreler:
+        name (str): Model adı
+
+    Dönüş:
+        bool: Model yüklüyse True
+    """
+    if name == cascade.AUTO:
+        name = cascade_model.stages[0][0]
+    return model_registry.is_loaded(name)
+
+
+def select_model(event=None):
+    """
+    Arayüzde seçilen modeli etkinleştirir (yeniden başlatmadan).
+
+    Model ilk tespitte yüklenir; daha önce yüklenmiş bir modele geçiş
+    anlıktır. Sonraki YOLO ve video işlemleri seçilen modeli kullanır.
+    """
+    global selected_model
+
+    selected_model = model_var.get()
+    if selected_model == cascade.AUTO:
+        info_text.set("Model: auto (yolov8n, gerekirse yolov8m)")
+    elif model_ready(selected_model):
+        info_text.set(f"Model: {selected_model} (bellekte)")
+    else:
+        info_text.set(f"Model: {selected_model} (ilk tespitte yüklenecek)")
 
-        # YOLOv8 nano modelini yükle (hız için)
-        # İlk çalıştırmada model otomatik indirilir (~6MB)
-        yolo_model = YOLO('yolov8n.pt')
 
-        info_text.set("YOLO modeli yüklendi!")
-        return yolo_model
+def preload_model():
+    """
+    Modeli yükler ve boş görüntülerle ısıtır (arka plan iş parçacığında).
+
+    İlk tespit; ağırlık yükleme, grafik oluşturma ve ilk çağrı bellek
+    hazırlığı maliyetini ödemez. Tespit işleriyle aynı havuzda çalıştığı
+    için, ısınma bitmeden basılan YOLO butonu ısınmanın arkasında sıraya girer.
+
+    Dönüş:
+        tuple: (yükleme süresi, ısınma süresi) saniye cinsinden
+    """
+    start = time.perf_counter()
+    model = get_yolo_model()
+    load_seconds = time.perf_counter() - start
 
+    warmup_seconds = detection.warmup(
+        model, detection.DEFAULT_IMGSZ, runs=WARMUP_RUNS
+    )
+    return load_seconds, warmup_seconds
+
+
+def poll_preload(future):
+    """
+    Ön yükleme bittiğinde süreleri bilgi alanında gösterir.
+
+    Parametreler:
+        future: preload_model işinin Future nesnesi
+    """
+    if not future.done():
+        root.after(JOB_POLL_MS, poll_preload, future)
+        return
+
+    # Kullanıcı bu arada bir işlem başlattıysa bilgi metnini ezme
+    if yolo_job is not None or video_detector is not None:
+        return
+
+    try:
+        load_seconds, warmup_seconds = future.result()
     except Exception as e:
-        messagebox.showerror("Hata", f"Model yüklenemedi:\n{str(e)}")
-        return None
+        info_text.set(f"Model ön yüklemesi başarısız: {e}")
+        return
+
+    info_text.set(
+        f"Model hazır (yükleme {load_seconds:.2f} sn, "
+        f"ısınma {warmup_seconds:.2f} sn)"
+    )
+
+
+def show_missing_yolo_error():
+    """ultralytics kütüphanesi yüklü değilse hata mesajı gösterir."""
+    messagebox.showerror(
+        "Hata",
+        "YOLO kütüphanesi yüklü değil!\n\n"
+        "Kurulum için terminalde çalıştırın:\n"
+        "pip install ultralytics"
+    )
 
 
 # ==================== GÖRÜNTÜ YÜKLEME FONKSİYONU ====================
@@ -176,14 +414,19 @@ def load_image():
     İşlem Adımları:
     ---------------
     1. Dosya seçme dialogu açılır (jpg, png, bmp desteklenir)
-    2. Seçilen dosya binary olarak okunur
+    2. Seçilen dosya belleğe eşlenir (mmap, kopyasız)
     3. OpenCV ile görüntü decode edilir (BGR formatında)
-    4. Görüntü 300x300 piksel olarak yeniden boyutlandırılır
+    4. Gösterim için 300x300 piksellik tampona küçültülür
+       (tespit tam çözünürlüklü orijinal üzerinde yapılır)
     5. BGR'den RGB'ye dönüştürülür (Tkinter için)
-    6. Tkinter Label'da gösterilir
+    6. Mevcut PhotoImage'a yazılarak gösterilir
     7. Önceki tespit sonuçları temizlenir
     """
-    global original_image, detected_objects
+    global original_image, display_image, original_size, original_path
+    global detected_objects
+
+    # Çalışan video akışı varsa durdur
+    stop_video()
 
     # Dosya seçme dialogu aç
     # filetypes: Gösterilecek dosya türlerini filtreler
@@ -202,13 +445,16 @@ def load_image():
         return
 
     try:
-        # Dosyayı binary modda oku
+        # Dosyayı belleğe eşle ve decode et (BGR formatında)
         # Bu yöntem Unicode karakterli dosya yollarını destekler
-        with open(file_path, 'rb') as f:
-            # Dosya içeriğini numpy array'e çevir
-            file_bytes = np.frombuffer(f.read(), np.uint8)
-            # OpenCV ile görüntüyü decode et (BGR formatında)
-            img = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
+        if REDUCED_DECODE:
+            # Boyut önce JPEG başlığından okunur; decode gereken en küçük
+            # ölçekte yapılır (model girişi veya gösterim boyutu)
+            target = (detection.DEFAULT_IMGSZ if INFER_FULL_RESOLUTION
+                      else max(DISPLAY_SIZE))
+            img, size = detection.read_image_reduced(file_path, target)
+        else:
+            img, size = detection.read_image(file_path), None
 
         # Görüntü okunamadıysa hata ver
         if img is None:
@@ -220,27 +466,20 @@ def load_image():
             return
 
         # Orijinal boyutları kaydet
-        original_h, original_w = img.shape[:2]
-
-        # Görüntüyü 300x300 piksel olarak yeniden boyutlandır
-        # INTER_AREA: Küçültme için en iyi interpolasyon yöntemi
-        img = cv2.resize(img, (300, 300), interpolation=cv2.INTER_AREA)
+        original_w, original_h = size or (img.shape[1], img.shape[0])
+        original_size = (original_w, original_h)
 
         # Global değişkene kaydet (YOLO için BGR formatında tut)
         original_image = img
+        original_path = file_path
 
-        # BGR'den RGB'ye çevir (OpenCV BGR, Tkinter/PIL RGB kullanır)
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-        # PIL Image'a çevir
-        img_pil = Image.fromarray(img_rgb)
-
-        # Tkinter PhotoImage'a çevir
-        img_tk = ImageTk.PhotoImage(img_pil)
+        # Görüntüyü yalnızca gösterim için 300x300 piksel olarak küçült
+        # INTER_AREA: Küçültme için en iyi interpolasyon yöntemi
+        # (sonuç her seferinde aynı 'display' tamponuna yazılır)
+        display_image = display_buffers.resize('display', img, DISPLAY_SIZE)
 
-        # Label'ı güncelle
-        image_label.config(image=img_tk)
-        image_label.image = img_tk  # Referansı tut (garbage collection önleme)
+        # RGB'ye çevir ve mevcut PhotoImage'a yaz
+        show_result_image(display_image)
 
         # Bilgi metnini güncelle
         info_text.set(
@@ -249,7 +488,7 @@ def load_image():
         )
 
         # Önceki tespit sonuçlarını temizle
-        detected_objects.clear()
+        detected_objects = detection.Detections()
         update_table()
 
     except Exception as e:
@@ -277,97 +516,158 @@ def apply_yolo():
     - boxes.xyxy: [x1, y1, x2, y2] koordinatları
     - boxes.conf: Güven skoru (0-1 arası)
     - boxes.cls: Sınıf indeksi (0-79 arası)
+
+    Model yükleme ve tespit arka planda bir iş parçacığında çalışır;
+    sonuç root.after ile ana döngüye aktarılır. İş sürerken YOLO'ya
+    tekrar basılırsa ikinci bir tam geçiş kuyruğa eklenmez:
+    aynı görüntü için istek yok sayılır, görüntü değiştiyse iş bitince
+    tek bir yeniden çalıştırma yapılır.
     """
-    global detected_objects
+    global yolo_job, yolo_pending
 
     # Görüntü kontrolü
     if original_image is None:
         messagebox.showwarning("Uyarı", "Önce bir görüntü yükleyin!")
         return
 
-    # YOLO modelini yükle (lazy loading)
-    model = load_yolo_model()
-    if model is None:
+    # YOLO kütüphanesi yüklü değilse
+    if not YOLO_AVAILABLE:
+        show_missing_yolo_error()
         return
 
-    try:
-        # Bilgi güncelle
+    # Çalışan bir iş varsa isteği birleştir
+    if yolo_job is not None:
+        if yolo_job['image'] is not original_image:
+            yolo_pending = True
+            info_text.set("YOLO çalışıyor... Yeni görüntü sırada.")
+        return
+
+    # Bilgi güncelle
+    if not model_ready(selected_model):
+        info_text.set(f"{selected_model} yükleniyor... Lütfen bekleyin.")
+    else:
         info_text.set("YOLO çalışıyor... Lütfen bekleyin.")
-        root.update()
 
-        # ========== YOLO TESPİTİ ==========
-        # model() fonksiyonu görüntüyü işler ve sonuçları döndürür
-        # conf: Minimum güven eşiği (0.25 = %25)
-        # verbose: Konsol çıktısını kapat
-        results = model(original_image, conf=0.25, verbose=False)
+    # display_image paylaşılan 'display' tamponudur ve sonraki görüntü
+    # yüklemesinde yerinde değişir; iş kendi kopyasını kullanır
+    display = display_image.copy()
+    if tile_var.get():
+        # Döşemeli tespit küçültülmüş decode'u değil dosyanın kendisini
+        # kullanır (.npy/.tif bellek eşlemeli açılır)
+        source, size = original_path, original_size
+    elif INFER_FULL_RESOLUTION:
+        source, size = original_image, original_size
+    else:
+        source, size = display, None
+    yolo_job = {
+        'image': original_image,
+        'future': yolo_executor.submit(run_detection, source, display,
+                                       size, selected_model),
+        'cancelled': False,
+    }
+    set_busy(True)
+    root.after(JOB_POLL_MS, poll_yolo_job, yolo_job)
+
+
+def run_detection(source, display, size=None, model_name=None):
+    """
+    Tespiti ve çizimi yapar (arka plan iş parçacığında çalışır).
 
-        # Sonuç nesnesini al
-        result = results[0]
+    Bu fonksiyon Tk nesnelerine dokunmaz; sonuçlar ana döngüde
+    poll_yolo_job tarafından gösterilir.
 
-        # Tespit edilen nesneleri temizle
-        detected_objects.clear()
+    Parametreler:
+        source: Modele verilecek görüntü (BGR); dosya yolu verilirse
+            görüntü tam çözünürlükte döşemeli olarak işlenir
+        display: Üzerine çizim yapılacak 300x300 gösterim görüntüsü
+        size (tuple): Dosyanın gerçek boyutu (genişlik, yükseklik);
+            verilirse dönen kutular bu koordinatlara ölçeklenir
+        model_name (str): Kullanılacak model (None ise seçili model)
 
-        # Görüntü kopyası üzerine çizim yap
-        output_image = original_image.copy()
+    Dönüş:
+        tuple: (Detections, çizilmiş gösterim görüntüsü)
+    """
+    name = model_name or selected_model
+    if name == cascade.AUTO:
+        # Kademeli model, modelleri kendisi kayıt defterinden alır
+        context = contextlib.nullcontext(cascade_model)
+        model_id = cascade_model.identity
+    else:
+        name = model_id = model_registry.resolve(name)
+        context = model_registry.use(name)
 
-        # ========== TESPİTLERİ İŞLE ==========
-        # Her tespit için döngü
-        for box in result.boxes:
-            # Sınırlayıcı kutu koordinatlarını al [x1, y1, x2, y2]
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
+    # YOLO modelini yükle (lazy loading) ve önbellekle sar; model tespit
+    # süresince kullanımda işaretlenir (bellekten çıkarılmaz)
+    with context as yolo:
+        model = cache.CachedModel(yolo, result_cache, model_id=model_id)
 
-            # Güven skorunu al (0-1 arası)
-            confidence = float(box.conf[0].cpu().numpy())
+        # ========== YOLO TESPİTİ ==========
+        # Tespit motoru görüntüyü işler ve tespit kayıtlarını döndürür
+        # conf: Minimum güven eşiği (0.25 = %25)
+        # Model görüntüyü kendi giriş boyutuna (640) letterbox ile getirir
+        # ve kutuları verilen görüntünün koordinatlarına geri eşler
+        if isinstance(source, str):
+            # Döşemeler tek tek önbellekten geçer; sonuç dosyanın gerçek
+            # koordinatlarındadır
+            objects = tiling.detect_tiled(model, source,
+                                          conf=detection.DEFAULT_CONF)
+            src_w, src_h = size
+        else:
+            objects = detection.detect_images(
+                model, [source], conf=detection.DEFAULT_CONF
+            )[0]
+            src_h, src_w = source.shape[:2]
+
+    # ========== GÖRÜNTÜ ÜZERİNE ÇİZİM ==========
+    # Gösterim görüntüsü yeniden kullanılan 'canvas' tamponuna kopyalanır
+    # ve kutular/etiketler doğrudan bu tampona çizilir
+    # (renk paleti ve etiket boyutları önbellekten gelir)
+    # Kutular orijinal koordinatlardan gösterim boyutuna ölçeklenir
+    display_objects = objects.scaled(
+        DISPLAY_SIZE[0] / src_w, DISPLAY_SIZE[1] / src_h
+    )
+    canvas = display_buffers.copy('canvas', display)
+    output_image = annotate.draw_detections(canvas, display_objects, copy=False)
 
-            # Sınıf indeksini al
-            class_id = int(box.cls[0].cpu().numpy())
+    # Küçültülerek decode edilen görüntünün kutularını gerçek boyuta eşle
+    if size is not None and size != (src_w, src_h):
+        objects = objects.scaled(size[0] / src_w, size[1] / src_h)
 
-            # Sınıf adını al (COCO dataset sınıf isimleri)
-            class_name = result.names[class_id]
+    return objects, output_image
 
-            # Tespit bilgisini kaydet
-            detected_objects.append({
-                'class': class_name,  # Nesne sınıfı
-                'confidence': confidence,  # Güven skoru
-                'bbox': (x1, y1, x2, y2),  # Sınırlayıcı kutu
-                'area': (x2 - x1) * (y2 - y1)  # Alan (piksel²)
-            })
 
-            # ========== GÖRÜNTÜ ÜZERİNE ÇİZİM ==========
-            # Rastgele renk oluştur (her sınıf için tutarlı)
-            np.random.seed(class_id)
-            color = tuple(np.random.randint(0, 255, 3).tolist())
+def poll_yolo_job(job):
+    """
+    Arka plandaki tespit işini kontrol eder; bittiyse sonucu gösterir.
 
-            # Sınırlayıcı kutuyu çiz
-            cv2.rectangle(output_image, (x1, y1), (x2, y2), color, 2)
+    Parametreler:
+        job (dict): apply_yolo tarafından oluşturulan iş
+    """
+    global yolo_job, yolo_pending, detected_objects
 
-            # Etiket metni oluştur
-            label = f"{class_name}: {confidence:.2f}"
+    # İş iptal edildiyse sonucu yok say
+    if job['cancelled']:
+        return
 
-            # Etiket arka planı için boyut hesapla
-            (label_w, label_h), baseline = cv2.getTextSize(
-                label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1
-            )
+    future = job['future']
+    if not future.done():
+        root.after(JOB_POLL_MS, poll_yolo_job, job)
+        return
 
-            # Etiket arka planını çiz (okunabilirlik için)
-            cv2.rectangle(
-                output_image,
-                (x1, y1 - label_h - 10),
-                (x1 + label_w, y1),
-                color,
-                -1  # Dolu dikdörtgen
-            )
+    yolo_job = None
+    set_busy(False)
 
-            # Etiket metnini yaz
-            cv2.putText(
-                output_image,
-                label,
-                (x1, y1 - 5),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,  # Font boyutu
-                (255, 255, 255),  # Beyaz renk
-                1  # Kalınlık
-            )
+    try:
+        objects, output_image = future.result()
+    except Exception as e:
+        yolo_pending = False
+        messagebox.showerror("Hata", f"YOLO çalıştırılırken hata:\n{str(e)}")
+        info_text.set("Hata oluştu!")
+        return
+
+    # İş sürerken başka bir görüntü yüklendiyse sonucu gösterme
+    if job['image'] is original_image:
+        detected_objects = objects
 
         # ========== SONUCU GÖSTER ==========
         show_result_image(output_image)
@@ -377,15 +677,195 @@ def apply_yolo():
 
         # Bilgi güncelle
         total = len(detected_objects)
-        unique = len(set(obj['class'] for obj in detected_objects))
-        info_text.set(f"Tespit tamamlandı! {total} nesne bulundu ({unique} farklı sınıf)")
+        unique = len(np.unique(detected_objects.class_ids))
+        message = f"Tespit tamamlandı! {total} nesne bulundu ({unique} farklı sınıf)"
+        if selected_model == cascade.AUTO:
+            # Oturum boyunca büyük modele yükseltilen görüntü oranı
+            rate = cascade_model.stats()['final_stage_rate']
+            message += f" | auto: %{100 * rate:.0f} yükseltildi"
+        info_text.set(message)
 
         # Algoritma açıklamasını göster
         show_algorithm_info()
 
+    # Bekleyen (birleştirilmiş) istek varsa bir kez daha çalıştır
+    if yolo_pending:
+        yolo_pending = False
+        apply_yolo()
+
+
+def cancel_yolo():
+    """
+    Çalışan tespit işini iptal eder.
+
+    Başlamamış iş kuyruktan çıkarılır. Başlamış bir ileri geçiş
+    yarıda kesilemez; arka planda tamamlanır ancak sonucu gösterilmez.
+    """
+    global yolo_job, yolo_pending
+
+    if yolo_job is None:
+        return
+
+    yolo_job['cancelled'] = True
+    yolo_job['future'].cancel()
+    yolo_job = None
+    yolo_pending = False
+
+    set_busy(False)
+    info_text.set("Tespit iptal edildi.")
+
+
+def set_busy(busy):
+    """
+    İlerleme göstergesini ve İptal butonunu tespit durumuna göre ayarlar.
+
+    Parametreler:
+        busy (bool): Tespit çalışıyorsa True
+    """
+    if busy:
+        progress_bar.start(10)
+        cancel_btn.config(state=NORMAL)
+    else:
+        progress_bar.stop()
+        cancel_btn.config(state=DISABLED)
+
+
+# ==================== VİDEO AKIŞI ====================
+
+def toggle_video():
+    """
+    Video akışını başlatır veya çalışıyorsa durdurur.
+
+    Yakalama ve tespit ayrı iş parçacıklarında çalışır (bkz. video.py).
+    Arayüz yalnızca belirli aralıklarla en son biten kareyi alır;
+    böylece Tk olay döngüsü hiçbir zaman yakalamayı bekletmez.
+    """
+    if video_detector is not None:
+        stop_video()
+        return
+
+    file_path = filedialog.askopenfilename(
+        title="Video Seçin",
+        filetypes=[
+            ("Video Dosyaları", "*.mp4 *.avi *.mkv *.mov *.webm"),
+            ("Tüm Dosyalar", "*.*")
+        ]
+    )
+    if not file_path:
+        return
+
+    # YOLO kütüphanesi yüklü değilse
+    if not YOLO_AVAILABLE:
+        show_missing_yolo_error()
+        return
+
+    # Model arka plan havuzunda yüklenir; Tk olay döngüsü beklemez.
+    # Model akış bitene kadar sabit kalır (stop_video serbest bırakır)
+    if not model_ready(selected_model):
+        info_text.set(f"{selected_model} yükleniyor... Lütfen bekleyin.")
+    video_btn.config(state=DISABLED)
+    future = yolo_executor.submit(acquire_yolo_model, selected_model)
+    root.after(JOB_POLL_MS, poll_video_model, future, file_path)
+
+
+def poll_video_model(future, file_path):
+    """
+    Video modeli yüklendiğinde akışı başlatır.
+
+    Parametreler:
+        future: acquire_yolo_model işinin Future nesnesi
+        file_path (str): Oynatılacak video dosyası
+    """
+    global video_detector, video_model_name
+
+    if not future.done():
+        root.after(JOB_POLL_MS, poll_video_model, future, file_path)
+        return
+
+    video_btn.config(state=NORMAL)
+
+    try:
+        name, model = future.result()
     except Exception as e:
-        messagebox.showerror("Hata", f"YOLO çalıştırılırken hata:\n{str(e)}")
+        messagebox.showerror("Hata", f"Model yüklenemedi:\n{str(e)}")
         info_text.set("Hata oluştu!")
+        return
+
+    try:
+        video_detector = video.VideoDetector(
+            SerializedModel(model, yolo_executor), file_path,
+            conf=detection.DEFAULT_CONF, gate=VIDEO_MOTION_GATE
+        )
+    except ValueError as e:
+        release_yolo_model(name)
+        messagebox.showerror("Hata", str(e))
+        return
+
+    video_model_name = name
+    video_detector.start()
+    video_btn.config(text="Videoyu Durdur")
+    info_text.set(f"Video oynatılıyor: {os.path.basename(file_path)}")
+    poll_video(-1)
+
+
+def stop_video():
+    """Çalışan video akışını durdurur ve sabitlenen modeli bırakır."""
+    global video_detector, video_model_name
+
+    if video_detector is None:
+        return
+
+    stats = video_detector.stats()
+    video_detector.stop()
+    video_detector = None
+    release_yolo_model(video_model_name)
+    video_model_name = None
+    video_btn.config(text="Video")
+    info_text.set(
+        f"Video durduruldu. {stats['processed']} kare işlendi, "
+        f"{stats['skipped']} kare atlandı ({stats['fps']:.1f} FPS)"
+    )
+
+
+def poll_video(last_index):
+    """
+    En son tamamlanan video karesini gösterir ve kendini yeniden planlar.
+
+    Parametreler:
+        last_index (int): En son gösterilen karenin indeksi
+    """
+    global detected_objects
+
+    if video_detector is None:
+        return
+
+    latest = video_detector.latest()
+    if latest is not None and latest[0] != last_index:
+        last_index, frame, detected_objects = latest
+        show_result_image(
+            display_buffers.resize('video', frame, DISPLAY_SIZE)
+        )
+        update_table()
+
+        stats = video_detector.stats()
+        info_text.set(
+            f"Kare {last_index + 1} | {stats['fps']:.1f} FPS | "
+            f"{stats['skipped']} kare atlandı"
+        )
+
+    # Tespit bir hatayla durduysa akışı kapat ve hatayı göster
+    if video_detector.error is not None:
+        error = video_detector.error
+        stop_video()
+        messagebox.showerror("Hata", f"Video tespiti durdu:\n{error}")
+        return
+
+    # Video bittiyse akışı kapat
+    if video_detector.finished and not video_detector.is_running():
+        stop_video()
+        return
+
+    root.after(VIDEO_POLL_MS, poll_video, last_index)
 
 
 # ==================== SONUÇ GÖRÜNTÜSÜNÜ GÖSTERME ====================
@@ -397,16 +877,13 @@ def show_result_image(img):
     Parametreler:
         img: OpenCV formatında görüntü (BGR)
     """
-    # BGR'den RGB'ye çevir
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-    # PIL ve Tkinter formatına çevir
-    img_pil = Image.fromarray(img_rgb)
-    img_tk = ImageTk.PhotoImage(img_pil)
+    # BGR'den RGB'ye çevir (OpenCV BGR, Tkinter/PIL RGB kullanır)
+    # Sonuç her seferinde aynı 'rgb' tamponuna yazılır
+    img_rgb = display_buffers.to_rgb('rgb', img)
 
-    # Label'ı güncelle
-    image_label.config(image=img_tk)
-    image_label.image = img_tk
+    # Mevcut PhotoImage'ın içeriğini güncelle (boyut aynıysa yeni
+    # PhotoImage oluşturulmaz)
+    display_surface.show(img_rgb)
 
 
 # ==================== ALGORİTMA BİLGİSİNİ GÖSTERME ====================
@@ -470,6 +947,12 @@ def update_table():
     - Sınırlayıcı kutu alanı
     - Toplam ve benzersiz nesne sayısı
     """
+    with profiling.stage('table'):
+        render_table()
+
+
+def render_table():
+    """update_table'ın asıl tablo oluşturma işlemi."""
     # Mevcut içeriği temizle
     table_text.delete(1.0, END)
 
@@ -490,30 +973,19 @@ def update_table():
     table_text.insert(END, "║      YOLO TESPİT SONUÇLARI            ║\n")
     table_text.insert(END, "╠═══════════════════════════════════════╣\n")
 
-    # Sınıf bazında grupla
-    class_counts = {}
-    for obj in detected_objects:
-        cls = obj['class']
-        if cls not in class_counts:
-            class_counts[cls] = {'count': 0, 'max_conf': 0}
-        class_counts[cls]['count'] += 1
-        class_counts[cls]['max_conf'] = max(
-            class_counts[cls]['max_conf'],
-            obj['confidence']
-        )
+    # Sınıf bazında grupla (adet ve en yüksek güven, vektörel hesaplanır)
+    class_counts = detected_objects.class_summary()
 
     # ========== SINIF BAZLI SONUÇLAR ==========
     table_text.insert(END, "║ SINIF             ADET    GÜVEN      ║\n")
     table_text.insert(END, "╟───────────────────────────────────────╢\n")
 
-    # Her sınıf için satır ekle
-    for cls, data in sorted(class_counts.items(),
-                            key=lambda x: x[1]['count'],
-                            reverse=True):
-        conf_percent = data['max_conf'] * 100
+    # Her sınıf için satır ekle (adede göre azalan sırada)
+    for cls, count, max_conf in class_counts:
+        conf_percent = max_conf * 100
         table_text.insert(
             END,
-            f"║ {cls:<17} {data['count']:<7} %{conf_percent:<6.1f}   ║\n"
+            f"║ {cls:<17} {count:<7} %{conf_percent:<6.1f}   ║\n"
         )
 
     # ========== ÖZET BİLGİLER ==========
@@ -523,7 +995,7 @@ def update_table():
 
     total = len(detected_objects)
     unique = len(class_counts)
-    avg_conf = np.mean([obj['confidence'] for obj in detected_objects]) * 100
+    avg_conf = float(detected_objects.confidences.mean()) * 100
 
     table_text.insert(END, f"║ Toplam Tespit: {total:<23} ║\n")
     table_text.insert(END, f"║ Farklı Sınıf:  {unique:<23} ║\n")
@@ -539,184 +1011,342 @@ def update_table():
     table_text.insert(END, "╚═══════════════════════════════════════╝\n")
 
 
+# ==================== PROFİL PANELİ ====================
+
+def show_profile_panel():
+    """
+    Aşama bazlı süre istatistiklerini ayrı bir pencerede gösterir.
+
+    Pencere açık kaldığı sürece her saniye yenilenir. Özet JSON
+    olarak kaydedilebilir; cProfile/tracemalloc yakalaması başlatılıp
+    durdurulabilir.
+    """
+    global profile_window
+
+    if profile_window is not None and profile_window.winfo_exists():
+        profile_window.lift()
+        return
+
+    profile_window = Toplevel(root)
+    profile_window.title("Performans Profili")
+    profile_window.configure(bg='#E8E0D5')
+
+    text = Text(profile_window, width=60, height=18, font=("Consolas", 9),
+                bg='#FFFFFF', fg='#333333', relief=SUNKEN, bd=2)
+    text.pack(padx=10, pady=10, fill=BOTH, expand=True)
+
+    buttons = Frame(profile_window, bg='#E8E0D5')
+    buttons.pack(pady=5)
+
+    def refresh():
+        if not profile_window.winfo_exists():
+            return
+        text.delete(1.0, END)
+        text.insert(END, profiling.PROFILER.format_table())
+        profile_window.after(PROFILE_REFRESH_MS, refresh)
+
+    def save_json():
+        path = filedialog.asksaveasfilename(
+            title="Profili Kaydet", defaultextension=".json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if path:
+            profiling.PROFILER.to_json(path)
+
+    def toggle_capture():
+        if capture_btn['text'] == "cProfile Başlat":
+            profiling.PROFILER.start_capture()
+            capture_btn.config(text="cProfile Durdur")
+            return
+        report = profiling.PROFILER.stop_capture()
+        capture_btn.config(text="cProfile Başlat")
+        text.delete(1.0, END)
+        text.insert(END, report)
+
+    Button(buttons, text="JSON Kaydet", command=save_json).pack(side=LEFT, padx=5)
+    Button(buttons, text="Sıfırla",
+           command=profiling.PROFILER.reset).pack(side=LEFT, padx=5)
+    capture_btn = Button(buttons, text="cProfile Başlat", command=toggle_capture)
+    capture_btn.pack(side=LEFT, padx=5)
+
+    refresh()
+
+
 # ==================== ANA PENCERE OLUŞTURMA ====================
 
-# Ana Tkinter penceresi oluştur
-root = Tk()
-root.title("YOLO Nesne Tespit - Ödev 5")
-root.geometry("800x700")
-root.configure(bg='#E8E0D5')  # Açık bej arka plan (örnek formla uyumlu)
-
-# ==================== ÜST BÖLÜM (Butonlar ve Görüntü) ====================
-
-# Üst çerçeve
-top_frame = Frame(root, bg='#E8E0D5', bd=3, relief=GROOVE)
-top_frame.pack(pady=20, padx=20, fill=X)
-
-# Sol taraf - Butonlar
-button_frame = Frame(top_frame, bg='#E8E0D5')
-button_frame.pack(side=LEFT, padx=30, pady=20)
-
-# Görüntü Yükle butonu
-load_btn = Button(
-    button_frame,
-    text="Görüntü Yükle",
-    command=load_image,
-    width=20,
-    height=2,
-    font=("Arial", 12, "bold"),
-    bg='#1A1A1A',  # Siyah arka plan
-    fg='white',  # Beyaz yazı
-    activebackground='#333333',
-    activeforeground='white',
-    relief=RAISED,
-    bd=3,
-    cursor='hand2'  # Fare imleci
-)
-load_btn.pack(pady=15)
-
-# YOLO butonu
-yolo_btn = Button(
-    button_frame,
-    text="YOLO",
-    command=apply_yolo,
-    width=20,
-    height=2,
-    font=("Arial", 12, "bold"),
-    bg='#1A1A1A',
-    fg='white',
-    activebackground='#333333',
-    activeforeground='white',
-    relief=RAISED,
-    bd=3,
-    cursor='hand2'
-)
-yolo_btn.pack(pady=15)
-
-# Sağ taraf - Görüntü alanı
-image_frame = Frame(top_frame, bg='#4A90D9', bd=3, relief=SOLID)
-image_frame.pack(side=RIGHT, padx=30, pady=20)
-
-# Görüntü başlığı
-image_title = Label(
-    image_frame,
-    text="Görüntü Örnek\n(300x300 çözünürlük)",
-    font=("Arial", 11),
-    bg='#4A90D9',
-    fg='white'
-)
-image_title.pack(pady=5)
-
-# Placeholder görüntüsü
-placeholder_img = create_placeholder(300, 300)
-
-# Görüntü label'ı
-image_label = Label(
-    image_frame,
-    image=placeholder_img,
-    bg='#4A90D9'
-)
-image_label.image = placeholder_img
-image_label.pack(padx=10, pady=10)
-
-# ==================== BİLGİ ETİKETİ ====================
-
-info_text = StringVar()
-info_text.set("Görüntü yükleyip YOLO butonuna tıklayın")
-
-info_label = Label(
-    root,
-    textvariable=info_text,
-    font=("Arial", 10),
-    bg='#E8E0D5',
-    fg='#333333'
-)
-info_label.pack(pady=5)
-
-# ==================== ALT BÖLÜM (Açıklama ve Tablo) ====================
-
-bottom_frame = Frame(root, bg='#E8E0D5')
-bottom_frame.pack(pady=10, padx=20, fill=BOTH, expand=True)
-
-# Sol alt - Algoritma açıklaması
-left_bottom = Frame(bottom_frame, bg='#E8E0D5')
-left_bottom.pack(side=LEFT, padx=10, fill=BOTH, expand=True)
-
-algo_title = Label(
-    left_bottom,
-    text="ALGORİTMA AÇIKLAMASI",
-    font=("Arial", 11, "bold"),
-    bg='#E8E0D5',
-    fg='#333333'
-)
-algo_title.pack(pady=5)
-
-# Algoritma metin alanı
-algorithm_text = Text(
-    left_bottom,
-    width=40,
-    height=16,
-    font=("Consolas", 9),
-    bg='#FFFFFF',
-    fg='#333333',
-    relief=SUNKEN,
-    bd=2
-)
-algorithm_text.pack(fill=BOTH, expand=True)
-algorithm_text.insert(END, "YOLO butonuna tıkladığınızda\nalgorıtma açıklaması burada görünecek.\n\n")
-algorithm_text.insert(END, "YOLO (You Only Look Once):\n")
-algorithm_text.insert(END, "Gerçek zamanlı nesne tespiti için\ngeliştirilmiş derin öğrenme algoritması.")
-
-# Sağ alt - Sonuç tablosu
-right_bottom = Frame(bottom_frame, bg='#E8E0D5')
-right_bottom.pack(side=RIGHT, padx=10, fill=BOTH, expand=True)
-
-table_title = Label(
-    right_bottom,
-    text="SONUÇ TABLOSU",
-    font=("Arial", 11, "bold"),
-    bg='#E8E0D5',
-    fg='#333333'
-)
-table_title.pack(pady=5)
-
-# Tablo metin alanı
-table_text = Text(
-    right_bottom,
-    width=45,
-    height=16,
-    font=("Consolas", 9),
-    bg='#FFFFFF',
-    fg='#333333',
-    relief=SUNKEN,
-    bd=2
-)
-table_text.pack(fill=BOTH, expand=True)
-
-# Başlangıç tablo içeriği
-update_table()
-
-# ==================== ÖĞRENCİ BİLGİSİ ====================
-
-student_frame = Frame(root, bg='#E8E0D5')
-student_frame.pack(side=BOTTOM, pady=15)
-
-student_label = Label(
-    student_frame,
-    text="  BENGÜSU DUMAN  ",
-    font=("Arial", 11),
-    bg='white',
-    fg='black',
-    bd=1,
-    relief=SOLID,
-    padx=20,
-    pady=5
-)
-student_label.pack()
-
-# ==================== UYGULAMAYI BAŞLAT ====================
-
-# Tkinter ana döngüsünü başlat
-# Bu döngü, pencereyi açık tutar ve kullanıcı etkileşimlerini işler
-root.mainloop()
+# Arayüz yalnızca dosya doğrudan çalıştırıldığında oluşturulur;
+# böylece modül içe aktarıldığında Tk penceresi açılmaz.
+if __name__ == '__main__':
+    # Arayüzde aşama süreleri her zaman ölçülür (maliyeti ihmal edilebilir)
+    profiling.PROFILER.enabled = True
+
+    # Ön yükleme açıksa model, pencere oluşturulurken arka planda yüklenir
+    preload_future = None
+    if PRELOAD_MODEL and YOLO_AVAILABLE:
+        preload_future = yolo_executor.submit(preload_model)
+
+    # Ana Tkinter penceresi oluştur
+    root = Tk()
+    root.title("YOLO Nesne Tespit - Ödev 5")
+    root.geometry("800x700")
+    root.configure(bg='#E8E0D5')  # Açık bej arka plan (örnek formla uyumlu)
+
+    # ==================== ÜST BÖLÜM (Butonlar ve Görüntü) ====================
+
+    # Üst çerçeve
+    top_frame = Frame(root, bg='#E8E0D5', bd=3, relief=GROOVE)
+    top_frame.pack(pady=20, padx=20, fill=X)
+
+    # Sol taraf - Butonlar
+    button_frame = Frame(top_frame, bg='#E8E0D5')
+    button_frame.pack(side=LEFT, padx=30, pady=20)
+
+    # Görüntü Yükle butonu
+    load_btn = Button(
+        button_frame,
+        text="Görüntü Yükle",
+        command=load_image,
+        width=20,
+        height=2,
+        font=("Arial", 12, "bold"),
+        bg='#1A1A1A',  # Siyah arka plan
+        fg='white',  # Beyaz yazı
+        activebackground='#333333',
+        activeforeground='white',
+        relief=RAISED,
+        bd=3,
+        cursor='hand2'  # Fare imleci
+    )
+    load_btn.pack(pady=15)
+
+    # YOLO butonu
+    yolo_btn = Button(
+        button_frame,
+        text="YOLO",
+        command=apply_yolo,
+        width=20,
+        height=2,
+        font=("Arial", 12, "bold"),
+        bg='#1A1A1A',
+        fg='white',
+        activebackground='#333333',
+        activeforeground='white',
+        relief=RAISED,
+        bd=3,
+        cursor='hand2'
+    )
+    yolo_btn.pack(pady=15)
+
+    # Video butonu (video dosyasında canlı tespit)
+    video_btn = Button(
+        button_frame,
+        text="Video",
+        command=toggle_video,
+        width=20,
+        height=2,
+        font=("Arial", 12, "bold"),
+        bg='#1A1A1A',
+        fg='white',
+        activebackground='#333333',
+        activeforeground='white',
+        relief=RAISED,
+        bd=3,
+        cursor='hand2'
+    )
+    video_btn.pack(pady=15)
+
+    # İptal butonu (yalnızca tespit çalışırken etkin)
+    cancel_btn = Button(
+        button_frame,
+        text="İptal",
+        command=cancel_yolo,
+        width=20,
+        font=("Arial", 10, "bold"),
+        bg='#1A1A1A',
+        fg='white',
+        activebackground='#333333',
+        activeforeground='white',
+        relief=RAISED,
+        bd=3,
+        cursor='hand2',
+        state=DISABLED
+    )
+    cancel_btn.pack(pady=5)
+
+    # Profil butonu (aşama süreleri paneli)
+    profile_btn = Button(
+        button_frame,
+        text="Profil",
+        command=show_profile_panel,
+        width=20,
+        font=("Arial", 10, "bold"),
+        bg='#1A1A1A',
+        fg='white',
+        activebackground='#333333',
+        activeforeground='white',
+        relief=RAISED,
+        bd=3,
+        cursor='hand2'
+    )
+    profile_btn.pack(pady=5)
+
+    # Model seçimi (n/s/m/l/x; seçim bir sonraki tespitte geçerli olur)
+    model_var = StringVar(value=selected_model)
+    model_box = ttk.Combobox(
+        button_frame,
+        textvariable=model_var,
+        values=model_registry.names() + [cascade.AUTO],
+        state='readonly',
+        width=18
+    )
+    model_box.bind('<<ComboboxSelected>>', select_model)
+    model_box.pack(pady=5)
+
+    # Döşemeli tespit (çok büyük görüntülerde küçük nesneler için)
+    tile_var = BooleanVar(value=False)
+    tile_check = Checkbutton(
+        button_frame,
+        text="Döşemeli tespit",
+        variable=tile_var,
+        bg='#E8E0D5'
+    )
+    tile_check.pack(pady=5)
+
+    # Sağ taraf - Görüntü alanı
+    image_frame = Frame(top_frame, bg='#4A90D9', bd=3, relief=SOLID)
+    image_frame.pack(side=RIGHT, padx=30, pady=20)
+
+    # Görüntü başlığı
+    image_title = Label(
+        image_frame,
+        text="Görüntü Örnek\n(300x300 çözünürlük)",
+        font=("Arial", 11),
+        bg='#4A90D9',
+        fg='white'
+    )
+    image_title.pack(pady=5)
+
+    # Placeholder görüntüsü
+    placeholder_img = create_placeholder(300, 300)
+
+    # Görüntü label'ı
+    image_label = Label(
+        image_frame,
+        image=placeholder_img,
+        bg='#4A90D9'
+    )
+    image_label.image = placeholder_img
+    image_label.pack(padx=10, pady=10)
+
+    # Sonraki görüntüler placeholder PhotoImage'ın üzerine yazılır
+    display_surface = buffers.DisplaySurface(image_label, placeholder_img)
+
+    # ==================== BİLGİ ETİKETİ ====================
+
+    info_text = StringVar()
+    info_text.set("Görüntü yükleyip YOLO butonuna tıklayın")
+
+    info_label = Label(
+        root,
+        textvariable=info_text,
+        font=("Arial", 10),
+        bg='#E8E0D5',
+        fg='#333333'
+    )
+    info_label.pack(pady=5)
+
+    # İlerleme göstergesi (tespit sürerken hareket eder)
+    progress_bar = ttk.Progressbar(root, mode='indeterminate', length=300)
+    progress_bar.pack(pady=2)
+
+    # ==================== ALT BÖLÜM (Açıklama ve Tablo) ====================
+
+    bottom_frame = Frame(root, bg='#E8E0D5')
+    bottom_frame.pack(pady=10, padx=20, fill=BOTH, expand=True)
+
+    # Sol alt - Algoritma açıklaması
+    left_bottom = Frame(bottom_frame, bg='#E8E0D5')
+    left_bottom.pack(side=LEFT, padx=10, fill=BOTH, expand=True)
+
+    algo_title = Label(
+        left_bottom,
+        text="ALGORİTMA AÇIKLAMASI",
+        font=("Arial", 11, "bold"),
+        bg='#E8E0D5',
+        fg='#333333'
+    )
+    algo_title.pack(pady=5)
+
+    # Algoritma metin alanı
+    algorithm_text = Text(
+        left_bottom,
+        width=40,
+        height=16,
+        font=("Consolas", 9),
+        bg='#FFFFFF',
+        fg='#333333',
+        relief=SUNKEN,
+        bd=2
+    )
+    algorithm_text.pack(fill=BOTH, expand=True)
+    algorithm_text.insert(END, "YOLO butonuna tıkladığınızda\nalgorıtma açıklaması burada görünecek.\n\n")
+    algorithm_text.insert(END, "YOLO (You Only Look Once):\n")
+    algorithm_text.insert(END, "Gerçek zamanlı nesne tespiti için\ngeliştirilmiş derin öğrenme algoritması.")
+
+    # Sağ alt - Sonuç tablosu
+    right_bottom = Frame(bottom_frame, bg='#E8E0D5')
+    right_bottom.pack(side=RIGHT, padx=10, fill=BOTH, expand=True)
+
+    table_title = Label(
+        right_bottom,
+        text="SONUÇ TABLOSU",
+        font=("Arial", 11, "bold"),
+        bg='#E8E0D5',
+        fg='#333333'
+    )
+    table_title.pack(pady=5)
+
+    # Tablo metin alanı
+    table_text = Text(
+        right_bottom,
+        width=45,
+        height=16,
+        font=("Consolas", 9),
+        bg='#FFFFFF',
+        fg='#333333',
+        relief=SUNKEN,
+        bd=2
+    )
+    table_text.pack(fill=BOTH, expand=True)
+
+    # Başlangıç tablo içeriği
+    update_table()
+
+    # ==================== ÖĞRENCİ BİLGİSİ ====================
+
+    student_frame = Frame(root, bg='#E8E0D5')
+    student_frame.pack(side=BOTTOM, pady=15)
+
+    student_label = Label(
+        student_frame,
+        text="  BENGÜSU DUMAN  ",
+        font=("Arial", 11),
+        bg='white',
+        fg='black',
+        bd=1,
+        relief=SOLID,
+        padx=20,
+        pady=5
+    )
+    student_label.pack()
+
+    # ==================== UYGULAMAYI BAŞLAT ====================
+
+    if preload_future is not None:
+        info_text.set("Model arka planda yükleniyor ve ısıtılıyor...")
+        root.after(JOB_POLL_MS, poll_preload, preload_future)
+
+    # Tkinter ana döngüsünü başlat
+    # Bu döngü, pencereyi açık tutar ve kullanıcı etkileşimlerini işler
+    root.mainloop()
 
@@ -0,0 +1,368 @@
+"""
+Hareket Kapılı (Motion-Gated) ve İlgi Bölgeli (ROI) Çıkarım
+
+Sabit kameralarda karelerin çoğunda sahne değişmez. Model her karede
+çalıştırılmak yerine önce ucuz bir hareket analizi yapılır:
+
+1. Kare küçültülür, griye çevrilir ve bulanıklaştırılır
+2. Arka plan modeliyle fark alınır:
+   • 'diff' : Kayan ortalama arka plan (cv2.accumulateWeighted) ile
+              mutlak fark ve eşikleme
+   • 'mog2' : OpenCV MOG2 arka plan çıkarıcı
+3. Değişen piksel oranı eşiğin altındaysa model çalışmaz; önceki
+   tespitler aynen kullanılır (sahne değişmedi)
+4. Aksi halde bağlı bileşenlerden hareket bölgeleri çıkarılır, kenar
+   payı eklenir ve örtüşen bölgeler birleştirilir
+5. Bölgeler tam kareden kesilir ve TEK bir model çağrısında birlikte
+   işlenir; kutular Detections.offset ile tam kare koordinatlarına
+   taşınır
+6. Önceki tespitlerden, hiçbir hareket bölgesine değmeyenler korunur
+   (duran nesneler kaybolmaz; bölgede yeniden bulunan nesne iki kez
+   sayılmaz)
+
+Hareketli alan karenin büyük bölümünü kaplıyorsa (full_frame_ratio)
+veya refresh_every kare boyunca tam kare tespit yapılmadıysa tüm kare
+işlenir. İlk kare her zaman tam kare işlenir.
+
+Kullanım:
+---------
+    gate = MotionGate(method='diff')
+    for frame in kareler:
+        dets, ran = gate.step(model, frame)
+    print(gate.stats())
+
+    python video.py kamera.mp4 --all-frames --motion diff
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import cv2
+import numpy as np
+
+import detection
+import profiling
+
+# ==================== SABİTLER ====================
+
+# Hareket analizi yöntemleri
+METHODS = ('diff', 'mog2')
+
+# Hareket analizinin yapıldığı ölçek (tam kareye göre)
+DEFAULT_SCALE = 0.25
+
+# 'diff' yönteminde piksel farkı eşiği (0-255)
+DEFAULT_THRESHOLD = 25
+
+# Modelin çalışması için gereken en düşük değişen piksel oranı
+DEFAULT_MIN_MOTION = 0.002
+
+# 'diff' arka planının güncellenme hızı (kayan ortalama katsayısı)
+BACKGROUND_ALPHA = 0.05
+
+# Bölgelere eklenen kenar payı (tam kare pikseli)
+ROI_PADDING = 32
+
+# En küçük bölge kenarı (tam kare pikseli); çok küçük kesitler bağlam
+# taşımaz ve modelin giriş boyutuna aşırı büyütülür
+MIN_ROI_SIZE = 160
+
+# Hareketli alan bu oranı aşarsa tüm kare işlenir
+FULL_FRAME_RATIO = 0.5
+
+# Bir model çağrısındaki en fazla bölge; fazlası tek bölgede birleşir
+MAX_REGIONS = 8
+
+
+# ==================== BÖLGE İŞLEMLERİ ====================
+
+def merge_regions(boxes):
+    """
+    Örtüşen veya değen kutuları birleşimleriyle değiştirir.
+
+    Parametreler:
+        boxes (list): [x1, y1, x2, y2] kutular
+
+    Dönüş:
+        list: Birbirine değmeyen kutular
+    """
+    boxes = [list(box) for box in boxes]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                if (a[0] <= b[2] and b[0] <= a[2]
+                        and a[1] <= b[3] and b[1] <= a[3]):
+                    boxes[i] = [min(a[0], b[0]), min(a[1], b[1]),
+                                max(a[2], b[2]), max(a[3], b[3])]
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return boxes
+
+
+def expand_region(box, width, height, padding=ROI_PADDING,
+                  min_size=MIN_ROI_SIZE):
+    """
+    Bölgeye kenar payı ekler, en küçük boyuta büyütür ve kareye sığdırır.
+
+    Dönüş:
+        list: [x1, y1, x2, y2]
+    """
+    x1, y1, x2, y2 = box
+    x1, y1, x2, y2 = x1 - padding, y1 - padding, x2 + padding, y2 + padding
+
+    # En küçük boyuta merkezden büyüt
+    grow_x = max(0, min(min_size, width) - (x2 - x1))
+    grow_y = max(0, min(min_size, height) - (y2 - y1))
+    x1, x2 = x1 - grow_x // 2, x2 + grow_x - grow_x // 2
+    y1, y2 = y1 - grow_y // 2, y2 + grow_y - grow_y // 2
+
+    # Kare dışına taşan kısmı içeri kaydır
+    shift_x = max(0, -x1) - max(0, x2 - width)
+    shift_y = max(0, -y1) - max(0, y2 - height)
+    return [max(0, x1 + shift_x), max(0, y1 + shift_y),
+            min(width, x2 + shift_x), min(height, y2 + shift_y)]
+
+
+def detect_regions(model, frame, regions, conf=detection.DEFAULT_CONF,
+                   imgsz=None):
+    """
+    Bölgeleri tek bir batch'te işler; kutuları tam kareye taşır.
+
+    Parametreler:
+        model: YOLO modeli veya arka uç
+        frame (numpy.ndarray): Tam kare (BGR)
+        regions (list): [x1, y1, x2, y2] bölgeler
+        conf (float): Minimum güven eşiği
+        imgsz (int): Model giriş boyutu
+
+    Dönüş:
+        Detections: Tam kare koordinatlarında tespitler
+    """
+    # Kesitler kopyalanmaz (görünüm); model letterbox sırasında okur
+    crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in regions]
+    results = detection.detect_images(model, crops, conf, imgsz)
+    return detection.Detections.concatenate(
+        dets.offset(x1, y1)
+        for dets, (x1, y1, _, _) in zip(results, regions)
+    )
+
+
+def outside_regions(dets, regions):
+    """
+    Hiçbir bölgeyle örtüşmeyen tespitleri döndürür.
+
+    Bölgeye kısmen giren bir kutu da atılır: bölge kesiti nesneyi
+    yeniden (kırpılmış olarak) bulur, eski kutu korunursa aynı nesne
+    iki kez raporlanır.
+
+    Parametreler:
+        dets (Detections): Tespitler
+        regions (list): [x1, y1, x2, y2] bölgeler
+
+    Dönüş:
+        Detections: Bölgeler dışındaki tespitler
+    """
+    if not len(dets) or not regions:
+        return dets
+    b = dets.boxes[:, None, :]
+    r = np.asarray(regions)
+    overlaps = ((b[..., 0] < r[:, 2]) & (b[..., 2] > r[:, 0])
+                & (b[..., 1] < r[:, 3]) & (b[..., 3] > r[:, 1])).any(axis=1)
+    return dets.select(~overlaps)
+
+
+# ==================== HAREKET KAPISI ====================
+
+class MotionGate:
+    """
+    Tek bir sabit kamera akışı için hareket kapısı.
+
+    Akışa özel durum (arka plan modeli, son tespitler) tuttuğu için her
+    akışta ayrı bir MotionGate kullanılmalıdır.
+    """
+
+    def __init__(self, method='diff', scale=DEFAULT_SCALE,
+                 threshold=DEFAULT_THRESHOLD, min_motion=DEFAULT_MIN_MOTION,
+                 full_frame_ratio=FULL_FRAME_RATIO, refresh_every=0,
+                 max_regions=MAX_REGIONS):
+        """
+        Parametreler:
+            method (str): 'diff' veya 'mog2'
+            scale (float): Hareket analizinin yapıldığı ölçek
+            threshold (int): 'diff' piksel farkı eşiği
+            min_motion (float): Modeli tetikleyen değişen piksel oranı
+            full_frame_ratio (float): Bu oranın üstünde tüm kare işlenir
+            refresh_every (int): Bu kadar karede bir tüm kare işlenir
+                (0: yalnızca gerektiğinde)
+            max_regions (int): Bir çağrıdaki en fazla bölge
+
+        Hata:
+            ValueError: Bilinmeyen yöntem
+        """
+        if method not in METHODS:
+            raise ValueError(f"Bilinmeyen hareket yöntemi: {method}")
+
+        self.method = method
+        self.scale = scale
+        self.threshold = threshold
+        self.min_motion = min_motion
+        self.full_frame_ratio = full_frame_ratio
+        self.refresh_every = refresh_every
+        self.max_regions = max_regions
+
+        self._background = None
+        self._subtractor = (
+            cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+            if method == 'mog2' else None
+        )
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        self._last = None
+        self._since_full = 0
+
+        # İstatistikler
+        self.frames = 0
+        self.quiet = 0          # Model çalışmayan kareler
+        self.roi_frames = 0     # Yalnızca bölgelerin işlendiği kareler
+        self.full_frames = 0    # Tüm karenin işlendiği kareler
+        self.regions = 0        # İşlenen toplam bölge sayısı
+        self.roi_pixels = 0     # İşlenen bölgelerin toplam alanı
+        self.frame_pixels = 0   # Bölgeli karelerin toplam alanı
+
+    def motion_mask(self, frame):
+        """
+        Küçültülmüş karede hareket maskesini hesaplar.
+
+        Dönüş:
+            numpy.ndarray: 0/255 maske veya ilk karede None
+        """
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale,
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+
+        if self._subtractor is not None:
+            mask = self._subtractor.apply(gray)
+            if self.frames == 0:
+                return None
+        else:
+            if self._background is None:
+                self._background = gray.astype(np.float32)
+                return None
+            diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+            cv2.accumulateWeighted(gray, self._background, BACKGROUND_ALPHA)
+            _, mask = cv2.threshold(diff, self.threshold, 255,
+                                    cv2.THRESH_BINARY)
+
+        return cv2.dilate(mask, self._kernel, iterations=2)
+
+    def find_regions(self, frame):
+        """
+        Karedeki hareket bölgelerini bulur.
+
+        Parametreler:
+            frame (numpy.ndarray): Tam kare (BGR)
+
+        Dönüş:
+            list veya None: [x1, y1, x2, y2] bölgeler (hareket yoksa boş
+            liste); tüm kare işlenmeliyse None
+        """
+        mask = self.motion_mask(frame)
+        if mask is None:
+            return None
+        if cv2.countNonZero(mask) < self.min_motion * mask.size:
+            return []
+
+        height, width = frame.shape[:2]
+        count, _, blobs, _ = cv2.connectedComponentsWithStats(mask, 8)
+        # Etiket 0 arka plandır; [x, y, w, h, alan]
+        boxes = [
+            expand_region(
+                [int(x / self.scale), int(y / self.scale),
+                 int((x + w) / self.scale), int((y + h) / self.scale)],
+                width, height
+            )
+            for x, y, w, h, _ in blobs[1:count].tolist()
+        ]
+        regions = merge_regions(boxes)
+
+        if len(regions) > self.max_regions:
+            r = np.asarray(regions)
+            regions = [[int(r[:, 0].min()), int(r[:, 1].min()),
+                        int(r[:, 2].max()), int(r[:, 3].max())]]
+
+        area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        if area > self.full_frame_ratio * width * height:
+            return None
+        return regions
+
+    def step(self, model, frame, conf=detection.DEFAULT_CONF, imgsz=None):
+        """
+        Bir kareyi hareket kapısından geçirir.
+
+        Parametreler:
+            model: YOLO modeli veya arka uç
+            frame (numpy.ndarray): Tam kare (BGR)
+            conf (float): Minimum güven eşiği
+            imgsz (int): Model giriş boyutu
+
+        Dönüş:
+            tuple: (Detections, model çalıştı mı)
+        """
+        with profiling.stage('motion'):
+            regions = self.find_regions(frame)
+        self.frames += 1
+        self._since_full += 1
+
+        if self.refresh_every and self._since_full >= self.refresh_every:
+            regions = None
+
+        if regions is None or self._last is None:
+            dets = detection.detect_images(model, [frame], conf, imgsz)[0]
+            self.full_frames += 1
+            self._since_full = 0
+        elif not regions:
+            # Sahne değişmedi: önceki tespitler geçerli
+            self.quiet += 1
+            return self._last, False
+        else:
+            dets = detection.Detections.concatenate(
+                [outside_regions(self._last, regions),
+                 detect_regions(model, frame, regions, conf, imgsz)],
+                self._last.names
+            )
+            self.roi_frames += 1
+            self.regions += len(regions)
+            self.roi_pixels += sum((x2 - x1) * (y2 - y1)
+                                   for x1, y1, x2, y2 in regions)
+            self.frame_pixels += frame.shape[0] * frame.shape[1]
+
+        self._last = dets
+        return dets, True
+
+    def stats(self):
+        """
+        Kapı istatistikleri.
+
+        Dönüş:
+            dict: frames, inference_calls, call_rate (çağrı/kare),
+            quiet, roi_frames, full_frames, avg_regions, roi_area
+            (bölgeli karelerde işlenen alan oranı)
+        """
+        calls = self.roi_frames + self.full_frames
+        return {
+            'frames': self.frames,
+            'inference_calls': calls,
+            'call_rate': round(calls / self.frames, 4) if self.frames else 0.0,
+            'quiet': self.quiet,
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'avg_regions': round(self.regions / self.roi_frames, 2)
+            if self.roi_frames else 0.0,
+            'roi_area': round(self.roi_pixels / self.frame_pixels, 4)
+            if self.frame_pixels else 0.0,
+        }
@@ -0,0 +1,264 @@
+"""
+Paralel Tespit Hattı (Pipeline)
+
+Çok sayıda görüntü işlenirken dosya okuma ve decode işlemleri ile model
+çıkarımı (inference) aynı iş parçacığında sırayla yapılırsa, işlemci her
+ileri geçiş arasında disk ve decode işlemini bekler. Bu modül işi üç
+aşamaya böler ve aşamaları eş zamanlı çalıştırır:
+
+    [okuma + decode]  --kuyruk-->  [batch + model]  --kuyruk-->  [son işlem]
+     (N iş parçacığı)              (1 iş parçacığı)              (1 iş parçacığı)
+
+Aşamalar arasındaki kuyruklar sınırlıdır (bounded). Bir aşama geride
+kalırsa önceki aşama kuyruk dolduğunda bekler (backpressure); böylece
+bellek kullanımı görüntü sayısından bağımsız olarak sabit kalır.
+
+cv2.imdecode ve PyTorch işlemleri GIL'i bıraktığı için iş parçacıkları
+decode maliyetinin çıkarımla örtüşmesine yeterlidir.
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import queue
+import threading
+
+import detection
+
+# ==================== SABİTLER ====================
+
+# Varsayılan decode iş parçacığı sayısı
+DEFAULT_DECODE_WORKERS = 4
+
+# Aşamalar arası kuyruk kapasitesi (batch sayısı cinsinden)
+DEFAULT_QUEUE_BATCHES = 2
+
+# Kuyruk işlemlerinde durdurma sinyalini kontrol etme aralığı (sn)
+_POLL_INTERVAL = 0.1
+
+# Aşama sonu işareti
+_DONE = object()
+
+
+# ==================== YARDIMCI FONKSİYONLAR ====================
+
+def _put(q, item, stop):
+    """
+    Kuyruğa eleman ekler; kuyruk doluysa bekler.
+
+    Durdurma sinyali verilirse beklemeyi bırakır.
+
+    Dönüş:
+        bool: Eleman eklendiyse True, hat durdurulduysa False
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    """
+    Kuyruktan eleman alır; kuyruk boşsa bekler.
+
+    Dönüş:
+        Kuyruktaki eleman veya hat durdurulduysa _DONE
+    """
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+# ==================== AŞAMALAR ====================
+
+def _feed_stage(paths, path_queue, workers, stop):
+    """Dosya yollarını decode iş parçacıklarına dağıtır."""
+    for path in paths:
+        if not _put(path_queue, path, stop):
+            return
+    # Her decode iş parçacığı için bir bitiş işareti gönder
+    for _ in range(workers):
+        _put(path_queue, _DONE, stop)
+
+
+def _decode_stage(path_queue, decoded_queue, stop, errors):
+    """Dosyaları okur ve decode eder (N adet paralel çalışır)."""
+    try:
+        while True:
+            path = _get(path_queue, stop)
+            if path is _DONE:
+                break
+
+            # Bozuk/boş dosya yalnızca o dosyanın hatasıdır; hat durmaz
+            try:
+                img = detection.read_image(path)
+                error = None if img is not None else "Görüntü decode edilemedi"
+            except detection.READ_ERRORS as e:
+                img, error = None, str(e) or type(e).__name__
+
+            if not _put(decoded_queue, (path, img, error), stop):
+                return
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        # Çıkarım aşaması her decode iş parçacığından bir bitiş işareti bekler
+        _put(decoded_queue, _DONE, stop)
+
+
+def _infer_stage(model, decoded_queue, result_queue, workers, conf,
+                 batch_size, imgsz, stop, errors):
+    """Decode edilen görüntüleri batch'ler halinde modele verir."""
+    batch = []
+    remaining = workers
+
+    def flush():
+        paths = [item[0] for item in batch]
+        images = [item[1] for item in batch]
+        for path, img, objects in zip(
+                paths, images,
+                detection.detect_images(model, images, conf, imgsz)):
+            if not _put(result_queue, (path, img, objects, None), stop):
+                return False
+        batch.clear()
+        return True
+
+    try:
+        while remaining > 0:
+            item = _get(decoded_queue, stop)
+            if item is _DONE:
+                if stop.is_set():
+                    return
+                remaining -= 1
+                continue
+
+            path, img, error = item
+            if error is not None:
+                # Hatalı dosyalar modele gitmeden doğrudan aktarılır
+                if not _put(result_queue, (path, None, None, error), stop):
+                    return
+                continue
+
+            batch.append(item)
+            if len(batch) >= batch_size and not flush():
+                return
+
+        # Kalan eksik batch'i işle
+        if batch and not flush():
+            return
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        _put(result_queue, _DONE, stop)
+
+
+def _postprocess_stage(result_queue, output_queue, postprocess, stop, errors):
+    """Sonuçlar üzerinde son işlemi (örn. çizim) çalıştırır."""
+    try:
+        while True:
+            item = _get(result_queue, stop)
+            if item is _DONE:
+                break
+
+            path, img, objects, error = item
+            output = None
+            if error is None and postprocess is not None:
+                output = postprocess(path, img, objects)
+
+            if not _put(output_queue, (path, objects, error, output), stop):
+                return
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        _put(output_queue, _DONE, stop)
+
+
+# ==================== ANA FONKSİYON ====================
+
+def run_pipeline(model, paths, conf=detection.DEFAULT_CONF,
+                 batch_size=detection.DEFAULT_BATCH_SIZE,
+                 decode_workers=DEFAULT_DECODE_WORKERS,
+                 queue_batches=DEFAULT_QUEUE_BATCHES,
+                 postprocess=None, imgsz=None):
+    """
+    Görüntüleri paralel okuma/decode, toplu çıkarım ve son işlem
+    aşamalarından geçirir.
+
+    Parametreler:
+        model: Yüklenmiş YOLO modeli
+        paths (list): Görüntü dosyası yolları
+        conf (float): Minimum güven eşiği
+        batch_size (int): Model çağrısı başına görüntü sayısı
+        decode_workers (int): Okuma/decode iş parçacığı sayısı
+        queue_batches (int): Kuyruk kapasitesi (batch sayısı cinsinden)
+        postprocess (callable): Opsiyonel son işlem fonksiyonu;
+            postprocess(yol, görüntü, tespitler) şeklinde çağrılır
+        imgsz (int): Model giriş boyutu (None ise modelin varsayılanı)
+
+    Dönüş:
+        generator: (yol, Detections, hata mesajı, son işlem çıktısı)
+        dörtlüleri. Hatalı dosyalarda Detections yerine None döner.
+        Sonuçların sırası girişteki sırayla aynı olmayabilir.
+    """
+    decode_workers = max(1, int(decode_workers))
+    capacity = max(1, batch_size * queue_batches)
+
+    # Sınırlı kuyruklar: dolduğunda üretici aşama bekler (backpressure)
+    path_queue = queue.Queue(maxsize=capacity)
+    decoded_queue = queue.Queue(maxsize=capacity)
+    result_queue = queue.Queue(maxsize=capacity)
+    output_queue = queue.Queue(maxsize=capacity)
+
+    stop = threading.Event()
+    errors = []
+
+    threads = [
+        threading.Thread(
+            target=_feed_stage,
+            args=(paths, path_queue, decode_workers, stop),
+            name='pipeline-feed'
+        ),
+        threading.Thread(
+            target=_infer_stage,
+            args=(model, decoded_queue, result_queue, decode_workers, conf,
+                  batch_size, imgsz, stop, errors),
+            name='pipeline-infer'
+        ),
+        threading.Thread(
+            target=_postprocess_stage,
+            args=(result_queue, output_queue, postprocess, stop, errors),
+            name='pipeline-post'
+        ),
+    ]
+    for i in range(decode_workers):
+        threads.append(threading.Thread(
+            target=_decode_stage,
+            args=(path_queue, decoded_queue, stop, errors),
+            name=f'pipeline-decode-{i}'
+        ))
+
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        while True:
+            item = _get(output_queue, stop)
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Tüketici erken çıkarsa tüm aşamaları durdur
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
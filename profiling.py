@@ -0,0 +1,336 @@
+"""
+Aşama Bazlı Süre Ölçümü ve Profil Çıkarma
+
+Tespit hattının her aşaması için duvar saati süresi (ve istenirse bellek
+ayırma miktarı) kaydedilir. Kayıtlar aşama başına histogram olarak tutulur
+ve p50/p95/p99 yüzdelikleri hesaplanır. Harici bir profil aracı
+bağlamadan performans gerilemeleri bulunabilir.
+
+Ölçülen Aşamalar:
+-----------------
+read        : Dosyanın eşlenmesi ve sayfalarının diskten okunması
+decode      : cv2.imdecode
+resize      : Gösterim için yeniden boyutlandırma
+color       : Renk dönüşümü (BGR → RGB)
+preprocess  : Modelin ön işlemesi (letterbox, normalizasyon)
+inference   : Modelin ileri geçişi
+nms         : Non-Maximum Suppression (son işleme)
+extract     : Kutuların NumPy dizilerine aktarılması
+draw        : Kutu ve etiket çizimi
+photoimage  : ImageTk.PhotoImage dönüşümü
+table       : Sonuç tablosunun oluşturulması
+
+Kullanım:
+---------
+    with profiling.stage('decode'):
+        img = cv2.imdecode(...)
+
+    profiling.PROFILER.enabled = True
+    print(profiling.PROFILER.summary())
+
+Ölçüm kapalıyken (varsayılan) stage() neredeyse maliyetsizdir.
+YOLO_PROFILE=1 ortam değişkeni ölçümü başlangıçta açar.
+
+cProfile yakalaması (start_capture) iş parçacığı başınadır: asıl iş
+arka plan iş parçacıklarında (tespit havuzu, pipeline aşamaları)
+yapıldığı için her iş parçacığı yakalama açıkken ilk stage() girişinde
+kendi profilcisini başlatır. Rapor tüm iş parçacıklarının birleşimidir.
+(Python 3.12+ profilcisi zaten tüm iş parçacıklarını izler.)
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+import tracemalloc
+from collections import deque
+
+# ==================== SABİTLER ====================
+
+# Aşama başına saklanan en fazla örnek sayısı (eski örnekler atılır)
+MAX_SAMPLES = 10000
+
+# Aşamaların rapordaki sırası (hattaki sırayla)
+STAGE_ORDER = (
+    'read', 'decode', 'resize', 'color', 'preprocess', 'inference', 'nms',
+    'extract', 'draw', 'photoimage', 'table'
+)
+
+
+# ==================== YARDIMCI FONKSİYONLAR ====================
+
+def percentile(sorted_values, q):
+    """
+    Sıralı bir listenin q. yüzdeliğini doğrusal enterpolasyonla hesaplar.
+
+    Parametreler:
+        sorted_values (list): Küçükten büyüğe sıralı değerler
+        q (float): Yüzdelik (0-100 arası)
+
+    Dönüş:
+        float: Yüzdelik değeri
+    """
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    frac = pos - low
+    return sorted_values[low] * (1 - frac) + sorted_values[high] * frac
+
+
+# ==================== PROFİLCİ ====================
+
+class Profiler:
+    """
+    Aşama bazlı süre ve bellek ayırma kayıtlarını toplar.
+
+    Birden fazla iş parçacığından aynı anda kullanılabilir.
+    """
+
+    def __init__(self, enabled=False, max_samples=MAX_SAMPLES):
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self._times = {}
+        self._allocs = {}
+        self._lock = threading.Lock()
+
+        # cProfile yakalaması: iş parçacığı başına bir profilci
+        self._profiles = []
+        self._capture_id = 0      # Her start_capture'da artar
+        self._capturing = False
+        self._local = threading.local()
+
+    # ---------- Kayıt ----------
+
+    def _series(self, store, name):
+        series = store.get(name)
+        if series is None:
+            with self._lock:
+                series = store.setdefault(name, deque(maxlen=self.max_samples))
+        return series
+
+    def record(self, name, seconds, allocated=None):
+        """
+        Bir aşama için ölçülmüş süreyi kaydeder.
+
+        Parametreler:
+            name (str): Aşama adı
+            seconds (float): Süre (saniye)
+            allocated (int): Aşamada ayrılan bellek (bayt, opsiyonel)
+        """
+        if not self.enabled:
+            return
+        self._series(self._times, name).append(seconds)
+        if allocated is not None:
+            self._series(self._allocs, name).append(allocated)
+
+    def _attach_thread(self):
+        """
+        Çağıran iş parçacığının cProfile profilcisini yakalama durumuna
+        göre başlatır veya durdurur.
+        """
+        local = self._local
+        capture_id, profile = getattr(local, 'capture', None) or (None, None)
+        if self._capturing and capture_id == self._capture_id:
+            return
+
+        # Önceki (bitmiş) yakalamadan kalan profilciyi kapat
+        if profile is not None:
+            profile.disable()
+        local.capture = None
+        if not self._capturing:
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: başka bir profilci zaten tüm iş
+            # parçacıklarını izliyor
+            profile = None
+        else:
+            with self._lock:
+                self._profiles.append(profile)
+        local.capture = (self._capture_id, profile)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        if self._capturing or getattr(self._local, 'capture', None):
+            self._attach_thread()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = None
+            if tracing:
+                allocated = max(0, tracemalloc.get_traced_memory()[0] - before)
+            self.record(name, elapsed, allocated)
+
+    def stage(self, name):
+        """
+        Bir kod bloğunun süresini ölçen bağlam yöneticisi.
+
+        Ölçüm kapalıysa hiçbir şey yapmayan bir bağlam döndürür.
+        tracemalloc açıksa blok sonunda net bellek artışı da kaydedilir.
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._measure(name)
+
+    def reset(self):
+        """Tüm kayıtları siler."""
+        with self._lock:
+            self._times.clear()
+            self._allocs.clear()
+
+    # ---------- Ayrıntılı yakalama (cProfile / tracemalloc) ----------
+
+    def start_capture(self, cprofile=True, memory=True):
+        """
+        cProfile ve/veya tracemalloc yakalamasını başlatır.
+
+        Parametreler:
+            cprofile (bool): Fonksiyon bazlı profil çıkar
+            memory (bool): Aşama başına bellek ayırmayı da ölç
+        """
+        self.enabled = True
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if cprofile and not self._capturing:
+            with self._lock:
+                self._profiles = []
+                self._capture_id += 1
+                self._capturing = True
+            # Çağıran iş parçacığı hemen, diğerleri ilk stage() girişinde
+            self._attach_thread()
+
+    def stop_capture(self, limit=25):
+        """
+        Yakalamayı durdurur ve cProfile raporunu döndürür.
+
+        Parametreler:
+            limit (int): Rapordaki en fazla fonksiyon sayısı
+
+        Dönüş:
+            str: Kümülatif süreye göre sıralı profil raporu
+        """
+        report = ''
+        if self._capturing:
+            with self._lock:
+                self._capturing = False
+                profiles, self._profiles = self._profiles, []
+            # Çağıran iş parçacığınınki hemen, diğerleri bir sonraki
+            # stage() girişinde kendi iş parçacıklarında kapanır
+            self._attach_thread()
+            if profiles:
+                stream = io.StringIO()
+                pstats.Stats(*profiles, stream=stream) \
+                    .sort_stats('cumulative').print_stats(limit)
+                report = stream.getvalue()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return report
+
+    # ---------- Rapor ----------
+
+    def summary(self):
+        """
+        Aşama başına istatistikleri hesaplar.
+
+        Dönüş:
+            dict: aşama → {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms,
+            total_ms, [alloc_kb_mean, alloc_kb_p95]}
+        """
+        with self._lock:
+            times = {name: sorted(values) for name, values in self._times.items()}
+            allocs = {name: sorted(values) for name, values in self._allocs.items()}
+
+        order = {name: i for i, name in enumerate(STAGE_ORDER)}
+        result = {}
+        for name in sorted(times, key=lambda n: (order.get(n, len(order)), n)):
+            values = times[name]
+            if not values:
+                continue
+            total = sum(values)
+            stats = {
+                'count': len(values),
+                'mean_ms': 1000 * total / len(values),
+                'p50_ms': 1000 * percentile(values, 50),
+                'p95_ms': 1000 * percentile(values, 95),
+                'p99_ms': 1000 * percentile(values, 99),
+                'max_ms': 1000 * values[-1],
+                'total_ms': 1000 * total,
+            }
+            if allocs.get(name):
+                stats['alloc_kb_mean'] = sum(allocs[name]) / len(allocs[name]) / 1024
+                stats['alloc_kb_p95'] = percentile(allocs[name], 95) / 1024
+            result[name] = {k: round(v, 3) for k, v in stats.items()}
+        return result
+
+    def to_json(self, path=None):
+        """
+        Özeti JSON olarak döndürür veya dosyaya yazar.
+
+        Parametreler:
+            path (str): Hedef dosya (None ise yalnızca metin döner)
+
+        Dönüş:
+            str: JSON metni
+        """
+        text = json.dumps(self.summary(), indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def format_table(self):
+        """
+        Özeti sabit genişlikli bir metin tablosu olarak biçimlendirir.
+
+        Dönüş:
+            str: Tablo metni (arayüzdeki profil paneli için)
+        """
+        summary = self.summary()
+        if not summary:
+            return "Henüz ölçüm yok.\n"
+
+        lines = [f"{'AŞAMA':<11}{'ADET':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'KB':>8}",
+                 '-' * 52]
+        for name, stats in summary.items():
+            alloc = stats.get('alloc_kb_mean')
+            lines.append(
+                f"{name:<11}{stats['count']:>6}"
+                f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+                f"{stats['p99_ms']:>9.2f}"
+                f"{(f'{alloc:.0f}' if alloc is not None else '-'):>8}"
+            )
+        lines.append('-' * 52)
+        lines.append("Süreler milisaniye cinsindendir.")
+        return '\n'.join(lines) + '\n'
+
+
+# ==================== VARSAYILAN PROFİLCİ ====================
+
+# Tüm modüllerin kullandığı ortak profilci
+PROFILER = Profiler(enabled=os.environ.get('YOLO_PROFILE') == '1')
+
+
+def stage(name):
+    """Ortak profilci ile bir kod bloğunun süresini ölçer."""
+    return PROFILER.stage(name)
+
+
+def record(name, seconds, allocated=None):
+    """Ortak profilciye hazır ölçülmüş bir süre ekler."""
+    PROFILER.record(name, seconds, allocated)
@@ -0,0 +1,448 @@
+"""
+INT8 Nicemleme (Quantization) ve Doğruluk Sapması Raporu
+
+Yalnızca CPU bulunan makinelerde modelin ağırlıkları (ve statik modda
+aktivasyonları) 8 bit tamsayıya çevrilerek çıkarım hızlandırılabilir.
+Nicemleme ONNX Runtime ile, dışa aktarılmış ONNX modeli üzerinde yapılır.
+
+Modlar:
+-------
+dynamic : Yalnızca ağırlıklar 8 bite (UINT8) çevrilir; aktivasyon
+          ölçekleri çalışma anında hesaplanır. Kalibrasyon gerekmez.
+          Eski ONNX Runtime sürümlerinin CPU sağlayıcısı ConvInteger'ı
+          yalnızca işaretsiz ağırlıklarla çalıştırır; YOLO katmanlarının
+          neredeyse tamamı evrişim olduğu için ağırlıklar her sürümde
+          çalışan QUInt8 ile nicemlenir.
+static  : Ağırlıklar ve aktivasyonlar INT8 (QDQ biçimi). Aktivasyon
+          aralıkları küçük bir yerel görüntü klasöründe kalibre edilir.
+          Algılama başı (son katman) varsayılan olarak FP32 bırakılır;
+          kutu koordinatları nicemlemeye en duyarlı kısımdır.
+
+Önbellek:
+---------
+Nicemlenmiş model, dışa aktarılan FP32 model ile aynı '.yolo_cache'
+dizinine yazılır. Statik modda dosya adı kalibrasyon kümesinin
+özetini içerir; farklı bir klasörle kalibre edilen model ayrı tutulur:
+
+    .yolo_cache/yolov8n-3f2a9c1b7d4e-640-int8-static-a1b2c3d4.onnx
+
+Sapma Raporu:
+-------------
+Aynı görüntülerde FP32 sonuçları referans (doğru kabul edilen) alınır
+ve INT8 sonuçları kutu düzeyinde karşılaştırılır:
+• recall    : FP32 kutularının INT8'de bulunan oranı (IoU ≥ 0.5)
+• precision : INT8 kutularının FP32'de karşılığı olan oranı
+• map50     : FP32'ye göre mAP@0.5
+• Ortalama eşleşme IoU'su ve güven farkı
+• Görüntü başına süre ve hızlanma oranı
+
+Kullanım:
+---------
+    python quantize.py --weights yolov8n.pt --mode static --calib kalibrasyon/
+    python detection.py resimler/ --backend onnx --int8 static --calib kalibrasyon/
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+import backends
+import detection
+import tracker
+
+# onnxruntime.quantization: ONNX modellerini INT8'e çevirmek için (opsiyonel)
+# Kurulum: pip install onnxruntime onnx
+try:
+    from onnxruntime import quantization as ortq
+
+    QUANTIZATION_AVAILABLE = True
+except ImportError:
+    QUANTIZATION_AVAILABLE = False
+
+# ==================== SABİTLER ====================
+
+# Nicemleme modları
+MODES = ('dynamic', 'static')
+
+# Kalibrasyonda kullanılan en fazla görüntü sayısı
+DEFAULT_CALIB_IMAGES = 64
+
+# Sapma raporunda kullanılan en fazla görüntü sayısı
+DEFAULT_EVAL_IMAGES = 100
+
+# FP32 ve INT8 kutularının eşleşmesi için en düşük IoU
+MATCH_IOU = 0.5
+
+# ultralytics ONNX düğüm adları: '/model.<katman>/...'
+_LAYER_PATTERN = re.compile(r'^/model\.(\d+)/')
+
+
+# ==================== KALİBRASYON ====================
+
+def calibration_id(paths, length=8):
+    """
+    Kalibrasyon kümesini tanımlayan kısa bir özet üretir.
+
+    Parametreler:
+        paths (list): Kalibrasyon görüntüleri
+
+    Dönüş:
+        str: Onaltılık özet (dosya adları ve boyutlarından)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        digest.update(str(os.path.getsize(path)).encode())
+    return digest.hexdigest()[:length]
+
+
+class ImageCalibrationReader(
+        ortq.CalibrationDataReader if QUANTIZATION_AVAILABLE else object):
+    """Kalibrasyon görüntülerini modele birer birer veren okuyucu."""
+
+    def __init__(self, paths, input_name, imgsz):
+        self.paths = paths
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._iter = iter(paths)
+
+    def get_next(self):
+        for path in self._iter:
+            img = detection.read_image(path)
+            if img is None:
+                continue
+            batch, _ = backends.preprocess([img], self.imgsz)
+            return {self.input_name: batch}
+        return None
+
+    def rewind(self):
+        self._iter = iter(self.paths)
+
+
+def head_nodes(onnx_path):
+    """
+    Algılama başına (en son '/model.N/' katmanı) ait düğüm adları.
+
+    Parametreler:
+        onnx_path (str): FP32 ONNX modeli
+
+    Dönüş:
+        list: Düğüm adları
+    """
+    import onnx
+
+    graph = onnx.load(onnx_path, load_external_data=False).graph
+    layers = {}
+    for node in graph.node:
+        match = _LAYER_PATTERN.match(node.name)
+        if match:
+            layers.setdefault(int(match.group(1)), []).append(node.name)
+    return layers[max(layers)] if layers else []
+
+
+# ==================== NİCEMLEME ====================
+
+def quantize_model(fp32_path, out_path, mode='static', calib_paths=None,
+                   imgsz=detection.DEFAULT_IMGSZ, keep_head=True):
+    """
+    FP32 ONNX modelini INT8'e çevirir.
+
+    Parametreler:
+        fp32_path (str): Kaynak ONNX modeli
+        out_path (str): Hedef dosya
+        mode (str): 'dynamic' veya 'static'
+        calib_paths (list): Kalibrasyon görüntüleri (static için)
+        imgsz (int): Giriş boyutu
+        keep_head (bool): Algılama başını FP32 bırak (static)
+
+    Hata:
+        RuntimeError: onnxruntime.quantization yüklü değilse
+        ValueError: Bilinmeyen mod veya kalibrasyon görüntüsü yoksa
+    """
+    if not QUANTIZATION_AVAILABLE:
+        raise RuntimeError(
+            "onnxruntime yüklü değil! (pip install onnxruntime onnx)"
+        )
+    if mode not in MODES:
+        raise ValueError(f"Bilinmeyen nicemleme modu: {mode}")
+
+    if mode == 'dynamic':
+        # QInt8 ağırlıklı ConvInteger eski ORT sürümlerinde CPU'da yoktur
+        ortq.quantize_dynamic(fp32_path, out_path,
+                              weight_type=ortq.QuantType.QUInt8)
+        return
+
+    if not calib_paths:
+        raise ValueError("Statik nicemleme için kalibrasyon görüntüsü gerekli")
+
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(fp32_path,
+                                   providers=['CPUExecutionProvider'])
+    reader = ImageCalibrationReader(calib_paths,
+                                    session.get_inputs()[0].name, imgsz)
+    del session
+
+    ortq.quantize_static(
+        fp32_path, out_path, reader,
+        quant_format=ortq.QuantFormat.QDQ,
+        activation_type=ortq.QuantType.QUInt8,
+        weight_type=ortq.QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=ortq.CalibrationMethod.MinMax,
+        nodes_to_exclude=head_nodes(fp32_path) if keep_head else None,
+    )
+
+
+def load_quantized(weights=detection.DEFAULT_WEIGHTS,
+                   imgsz=detection.DEFAULT_IMGSZ, mode='static',
+                   calib_dir=None, calib_images=DEFAULT_CALIB_IMAGES,
+                   cache_dir=None, intra_threads=None):
+    """
+    INT8 modeli yükler; önbellekte yoksa dışa aktarır ve nicemler.
+
+    Parametreler:
+        weights (str): .pt ağırlık dosyası
+        imgsz (int): Giriş boyutu
+        mode (str): 'dynamic' veya 'static'
+        calib_dir (str): Kalibrasyon görüntüleri klasörü (static için)
+        calib_images (int): Kullanılacak en fazla kalibrasyon görüntüsü
+        cache_dir (str): Önbellek dizini
+        intra_threads (int): ONNX Runtime iş parçacığı sayısı
+
+    Dönüş:
+        backends.OnnxBackend: detection.detect_images ile kullanılabilir
+
+    Hata:
+        RuntimeError: Gerekli kütüphane yüklü değilse
+        ValueError: Statik modda kalibrasyon klasörü verilmediyse
+    """
+    weights_path = backends.local_weights(weights)
+
+    calib_paths = None
+    if mode == 'static':
+        if not calib_dir:
+            raise ValueError("Statik nicemleme için kalibrasyon klasörü "
+                             "gerekli (--calib)")
+        calib_paths = detection.list_images(calib_dir)[:calib_images]
+        tag = f"-int8-static-{calibration_id(calib_paths)}"
+    else:
+        tag = f"-int8-{mode}"
+
+    target = backends.artifact_path(weights_path, 'onnx', imgsz, cache_dir,
+                                    tag)
+    if not os.path.exists(target):
+        # FP32 model (ve PyTorch) yalnızca nicemleme gerekiyorsa yüklenir
+        fp32_path = backends.export_cached(weights_path, 'onnx', imgsz,
+                                           cache_dir)
+        # Yarım kalan nicemleme önbellekte geçerli model gibi görünmesin
+        partial = target + '.tmp'
+        quantize_model(fp32_path, partial, mode, calib_paths, imgsz)
+        os.replace(partial, target)
+
+    # Sınıf adları nicemlenmiş modelin üst verisinden okunur
+    model = backends.OnnxBackend(target, None, imgsz, intra_threads)
+    model.identity = os.path.basename(target)
+    return model
+
+
+# ==================== SAPMA RAPORU ====================
+
+def match_detections(reference, candidate, iou=MATCH_IOU):
+    """
+    İki tespit kümesini sınıf bazında IoU ile bire bir eşler.
+
+    Dönüş:
+        tuple: (referans indeksleri, aday indeksleri, eşleşme IoU'ları)
+    """
+    scores = tracker.iou_matrix(reference.boxes, candidate.boxes)
+    scores[reference.class_ids[:, None] != candidate.class_ids[None, :]] = 0
+    ref_idx, cand_idx = tracker.greedy_match(scores, iou)
+    return ref_idx, cand_idx, scores[ref_idx, cand_idx]
+
+
+def average_precision(confidences, matched, positives):
+    """
+    Tek bir sınıf için AP (tüm noktalı enterpolasyon).
+
+    Parametreler:
+        confidences (numpy.ndarray): Aday tespitlerin güvenleri
+        matched (numpy.ndarray): Her aday doğru (eşleşmiş) mu
+        positives (int): Referans kutu sayısı
+
+    Dönüş:
+        float: 0-1 arası AP
+    """
+    if positives == 0:
+        return 0.0
+    order = np.argsort(-confidences, kind='stable')
+    tp = np.cumsum(matched[order])
+    fp = np.cumsum(~matched[order])
+    recall = np.concatenate([[0.0], tp / positives, [1.0]])
+    precision = np.concatenate([[1.0], tp / np.maximum(tp + fp, 1), [0.0]])
+    # Kesinlik eğrisini sağdan sola monoton hale getir
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    steps = np.nonzero(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[steps + 1] - recall[steps])
+                        * precision[steps + 1]))
+
+
+def _timed(model, images, conf, imgsz=None):
+    """Görüntüleri tek tek işler; (sonuçlar, görüntü başına ms) döndürür."""
+    detection.detect_images(model, images[:1], conf, imgsz)  # Isınma
+    # İstatistik tutan modellerde (ör. CascadeModel) ısınma sayılmaz
+    if hasattr(model, 'reset_stats'):
+        model.reset_stats()
+    results = []
+    start = time.perf_counter()
+    for img in images:
+        results.extend(detection.detect_images(model, [img], conf, imgsz))
+    elapsed = time.perf_counter() - start
+    return results, 1000 * elapsed / max(len(images), 1)
+
+
+def drift_report(reference_model, candidate_model, images,
+                 conf=detection.DEFAULT_CONF, iou=MATCH_IOU,
+                 labels=('fp32', 'int8'), sizes=(None, None)):
+    """
+    Aday modelin (INT8) referans modele (FP32) göre sapmasını ölçer.
+
+    Parametreler:
+        reference_model: FP32 model
+        candidate_model: Karşılaştırılan model
+        images (list): BGR görüntüler
+        conf (float): Minimum güven eşiği
+        iou (float): Eşleşme için en düşük IoU
+        labels (tuple): Rapordaki süre ve kutu alanlarının önekleri
+            (referans, aday)
+        sizes (tuple): Giriş boyutları (referans, aday); None modelin
+            varsayılanıdır
+
+    Dönüş:
+        dict: recall, precision, map50, mean_iou, mean_conf_delta,
+        fp32_ms, int8_ms, speedup, images, fp32_boxes, int8_boxes
+    """
+    reference, fp32_ms = _timed(reference_model, images, conf, sizes[0])
+    candidate, int8_ms = _timed(candidate_model, images, conf, sizes[1])
+    ref_label, cand_label = labels
+
+    per_class = {}  # sınıf → [güvenler, eşleşti mi, referans sayısı]
+    matched_total = 0
+    ious, conf_deltas = [], []
+
+    for ref, cand in zip(reference, candidate):
+        ref_idx, cand_idx, match_iou = match_detections(ref, cand, iou)
+        matched_total += len(ref_idx)
+        ious.extend(match_iou.tolist())
+        conf_deltas.extend(np.abs(ref.confidences[ref_idx]
+                                  - cand.confidences[cand_idx]).tolist())
+
+        hit = np.zeros(len(cand), dtype=bool)
+        hit[cand_idx] = True
+        for class_id in np.union1d(ref.class_ids, cand.class_ids).tolist():
+            entry = per_class.setdefault(class_id, [[], [], 0])
+            mask = cand.class_ids == class_id
+            entry[0].append(cand.confidences[mask])
+            entry[1].append(hit[mask])
+            entry[2] += int(np.count_nonzero(ref.class_ids == class_id))
+
+    aps = [
+        average_precision(np.concatenate(confs), np.concatenate(hits), count)
+        for confs, hits, count in per_class.values() if count
+    ]
+    fp32_boxes = sum(len(d) for d in reference)
+    int8_boxes = sum(len(d) for d in candidate)
+
+    return {
+        'images': len(images),
+        f'{ref_label}_boxes': fp32_boxes,
+        f'{cand_label}_boxes': int8_boxes,
+        'recall': round(matched_total / fp32_boxes, 4) if fp32_boxes else 1.0,
+        'precision': round(matched_total / int8_boxes, 4) if int8_boxes else 1.0,
+        'map50': round(float(np.mean(aps)), 4) if aps else 1.0,
+        'mean_iou': round(float(np.mean(ious)), 4) if ious else 0.0,
+        'mean_conf_delta': round(float(np.mean(conf_deltas)), 4)
+        if conf_deltas else 0.0,
+        f'{ref_label}_ms': round(fp32_ms, 3),
+        f'{cand_label}_ms': round(int8_ms, 3),
+        'speedup': round(fp32_ms / int8_ms, 3) if int8_ms > 0 else 0.0,
+    }
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="INT8 nicemleme ve FP32'ye göre doğruluk sapması raporu"
+    )
+    parser.add_argument('--weights', default=detection.DEFAULT_WEIGHTS,
+                        help="Model ağırlık dosyası")
+    parser.add_argument('--imgsz', type=int, default=detection.DEFAULT_IMGSZ,
+                        help="Model giriş boyutu")
+    parser.add_argument('--mode', choices=MODES, default='static',
+                        help="Nicemleme modu")
+    parser.add_argument('--calib',
+                        help="Kalibrasyon görüntüleri klasörü (static için)")
+    parser.add_argument('--calib-images', type=int,
+                        default=DEFAULT_CALIB_IMAGES,
+                        help="Kullanılacak en fazla kalibrasyon görüntüsü")
+    parser.add_argument('--eval',
+                        help="Sapma raporu için görüntü klasörü "
+                             "(varsayılan: --calib)")
+    parser.add_argument('--eval-images', type=int, default=DEFAULT_EVAL_IMAGES,
+                        help="Raporda kullanılacak en fazla görüntü")
+    parser.add_argument('--conf', type=float, default=detection.DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="ONNX Runtime iş parçacığı sayısı")
+    parser.add_argument('--output', help="Raporun yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    int8 = load_quantized(args.weights, args.imgsz, args.mode, args.calib,
+                          args.calib_images, intra_threads=args.threads)
+    print(f"INT8 model: {int8.identity}", file=sys.stderr)
+
+    eval_dir = args.eval or args.calib
+    if not eval_dir:
+        print("Sapma raporu için --eval veya --calib gerekli.", file=sys.stderr)
+        return 0
+
+    images = [img for img in map(
+        detection.read_image, detection.list_images(eval_dir)[:args.eval_images]
+    ) if img is not None]
+    if not images:
+        print("Değerlendirme görüntüsü bulunamadı.", file=sys.stderr)
+        return 1
+
+    fp32 = backends.load_backend(args.weights, 'onnx', args.imgsz,
+                                 intra_threads=args.threads)
+    report = drift_report(fp32, int8, images, args.conf)
+    report['mode'] = args.mode
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
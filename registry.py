@@ -0,0 +1,396 @@
+"""
+Çoklu Model Kayıt Defteri (Bellek Bütçeli)
+
+Aynı süreçte birden fazla YOLO varyantı (n/s/m/l/x) ve özel ağırlıklar
+kullanılabilir. Modeller ilk istendiklerinde yüklenir; toplam ağırlık
+belleği bütçeyi aşarsa en uzun süredir kullanılmayan (LRU) ve o anda
+çalışmayan modeller bellekten çıkarılır.
+
+Model Adları:
+-------------
+• Varyantlar: 'yolov8n' ... 'yolov8x' veya kısaca 'n' ... 'x'
+• Özel ağırlıklar: registry.register('kask', 'kask_best.pt')
+
+Yalnızca bu adlar kabul edilir; HTTP isteğinden gelen bir ad keyfi bir
+dosyanın yüklenmesine yol açmaz.
+
+Model Seçimi:
+-------------
+• İstek başına: registry.detect(images, model='yolov8s')
+• Görüntü başına: route fonksiyonu her görüntü için bir model adı
+  döndürür (veya models listesi verilir); görüntüler modele göre
+  gruplanır, her grup tek bir batch halinde işlenir ve sonuçlar giriş
+  sırasıyla döner.
+
+Kayıt defterinin kendisi detect() metoduna sahip olduğu için
+detection.detect_images ile doğrudan model yerine kullanılabilir.
+
+Bellek Tahmini:
+---------------
+PyTorch modellerinde parametre ve tampon baytları toplanır. Dışa
+aktarılmış arka uçlarda ağırlık dosyasının boyutunun iki katı alınır.
+Çıkarım sırasındaki ara tensörler (aktivasyonlar) bütçeye dahil değildir.
+
+Kullanım:
+---------
+    registry = ModelRegistry(memory_budget=512 * 1024 * 1024)
+    dets = registry.detect(images, model='s')
+    dets = registry.detect(images, route=lambda img: 'n' if küçük(img) else 'm')
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import detection
+
+# ==================== SABİTLER ====================
+
+# Hazır YOLOv8 varyantları (ad → ağırlık dosyası)
+VARIANTS = OrderedDict(
+    (f'yolov8{size}', f'yolov8{size}.pt') for size in 'nsmlx'
+)
+
+# Varsayılan bellek bütçesi (bayt); YOLO_MODEL_BUDGET_MB ile değiştirilebilir
+DEFAULT_MEMORY_BUDGET = int(
+    float(os.environ.get('YOLO_MODEL_BUDGET_MB', 1024)) * 1024 * 1024
+)
+
+# Dışa aktarılmış modellerde dosya boyutuna uygulanan bellek çarpanı
+_FILE_SIZE_FACTOR = 2
+
+
+# ==================== BELLEK TAHMİNİ ====================
+
+def estimate_bytes(model, weights):
+    """
+    Yüklenmiş modelin ağırlık belleğini tahmin eder.
+
+    Parametreler:
+        model: YOLO modeli veya arka uç
+        weights (str): Ağırlık dosyası
+
+    Dönüş:
+        int: Bayt
+    """
+    module = getattr(model, 'model', None)
+    if hasattr(module, 'parameters') and hasattr(module, 'buffers'):
+        tensors = list(module.parameters()) + list(module.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    return expected_bytes(weights)
+
+
+def expected_bytes(weights):
+    """Yüklemeden önceki tahmin (dosya boyutundan; bilinmiyorsa 0)."""
+    if os.path.isfile(weights):
+        return _FILE_SIZE_FACTOR * os.path.getsize(weights)
+    return 0
+
+
+# ==================== YÖNLENDİRME ====================
+
+def size_router(large_model, min_pixels, small_model=None):
+    """
+    Büyük çözünürlüklü görüntüleri daha büyük modele yönlendirir.
+
+    Yüksek çözünürlüklü görüntülerde nesneler modelin giriş boyutuna
+    küçültüldüğünde birkaç piksele iner; bu görüntüler daha büyük bir
+    varyanttan fayda görür.
+
+    Parametreler:
+        large_model (str): Büyük görüntüler için model adı
+        min_pixels (int): Bu piksel sayısı ve üstü büyük kabul edilir
+        small_model (str): Diğer görüntüler (None ise varsayılan model)
+
+    Dönüş:
+        callable: Görüntü → model adı
+    """
+    def route(image):
+        height, width = image.shape[:2]
+        return large_model if height * width >= min_pixels else small_model
+
+    return route
+
+
+# ==================== KAYIT DEFTERİ ====================
+
+class _Entry:
+    """Yüklenmiş bir model ve kullanım bilgisi."""
+
+    __slots__ = ('model', 'nbytes', 'users')
+
+    def __init__(self, model, nbytes):
+        self.model = model
+        self.nbytes = nbytes
+        self.users = 0
+
+
+class ModelRegistry:
+    """
+    Adlandırılmış modelleri tembel yükleyen ve bütçeye göre çıkaran
+    kayıt defteri.
+
+    Tüm metotlar iş parçacığı güvenlidir. Bir model use() bloğu içinde
+    (veya detect() sırasında) kullanılırken çıkarılmaz.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 default=detection.DEFAULT_WEIGHTS, backend='torch',
+                 imgsz=detection.DEFAULT_IMGSZ, intra_threads=None,
+                 route=None):
+        """
+        Parametreler:
+            memory_budget (int): Yüklü modellerin toplam bütçesi (bayt)
+            default (str): Ad verilmediğinde kullanılacak model
+            backend (str): 'torch', 'onnx' veya 'openvino'
+            imgsz (int): Dışa aktarılmış arka uçların giriş boyutu
+            intra_threads (int): Arka uç iş parçacığı sayısı
+            route (callable): Model belirtilmeyen çağrılarda görüntü
+                başına model seçen fonksiyon (None ise varsayılan model)
+        """
+        self.memory_budget = memory_budget
+        self.route = route
+        self.backend = backend
+        self.imgsz = imgsz
+        self.intra_threads = intra_threads
+
+        self._weights = OrderedDict(VARIANTS)
+        self._entries = OrderedDict()  # ad → _Entry (LRU sırasında)
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+        # Varsayılan model bir varyant değilse dosya adıyla kaydedilir
+        try:
+            self.default = self.resolve(default)
+        except KeyError:
+            self.default = os.path.splitext(os.path.basename(default))[0]
+            self._weights[self.default] = default
+
+        # İstatistikler
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    # ---------- Adlar ----------
+
+    def register(self, name, weights):
+        """
+        Özel ağırlıkları bir adla kaydeder.
+
+        Parametreler:
+            name (str): Model adı
+            weights (str): Ağırlık dosyası
+        """
+        with self._lock:
+            self._weights[name] = weights
+
+    def names(self):
+        """Seçilebilecek model adları."""
+        with self._lock:
+            return list(self._weights)
+
+    def resolve(self, name):
+        """
+        Kısa adı veya ağırlık dosyası adını kayıtlı ada çevirir.
+
+        'n' → 'yolov8n', 'yolov8s.pt' → 'yolov8s'
+
+        Hata:
+            KeyError: Ad kayıtlı değilse
+        """
+        if name is None:
+            return self.default
+        if name in self._weights:
+            return name
+        for candidate in (f'yolov8{name}', os.path.splitext(name)[0]):
+            if candidate in self._weights:
+                return candidate
+        for registered, weights in self._weights.items():
+            if weights == name:
+                return registered
+        raise KeyError(f"Bilinmeyen model: {name} "
+                       f"(seçenekler: {', '.join(self._weights)})")
+
+    # ---------- Yükleme ve çıkarma ----------
+
+    def _load(self, name):
+        weights = self._weights[name]
+        if self.backend == 'torch':
+            return detection.load_model(weights)
+
+        import backends
+
+        return backends.load_backend(weights, self.backend, self.imgsz,
+                                     intra_threads=self.intra_threads)
+
+    def _evict(self, needed, keep):
+        """Bütçeye sığmak için boştaki en eski modelleri çıkarır."""
+        used = sum(entry.nbytes for entry in self._entries.values())
+        for name in list(self._entries):
+            if used + needed <= self.memory_budget:
+                break
+            entry = self._entries[name]
+            if name == keep or entry.users:
+                continue
+            del self._entries[name]
+            used -= entry.nbytes
+            self.evictions += 1
+
+    def acquire(self, name=None):
+        """
+        Modeli döndürür (gerekirse yükler) ve kullanımda işaretler.
+
+        Her acquire() için bir release() çağrılmalıdır; use() bunu
+        otomatik yapar.
+
+        Dönüş:
+            tuple: (kayıtlı ad, model)
+        """
+        name = self.resolve(name)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                entry.users += 1
+                self.hits += 1
+                return name, entry.model
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Aynı model iki iş parçacığında aynı anda yüklenmez; farklı
+        # modellerin yüklenmesi birbirini beklemez
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None:
+                    self._entries.move_to_end(name)
+                    entry.users += 1
+                    self.hits += 1
+                    return name, entry.model
+                # Yer önceden açılır; yükleme sırasında bellek tepe yapmaz
+                self._evict(expected_bytes(self._weights[name]), name)
+
+            model = self._load(name)
+            entry = _Entry(model, estimate_bytes(model, self._weights[name]))
+            entry.users = 1
+
+            with self._lock:
+                self._entries[name] = entry
+                self.loads += 1
+                self._evict(0, name)
+
+        gc.collect()
+        return name, model
+
+    def release(self, name):
+        """acquire() ile alınan modeli serbest bırakır."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry.users -= 1
+            self._evict(0, None)
+
+    @contextmanager
+    def use(self, name=None):
+        """
+        Modeli blok süresince kullanımda tutar.
+
+            with registry.use('yolov8s') as model:
+                model(image)
+        """
+        name, model = self.acquire(name)
+        try:
+            yield model
+        finally:
+            self.release(name)
+
+    def get(self, name=None):
+        """
+        Modeli döndürür (kullanımda işaretlemeden).
+
+        Tek iş parçacıklı kullanım içindir; eş zamanlı kullanımda
+        use() tercih edilmelidir.
+        """
+        name, model = self.acquire(name)
+        self.release(name)
+        return model
+
+    def unload(self, name):
+        """Modeli (kullanımda değilse) bellekten çıkarır."""
+        name = self.resolve(name)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and not entry.users:
+                del self._entries[name]
+                self.evictions += 1
+        gc.collect()
+
+    def is_loaded(self, name=None):
+        """Model bellekte mi?"""
+        name = self.resolve(name)
+        with self._lock:
+            return name in self._entries
+
+    # ---------- Çıkarım ----------
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None,
+               model=None, route=None, models=None):
+        """
+        Görüntüleri seçilen model(ler)le işler.
+
+        Parametreler:
+            images (list): BGR görüntüler
+            conf (float): Minimum güven eşiği
+            imgsz (int): Model giriş boyutu
+            model (str): Tüm görüntüler için model adı
+            route (callable): Görüntü → model adı (görüntü başına seçim)
+            models (list): Her görüntü için model adı (None = varsayılan)
+
+        Dönüş:
+            list: Her görüntü için Detections (giriş sırasıyla)
+
+        Hata:
+            KeyError: Bilinmeyen model adı
+        """
+        if models is None:
+            route = route or (self.route if model is None else None)
+            if route is not None:
+                models = [route(img) for img in images]
+            else:
+                models = [model] * len(images)
+
+        groups = OrderedDict()
+        for i, name in enumerate(models):
+            groups.setdefault(self.resolve(name), []).append(i)
+
+        results = [None] * len(images)
+        for name, indices in groups.items():
+            with self.use(name) as selected:
+                computed = detection.detect_images(
+                    selected, [images[i] for i in indices], conf, imgsz
+                )
+            for i, dets in zip(indices, computed):
+                results[i] = dets
+        return results
+
+    def stats(self):
+        """
+        Kayıt defteri istatistikleri.
+
+        Dönüş:
+            dict: loaded, bytes, budget, loads, hits, evictions
+        """
+        with self._lock:
+            return {
+                'loaded': {name: entry.nbytes
+                           for name, entry in self._entries.items()},
+                'bytes': sum(e.nbytes for e in self._entries.values()),
+                'budget': self.memory_budget,
+                'loads': self.loads,
+                'hits': self.hits,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,454 @@
+"""
+HTTP Tespit Servisi (Mikro-Batch'leme ile)
+
+Tk penceresini elle kullanmadan tespit yapmak için yerel bir HTTP sunucusu.
+Yalnızca standart kütüphane (asyncio) kullanılır.
+
+Mikro-Batch'leme:
+-----------------
+Eş zamanlı gelen istekler tek tek modele verilmez. İlk istek geldiğinde
+en fazla max_wait_ms kadar beklenir; bu sürede gelen istekler (en fazla
+max_batch adet) tek bir model çağrısında birlikte işlenir. Yük altında
+modelin batch boyutu dolar ve saniyedeki istek sayısı artar; yük yokken
+bir istek en fazla max_wait_ms kadar ek gecikme görür.
+
+Decode ve model çağrısı iş parçacığı havuzunda çalışır; olay döngüsü
+bu sırada yeni bağlantıları kabul etmeye devam eder.
+
+Uç Noktalar:
+------------
+POST /detect   Gövde: ham görüntü dosyası (image/jpeg, image/png, ...)
+               veya 'file' alanlı multipart/form-data
+               Sorgu: ?model=yolov8s (opsiyonel; bkz. registry.py)
+               Yanıt: {"objects": [{class, class_id, confidence, bbox,
+               area}, ...], "count": N, "model": M, "batch_size": B,
+               "latency_ms": T}
+GET  /health   {"status": "ok"}
+GET  /stats    İstek/batch sayıları, gecikme yüzdelikleri ve yüklü modeller
+
+Farklı modelleri isteyen eş zamanlı istekler aynı batch'e girer; batch
+içinde modele göre gruplanır. Modeller ilk istendiklerinde yüklenir ve
+bellek bütçesi (--memory-budget) aşılınca en eski model çıkarılır.
+
+Kullanım:
+---------
+    python server.py --port 8000 --max-batch 8 --max-wait-ms 10
+    curl --data-binary @resim.jpg -H "Content-Type: image/jpeg" \\
+         http://127.0.0.1:8000/detect?model=yolov8s
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from urllib.parse import parse_qs
+from email.parser import BytesParser
+from email.policy import HTTP
+from concurrent.futures import ThreadPoolExecutor
+
+import detection
+import profiling
+import registry
+
+# ==================== SABİTLER ====================
+
+# Bir model çağrısındaki en fazla istek sayısı
+DEFAULT_MAX_BATCH = 8
+
+# İlk istekten sonra batch'in dolmasını bekleme süresi (milisaniye)
+DEFAULT_MAX_WAIT_MS = 10
+
+# Kabul edilen en büyük istek gövdesi (bayt)
+MAX_BODY_BYTES = 50 * 1024 * 1024
+
+# Gecikme yüzdelikleri için saklanan son istek sayısı
+LATENCY_WINDOW = 10000
+
+# HTTP durum metinleri
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class HttpError(Exception):
+    """İstemciye belirli bir HTTP durum koduyla döndürülecek hata."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ==================== MİKRO-BATCH'LEYİCİ ====================
+
+class MicroBatcher:
+    """
+    Eş zamanlı istekleri toplayıp tek model çağrısında işler.
+
+    Model çağrıları tek bir iş parçacığında sırayla yapılır; böylece
+    aynı model nesnesi iki iş parçacığından aynı anda kullanılmaz.
+    Model bir registry.ModelRegistry ise her istek kendi modelini seçebilir.
+    """
+
+    def __init__(self, model, conf=detection.DEFAULT_CONF, imgsz=None,
+                 max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.model = model
+        self.conf = conf
+        self.imgsz = imgsz
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix='infer')
+
+        # İstatistikler
+        self.requests = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def start(self):
+        """Batch döngüsünü çalışan olay döngüsünde başlatır."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Batch döngüsünü durdurur."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, image, model=None):
+        """
+        Bir görüntüyü sıraya ekler ve sonucunu bekler.
+
+        Parametreler:
+            image (numpy.ndarray): BGR görüntü
+            model (str): Kayıtlı model adı (None ise varsayılan)
+
+        Dönüş:
+            tuple: (Detections, batch boyutu)
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, model, future))
+        return await future
+
+    def _infer(self, images, models):
+        """Batch'i modele verir (kayıt defterinde modele göre gruplanır)."""
+        if isinstance(self.model, registry.ModelRegistry):
+            return self.model.detect(images, self.conf, self.imgsz,
+                                     models=models)
+        return detection.detect_images(self.model, images, self.conf,
+                                       self.imgsz)
+
+    async def _collect(self):
+        """İlk isteği bekler, ardından süre dolana kadar batch'i doldurur."""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # İptal edilmiş (bağlantısı kopmuş) istekleri modele verme
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+
+            images = [image for image, _, _ in batch]
+            models = [model for _, model, _ in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._infer, images, models
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            for (_, _, future), dets in zip(batch, results):
+                if not future.done():
+                    future.set_result((dets, len(batch)))
+
+    def stats(self):
+        """
+        Servis istatistiklerini döndürür.
+
+        Dönüş:
+            dict: requests, batches, avg_batch_size, latency_ms (p50/p95/p99)
+            ve kayıt defteri kullanılıyorsa models
+        """
+        values = sorted(self.latencies)
+        stats = {
+            'requests': self.requests,
+            'batches': self.batches,
+            'avg_batch_size': round(self.requests / self.batches, 3)
+            if self.batches else 0.0,
+            'latency_ms': {
+                'p50': round(1000 * profiling.percentile(values, 50), 3),
+                'p95': round(1000 * profiling.percentile(values, 95), 3),
+                'p99': round(1000 * profiling.percentile(values, 99), 3),
+            },
+        }
+        if isinstance(self.model, registry.ModelRegistry):
+            stats['models'] = self.model.stats()
+        return stats
+
+
+# ==================== HTTP ====================
+
+def extract_upload(headers, body):
+    """
+    İstek gövdesinden görüntü dosyasının baytlarını çıkarır.
+
+    Parametreler:
+        headers (dict): Küçük harfli başlıklar
+        body (bytes): İstek gövdesi
+
+    Dönüş:
+        bytes: Görüntü dosyasının içeriği
+
+    Hata:
+        HttpError: Gövde boşsa veya multipart içinde dosya yoksa
+    """
+    content_type = headers.get('content-type', '')
+
+    if content_type.startswith('multipart/form-data'):
+        message = BytesParser(policy=HTTP).parsebytes(
+            b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n'
+            + body
+        )
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == 'file':
+                body = part.get_payload(decode=True)
+                break
+        else:
+            raise HttpError(400, "multipart isteğinde 'file' alanı yok")
+
+    if not body:
+        raise HttpError(400, "İstek gövdesi boş")
+    return body
+
+
+async def read_request(reader):
+    """
+    Tek bir HTTP isteğini okur.
+
+    Dönüş:
+        tuple: (metot, yol, sorgu, başlıklar, gövde) veya bağlantı
+        kapandıysa None (sorgu: parametre adı → son değer)
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, _ = lines[0].split(' ', 2)
+    except ValueError:
+        raise HttpError(400, "Geçersiz istek satırı")
+
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "İstek gövdesi çok büyük")
+    body = await reader.readexactly(length) if length else b''
+
+    path, _, query = target.partition('?')
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    return method.upper(), path, params, headers, body
+
+
+def write_response(writer, status, payload, keep_alive):
+    """JSON yanıtı yazar."""
+    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode('latin-1') + data)
+
+
+class DetectionServer:
+    """Mikro-batch'leyici önünde çalışan asyncio HTTP sunucusu."""
+
+    def __init__(self, batcher, decode_workers=4):
+        self.batcher = batcher
+        self._decode_pool = ThreadPoolExecutor(
+            max_workers=decode_workers, thread_name_prefix='decode'
+        )
+
+    async def handle_detect(self, params, headers, body):
+        start = time.perf_counter()
+        data = extract_upload(headers, body)
+
+        # Model adı kuyruğa girmeden doğrulanır (bilinmeyen ad → 400)
+        model = params.get('model')
+        if model is not None:
+            if not isinstance(self.batcher.model, registry.ModelRegistry):
+                raise HttpError(400, "Bu sunucuda model seçimi yapılamaz")
+            try:
+                model = self.batcher.model.resolve(model)
+            except KeyError as e:
+                raise HttpError(400, e.args[0])
+
+        # Decode, load_image() ile aynı yolla (cv2.imdecode) havuzda yapılır
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(
+            self._decode_pool, detection.decode_image, data
+        )
+        if image is None:
+            raise HttpError(400, "Görüntü decode edilemedi")
+
+        dets, batch_size = await self.batcher.submit(image, model)
+
+        latency = time.perf_counter() - start
+        self.batcher.requests += 1
+        self.batcher.latencies.append(latency)
+
+        return {
+            'objects': dets.to_records(),
+            'count': len(dets),
+            'model': model or getattr(self.batcher.model, 'default', None),
+            'batch_size': batch_size,
+            'latency_ms': round(1000 * latency, 3),
+        }
+
+    async def dispatch(self, method, path, params, headers, body):
+        if path == '/detect':
+            if method != 'POST':
+                raise HttpError(405, "Yalnızca POST desteklenir")
+            return await self.handle_detect(params, headers, body)
+        if path == '/health':
+            return {'status': 'ok'}
+        if path == '/stats':
+            return self.batcher.stats()
+        raise HttpError(404, "Bulunamadı")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, params, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    payload = await self.dispatch(method, path, params,
+                                                  headers, body)
+                    write_response(writer, 200, payload, keep_alive)
+                except HttpError as e:
+                    keep_alive = False
+                    write_response(writer, e.status, {'error': str(e)}, False)
+                except Exception as e:
+                    keep_alive = False
+                    write_response(writer, 500, {'error': str(e)}, False)
+
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Sunucu çalışıyor: http://{host}:{port}", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+            self._decode_pool.shutdown(wait=False)
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="Mikro-batch'lemeli YOLO HTTP tespit servisi"
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="Dinlenecek adres")
+    parser.add_argument('--port', type=int, default=8000, help="Port")
+    parser.add_argument('--weights', default=detection.DEFAULT_WEIGHTS,
+                        help="Varsayılan model ağırlık dosyası")
+    parser.add_argument('--memory-budget', type=float,
+                        default=registry.DEFAULT_MEMORY_BUDGET / 2 ** 20,
+                        help="Yüklü modellerin toplam bellek bütçesi (MB)")
+    parser.add_argument('--backend', choices=('torch', 'onnx', 'openvino'),
+                        default='torch', help="Çıkarım arka ucu")
+    parser.add_argument('--conf', type=float, default=detection.DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--imgsz', type=int, default=None,
+                        help="Model giriş boyutu")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help="Bir model çağrısındaki en fazla istek")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Batch'in dolmasını bekleme süresi (ms)")
+    parser.add_argument('--decode-workers', type=int, default=4,
+                        help="Decode iş parçacığı sayısı")
+    args = parser.parse_args(argv)
+
+    # Diğer modeller ilk istendiklerinde yüklenir (?model=...)
+    models = registry.ModelRegistry(
+        int(args.memory_budget * 2 ** 20), default=args.weights,
+        backend=args.backend, imgsz=args.imgsz or detection.DEFAULT_IMGSZ
+    )
+    detection.warmup(models.get(), args.imgsz or detection.DEFAULT_IMGSZ)
+
+    batcher = MicroBatcher(models, args.conf, args.imgsz, args.max_batch,
+                           args.max_wait_ms)
+    server = DetectionServer(batcher, args.decode_workers)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
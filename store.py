@@ -0,0 +1,549 @@
+"""
+Tespit Deposu ve Hızlı Sorgulama
+
+Toplu bir işin tüm tespitleri sütun dizilerinde tutulur ve üç indeksle
+sorgulanır; sorgular tüm kayıtları taramaz:
+
+• Sınıf indeksi : sınıf → satır numaraları
+• Görüntü indeksi: görüntü → [başlangıç, bitiş) satır aralığı
+  (bir görüntünün satırları bitişiktir)
+• Izgara (grid) indeksi: Görüntü düzlemi cell_size × cell_size
+  hücrelere bölünür; her kutu kapladığı hücrelere eklenir. Çok büyük
+  kutular (MAX_BOX_CELLS'ten fazla hücre) ayrı bir listede tutulur.
+  Bir bölge sorgusu yalnızca bölgenin kapladığı hücrelerdeki adayları
+  kesin kontrolden geçirir.
+
+Sınıf başına sayı / en yüksek güven özeti (update_table() tablosu)
+her eklemede güncellenir; tüm depo için özet yeniden tarama yapmaz.
+
+Disk Biçimi:
+------------
+Bir dizin: her sütun ayrı bir .npy dosyası + meta.json (görüntü
+yolları, sınıf adları). load() sütunları bellek eşlemeli (mmap) açar;
+indeksler açılışta vektörel olarak yeniden kurulur. save() her dosyayı
+önce geçici adla yazıp yerine taşır; açılmış (eşlenmiş) bir depo aynı
+dizine güvenle yeniden kaydedilebilir.
+
+Kullanım:
+---------
+    db = store.DetectionStore()
+    db.add('a.jpg', dets)
+    rows = db.query(classes=['car'], min_conf=0.6, region=(0, 0, 500, 500))
+    best = db.top_k(10, rows=rows)
+    print(db.to_records(best))
+    db.save('tespit_deposu')
+
+    python store.py tespit_deposu --class car --min-conf 0.6 \\
+        --region 0 0 500 500 --top 10
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+import detection
+
+# ==================== SABİTLER ====================
+
+# Izgara hücresinin kenar uzunluğu (piksel)
+DEFAULT_CELL_SIZE = 128
+
+# Bundan fazla hücre kaplayan kutular ızgaraya eklenmez ('büyük' listesi)
+MAX_BOX_CELLS = 16
+
+# Bundan fazla hücre kaplayan sorgu bölgelerinde ızgara yerine tüm
+# satırlar vektörel olarak filtrelenir
+MAX_QUERY_CELLS = 4096
+
+# Hücre anahtarında y bileşeninin bit kaydırması
+_CELL_SHIFT = 32
+
+# Sütun dosyaları
+_COLUMNS = ('image_ids', 'boxes', 'confidences', 'class_ids')
+
+
+class DetectionStore:
+    """
+    Sınıf, görüntü ve ızgara indeksli tespit deposu.
+
+    Eklemeler bekleme listesine alınır; ilk sorguda sütunlara birleştirilir
+    ve yalnızca yeni satırlar indekslenir.
+    """
+
+    def __init__(self, names=None, cell_size=DEFAULT_CELL_SIZE):
+        """
+        Parametreler:
+            names (dict): Sınıf indeksi → sınıf adı
+            cell_size (int): Izgara hücresi boyutu (piksel)
+        """
+        self.names = dict(names or {})
+        self.cell_size = cell_size
+
+        self.images = []
+        self._image_index = {}
+        self._image_ranges = []
+
+        # Sütunlar
+        self.image_ids = np.zeros(0, dtype=np.int32)
+        self.boxes = np.zeros((0, 4), dtype=np.int32)
+        self.confidences = np.zeros(0, dtype=np.float32)
+        self.class_ids = np.zeros(0, dtype=np.int32)
+
+        # İndeksler
+        self._class_rows = {}
+        self._cells = {}
+        self._large = np.zeros(0, dtype=np.int64)
+
+        # Sınıf başına [sayı, en yüksek güven]
+        self._summary = {}
+
+        self._pending = []
+        self._pending_rows = 0
+
+    def __len__(self):
+        return len(self.confidences) + self._pending_rows
+
+    def __contains__(self, image):
+        return image in self._image_index
+
+    # ---------- Ekleme ----------
+
+    def add(self, image, dets):
+        """
+        Bir görüntünün tespitlerini ekler.
+
+        Parametreler:
+            image (str): Görüntü kimliği (dosya yolu)
+            dets (Detections): Tespitler
+
+        Hata:
+            ValueError: Görüntü zaten eklenmişse
+        """
+        if image in self._image_index:
+            raise ValueError(f"Görüntü zaten depoda: {image}")
+
+        image_id = len(self.images)
+        self.images.append(image)
+        self._image_index[image] = image_id
+
+        start = len(self)
+        self._image_ranges.append((start, start + len(dets)))
+        self.names.update(dets.names)
+
+        if len(dets):
+            self._pending.append((image_id, dets))
+            self._pending_rows += len(dets)
+
+            # Özet eklemede güncellenir (sorguda tarama gerekmez)
+            for class_id, count, max_conf in zip(*_group_max(
+                    dets.class_ids, dets.confidences)):
+                entry = self._summary.setdefault(class_id, [0, 0.0])
+                entry[0] += count
+                entry[1] = max(entry[1], max_conf)
+
+    def _compact(self):
+        """Bekleyen eklemeleri sütunlara birleştirir ve indeksler."""
+        if not self._pending:
+            return
+
+        start = len(self.confidences)
+        self.image_ids = np.concatenate([self.image_ids] + [
+            np.full(len(dets), image_id, np.int32)
+            for image_id, dets in self._pending
+        ])
+        self.boxes = np.concatenate(
+            [self.boxes] + [dets.boxes for _, dets in self._pending]
+        )
+        self.confidences = np.concatenate(
+            [self.confidences] + [dets.confidences for _, dets in self._pending]
+        )
+        self.class_ids = np.concatenate(
+            [self.class_ids] + [dets.class_ids for _, dets in self._pending]
+        )
+        self._pending = []
+        self._pending_rows = 0
+
+        self._index(start)
+
+    # ---------- İndeksleme ----------
+
+    def _index(self, start):
+        """start satırından itibaren sınıf ve ızgara indekslerini günceller."""
+        rows = np.arange(start, len(self.confidences), dtype=np.int64)
+        if not len(rows):
+            return
+
+        # Sınıf indeksi
+        class_ids = self.class_ids[start:]
+        order = np.argsort(class_ids, kind='stable')
+        classes, first = np.unique(class_ids[order], return_index=True)
+        for class_id, group in zip(classes.tolist(),
+                                   np.split(rows[order], first[1:])):
+            old = self._class_rows.get(class_id)
+            self._class_rows[class_id] = (
+                group if old is None else np.concatenate([old, group])
+            )
+
+        # Izgara indeksi
+        cells = self._cell_range(self.boxes[start:])
+        gx0, gy0, gx1, gy1 = cells
+        span_x = gx1 - gx0 + 1
+        span_y = gy1 - gy0 + 1
+
+        large = span_x * span_y > MAX_BOX_CELLS
+        if large.any():
+            self._large = np.concatenate([self._large, rows[large]])
+
+        keys, members = [], []
+        small = ~large
+        for dx in range(int(span_x[small].max(initial=0))):
+            for dy in range(int(span_y[small].max(initial=0))):
+                mask = small & (dx < span_x) & (dy < span_y)
+                if mask.any():
+                    keys.append(((gx0[mask] + dx) << _CELL_SHIFT)
+                                | (gy0[mask] + dy))
+                    members.append(rows[mask])
+        if not keys:
+            return
+
+        keys = np.concatenate(keys)
+        members = np.concatenate(members)
+        order = np.argsort(keys, kind='stable')
+        unique_keys, first = np.unique(keys[order], return_index=True)
+        for key, group in zip(unique_keys.tolist(),
+                              np.split(members[order], first[1:])):
+            old = self._cells.get(key)
+            self._cells[key] = (
+                group if old is None else np.concatenate([old, group])
+            )
+
+    def _cell_range(self, boxes):
+        """Kutuların kapladığı hücre aralığı: (gx0, gy0, gx1, gy1)."""
+        boxes = np.maximum(np.asarray(boxes, dtype=np.int64), 0)
+        x1, y1, x2, y2 = boxes.T
+        return (x1 // self.cell_size, y1 // self.cell_size,
+                np.maximum(x2 - 1, x1) // self.cell_size,
+                np.maximum(y2 - 1, y1) // self.cell_size)
+
+    def _region_candidates(self, region):
+        """Bölgeyle kesişebilecek satırlar (ızgara + büyük kutular)."""
+        cells = self._cell_range(np.array([region]))
+        gx0, gy0, gx1, gy1 = (int(c[0]) for c in cells)
+        if (gx1 - gx0 + 1) * (gy1 - gy0 + 1) > MAX_QUERY_CELLS:
+            return None
+
+        parts = [self._large]
+        for gx in range(gx0, gx1 + 1):
+            for gy in range(gy0, gy1 + 1):
+                group = self._cells.get((gx << _CELL_SHIFT) | gy)
+                if group is not None:
+                    parts.append(group)
+        # Birden fazla hücredeki kutular bir kez sayılır
+        return np.unique(np.concatenate(parts))
+
+    # ---------- Sorgular ----------
+
+    def _class_id(self, cls):
+        if isinstance(cls, str):
+            for class_id, name in self.names.items():
+                if name == cls:
+                    return class_id
+            return None
+        return int(cls)
+
+    def query(self, classes=None, min_conf=None, max_conf=None, region=None,
+              within=False, images=None, min_area=None, max_area=None):
+        """
+        Koşullara uyan satırları döndürür.
+
+        Aday kümesi en seçici indeksten alınır (bölge → ızgara,
+        sınıf → sınıf indeksi, görüntü → satır aralıkları); diğer
+        koşullar yalnızca adaylar üzerinde vektörel olarak uygulanır.
+
+        Parametreler:
+            classes (list): Sınıf adları veya indeksleri
+            min_conf, max_conf (float): Güven aralığı
+            region (tuple): (x1, y1, x2, y2) bölgesi
+            within (bool): True ise kutu bölgenin tamamen içinde olmalı,
+                False ise bölgeyle kesişmesi yeterli
+            images (list): Görüntü kimlikleri
+            min_area, max_area (int): Alan aralığı (piksel²)
+
+        Dönüş:
+            numpy.ndarray: Sıralı satır numaraları
+        """
+        self._compact()
+
+        candidates = None
+        if region is not None:
+            candidates = self._region_candidates(region)
+        if candidates is None and classes is not None:
+            ids = map(self._class_id, classes)
+            candidates = np.sort(np.concatenate(
+                [np.zeros(0, np.int64)]
+                + [self._class_rows[i] for i in ids if i in self._class_rows]
+            ))
+            classes = None
+        if candidates is None and images is not None:
+            candidates = np.concatenate([np.zeros(0, np.int64)] + [
+                np.arange(*self._image_ranges[self._image_index[image]])
+                for image in images if image in self._image_index
+            ])
+            images = None
+        if candidates is None:
+            candidates = np.arange(len(self.confidences), dtype=np.int64)
+
+        mask = np.ones(len(candidates), dtype=bool)
+        if classes is not None:
+            ids = [i for i in map(self._class_id, classes) if i is not None]
+            mask &= np.isin(self.class_ids[candidates], ids)
+        if images is not None:
+            ids = [self._image_index[i] for i in images if i in self._image_index]
+            mask &= np.isin(self.image_ids[candidates], ids)
+
+        confidences = self.confidences[candidates]
+        if min_conf is not None:
+            mask &= confidences >= min_conf
+        if max_conf is not None:
+            mask &= confidences <= max_conf
+
+        boxes = self.boxes[candidates]
+        if min_area is not None or max_area is not None:
+            areas = ((boxes[:, 2] - boxes[:, 0]).astype(np.int64)
+                     * (boxes[:, 3] - boxes[:, 1]))
+            if min_area is not None:
+                mask &= areas >= min_area
+            if max_area is not None:
+                mask &= areas <= max_area
+
+        if region is not None:
+            rx1, ry1, rx2, ry2 = region
+            if within:
+                mask &= ((boxes[:, 0] >= rx1) & (boxes[:, 1] >= ry1)
+                         & (boxes[:, 2] <= rx2) & (boxes[:, 3] <= ry2))
+            else:
+                mask &= ((boxes[:, 0] < rx2) & (boxes[:, 2] > rx1)
+                         & (boxes[:, 1] < ry2) & (boxes[:, 3] > ry1))
+
+        return candidates[mask]
+
+    def top_k(self, k, rows=None, **filters):
+        """
+        Güveni en yüksek k satırı döndürür.
+
+        Parametreler:
+            k (int): Satır sayısı
+            rows (numpy.ndarray): Aday satırlar (None ise query(**filters))
+
+        Dönüş:
+            numpy.ndarray: Güvene göre azalan sırada satır numaraları
+        """
+        if rows is None:
+            rows = self.query(**filters)
+        if len(rows) > k:
+            # Tam sıralama yerine kısmi seçim: O(n)
+            part = np.argpartition(-self.confidences[rows], k - 1)[:k]
+            rows = rows[part]
+        order = np.argsort(-self.confidences[rows], kind='stable')
+        return rows[order]
+
+    def class_summary(self, rows=None):
+        """
+        Sınıf başına tespit sayısı ve en yüksek güven.
+
+        Detections.class_summary ile aynı biçimdedir. rows verilmezse
+        eklemede tutulan özet kullanılır (tarama yapılmaz).
+
+        Parametreler:
+            rows (numpy.ndarray): Özetlenecek satırlar (None ise tümü)
+
+        Dönüş:
+            list: (sınıf adı, sayı, en yüksek güven) — sayıya göre azalan
+        """
+        if rows is None:
+            groups = [(class_id, count, max_conf)
+                      for class_id, (count, max_conf) in self._summary.items()]
+        else:
+            self._compact()
+            groups = zip(*_group_max(self.class_ids[rows],
+                                     self.confidences[rows]))
+        summary = [(self.names.get(class_id, str(class_id)), count, max_conf)
+                   for class_id, count, max_conf in groups]
+        return sorted(summary, key=lambda item: (-item[1], item[0]))
+
+    def detections(self, image):
+        """
+        Bir görüntünün tespitlerini döndürür.
+
+        Dönüş:
+            Detections (görüntü depoda yoksa boş)
+        """
+        self._compact()
+        image_id = self._image_index.get(image)
+        if image_id is None:
+            return detection.Detections(names=self.names)
+        start, end = self._image_ranges[image_id]
+        return detection.Detections(
+            self.boxes[start:end], self.confidences[start:end],
+            self.class_ids[start:end], self.names
+        )
+
+    def to_records(self, rows):
+        """
+        Satırları kayıt (dict) listesine çevirir.
+
+        Her kayıt: image, class, class_id, confidence, bbox, area.
+        """
+        self._compact()
+        rows = np.asarray(rows, dtype=np.int64)
+        dets = detection.Detections(
+            self.boxes[rows], self.confidences[rows], self.class_ids[rows],
+            self.names
+        )
+        return [
+            dict(image=self.images[image_id], **record)
+            for image_id, record in zip(self.image_ids[rows].tolist(),
+                                        dets.to_records())
+        ]
+
+    # ---------- Disk ----------
+
+    def save(self, path):
+        """
+        Depoyu bir dizine yazar (sütun başına bir .npy + meta.json).
+
+        Parametreler:
+            path (str): Hedef dizin
+        """
+        self._compact()
+        os.makedirs(path, exist_ok=True)
+        # Eşlenmiş sütunların dosyaları yerinde kesilmez (SIGBUS olur);
+        # yeni dosya yazılıp eskisinin yerine taşınır
+        for name in _COLUMNS:
+            target = os.path.join(path, name + '.npy')
+            with open(target + '.tmp', 'wb') as f:
+                np.save(f, getattr(self, name))
+            os.replace(target + '.tmp', target)
+
+        meta = {
+            'images': self.images,
+            'ranges': self._image_ranges,
+            'names': {str(k): v for k, v in self.names.items()},
+            'cell_size': self.cell_size,
+        }
+        target = os.path.join(path, 'meta.json')
+        with open(target + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(target + '.tmp', target)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Diske yazılmış depoyu açar.
+
+        Parametreler:
+            path (str): Depo dizini
+            mmap (bool): Sütunları belleğe kopyalamadan eşle
+
+        Dönüş:
+            DetectionStore
+        """
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        db = cls({int(k): v for k, v in meta['names'].items()},
+                 meta['cell_size'])
+        db.images = meta['images']
+        db._image_index = {image: i for i, image in enumerate(db.images)}
+        db._image_ranges = [tuple(r) for r in meta['ranges']]
+        for name in _COLUMNS:
+            setattr(db, name, np.load(os.path.join(path, name + '.npy'),
+                                      mmap_mode='r' if mmap else None))
+
+        db._index(0)
+        for class_id, count, max_conf in zip(*_group_max(db.class_ids,
+                                                         db.confidences)):
+            db._summary[class_id] = [count, max_conf]
+        return db
+
+
+# ==================== YARDIMCI FONKSİYONLAR ====================
+
+def _group_max(class_ids, confidences):
+    """
+    Sınıf başına sayı ve en yüksek güven (vektörel).
+
+    Dönüş:
+        tuple: (sınıflar, sayılar, en yüksek güvenler) listeleri
+    """
+    if not len(class_ids):
+        return [], [], []
+    classes, inverse, counts = np.unique(class_ids, return_inverse=True,
+                                         return_counts=True)
+    max_conf = np.zeros(len(classes), dtype=np.float32)
+    np.maximum.at(max_conf, inverse, confidences)
+    return classes.tolist(), counts.tolist(), max_conf.tolist()
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="Tespit deposunda sorgu ve özet"
+    )
+    parser.add_argument('path', help="Depo dizini (detection.py --store)")
+    parser.add_argument('--class', dest='classes', action='append',
+                        help="Sınıf adı (birden fazla verilebilir)")
+    parser.add_argument('--image', dest='images', action='append',
+                        help="Görüntü yolu (birden fazla verilebilir)")
+    parser.add_argument('--min-conf', type=float, default=None)
+    parser.add_argument('--max-conf', type=float, default=None)
+    parser.add_argument('--min-area', type=int, default=None)
+    parser.add_argument('--max-area', type=int, default=None)
+    parser.add_argument('--region', type=int, nargs=4,
+                        metavar=('X1', 'Y1', 'X2', 'Y2'),
+                        help="Kutuların kesişmesi gereken bölge")
+    parser.add_argument('--within', action='store_true',
+                        help="Kutular bölgenin tamamen içinde olmalı")
+    parser.add_argument('--top', type=int, default=None,
+                        help="Yalnızca güveni en yüksek N sonucu yaz")
+    parser.add_argument('--summary', action='store_true',
+                        help="Satırlar yerine sınıf özetini yaz")
+    args = parser.parse_args(argv)
+
+    db = DetectionStore.load(args.path)
+    rows = db.query(args.classes, args.min_conf, args.max_conf, args.region,
+                    args.within, args.images, args.min_area, args.max_area)
+    if args.top is not None:
+        rows = db.top_k(args.top, rows=rows)
+
+    if args.summary:
+        for name, count, max_conf in db.class_summary(rows):
+            print(json.dumps({'class': name, 'count': count,
+                              'max_confidence': round(max_conf, 4)},
+                             ensure_ascii=False))
+    else:
+        for record in db.to_records(rows):
+            print(json.dumps(record, ensure_ascii=False))
+
+    print(f"{len(rows)} sonuç ({len(db)} tespit, {len(db.images)} görüntü)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
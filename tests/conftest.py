@@ -0,0 +1,9 @@
+"""
+Test ortamı: Modüller depo kökünde düz (paketsiz) durduğu için kök dizin
+içe aktarma yoluna eklenir.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+"""cache.py: Bellek ve disk katmanlarında kayıt çıkarma (eviction)."""
+
+import numpy as np
+
+import cache
+import detection
+
+
+def dets(n=1):
+    return detection.Detections([[0, 0, 10, 10]] * n, [0.5] * n, [0] * n,
+                                {0: 'person'})
+
+
+def test_lru_eviction_by_count():
+    c = cache.DetectionCache(max_entries=2)
+    c.put('a', dets())
+    c.put('b', dets())
+    # 'a' kullanıldı: en eski kayıt artık 'b'
+    assert c.get('a') is not None
+    c.put('c', dets())
+
+    assert c.get('b') is None
+    assert c.get('a') is not None
+    assert c.get('c') is not None
+    assert c.stats()['evictions'] == 1
+    assert c.stats()['entries'] == 2
+
+
+def test_eviction_by_bytes():
+    one = cache._entry_size(dets(10))
+    c = cache.DetectionCache(max_bytes=2 * one)
+    for key in 'abc':
+        c.put(key, dets(10))
+
+    stats = c.stats()
+    assert stats['entries'] == 2
+    assert stats['bytes'] == 2 * one
+    assert c.get('a') is None
+
+
+def test_replacing_key_does_not_leak_bytes():
+    c = cache.DetectionCache()
+    c.put('a', dets(100))
+    c.put('a', dets(1))
+    assert c.stats()['bytes'] == cache._entry_size(dets(1))
+
+
+def test_disk_layer_survives_memory_eviction(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    c = cache.DetectionCache(max_entries=1, path=path)
+    c.put('a', dets(2))
+    c.put('b', dets(1))
+    c.flush()
+
+    restored = c.get('a')
+    assert restored is not None
+    assert np.array_equal(restored.boxes, dets(2).boxes)
+    assert restored.names == {0: 'person'}
+    assert c.stats()['disk_hits'] == 1
+    c.close()
+
+
+def test_disk_eviction_keeps_recent(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    c = cache.DetectionCache(max_entries=1, path=path, max_disk_entries=2)
+    for key in 'abc':
+        c.put(key, dets())
+    c.close()
+
+    reopened = cache.DetectionCache(path=path)
+    assert reopened.get('a') is None
+    assert reopened.get('b') is not None
+    assert reopened.get('c') is not None
+    reopened.close()
+
+
+def test_make_key_depends_on_image_and_settings():
+    img = np.zeros((4, 4, 3), np.uint8)
+    other = img.copy()
+    other[0, 0, 0] = 1
+
+    key = cache.make_key(img, 'm', 0.25, 640)
+    assert key == cache.make_key(img.copy(), 'm', 0.25, 640)
+    assert key != cache.make_key(other, 'm', 0.25, 640)
+    assert key != cache.make_key(img, 'm', 0.5, 640)
+    assert key != cache.make_key(img, 'm2', 0.25, 640)
@@ -0,0 +1,117 @@
+"""detection.py: JPEG başlığı okuma ve Detections sütun işlemleri."""
+
+import cv2
+import numpy as np
+import pytest
+
+import detection
+
+
+NAMES = {0: 'person', 1: 'car', 2: 'dog'}
+
+
+def make_dets():
+    return detection.Detections(
+        boxes=[[0, 0, 10, 10], [5, 5, 25, 15], [100, 100, 110, 140]],
+        confidences=[0.9, 0.4, 0.6],
+        class_ids=[0, 1, 2],
+        names=NAMES,
+    )
+
+
+# ==================== JPEG BAŞLIĞI ====================
+
+def encode_jpeg(width, height):
+    ok, data = cv2.imencode('.jpg', np.zeros((height, width, 3), np.uint8))
+    assert ok
+    return data.tobytes()
+
+
+def test_jpeg_size_reads_header():
+    assert detection.jpeg_size(encode_jpeg(320, 200)) == (320, 200)
+
+
+def test_jpeg_size_rejects_non_jpeg():
+    ok, data = cv2.imencode('.png', np.zeros((8, 8, 3), np.uint8))
+    assert detection.jpeg_size(data.tobytes()) is None
+    assert detection.jpeg_size(b'') is None
+
+
+def test_jpeg_size_truncated_header():
+    data = encode_jpeg(320, 200)
+    # SOF işaretçisine ulaşmadan kesilmiş dosya
+    sof = data.index(b'\xff\xc0')
+    assert detection.jpeg_size(data[:sof + 4]) is None
+
+
+@pytest.mark.parametrize('size, target, factor', [
+    ((4000, 3000), 640, 4),
+    ((6000, 1000), 640, 8),
+    ((1280, 720), 640, 2),
+    ((1279, 720), 640, 1),
+    ((300, 300), 640, 1),
+])
+def test_reduction_factor(size, target, factor):
+    assert detection.reduction_factor(size, target) == factor
+
+
+# ==================== DETECTIONS ====================
+
+def test_empty_detections_shapes():
+    dets = detection.Detections()
+    assert len(dets) == 0
+    assert dets.boxes.shape == (0, 4)
+    assert dets.boxes.dtype == np.int32
+    assert dets.class_names.size == 0
+
+
+def test_select_mask_and_index():
+    dets = make_dets()
+    picked = dets.select(np.array([True, False, True]))
+    assert picked.class_ids.tolist() == [0, 2]
+    assert picked.names is NAMES
+
+    reordered = dets.select(np.array([2, 0]))
+    assert reordered.boxes.tolist() == [[100, 100, 110, 140], [0, 0, 10, 10]]
+    assert reordered.confidences.tolist() == pytest.approx([0.6, 0.9])
+
+
+def test_filter_combines_conditions():
+    dets = make_dets()
+    assert dets.filter(min_conf=0.5).class_ids.tolist() == [0, 2]
+    assert dets.filter(classes=[1, 2]).class_ids.tolist() == [1, 2]
+    # Alanlar: 100, 200, 400
+    assert dets.filter(min_area=200).class_ids.tolist() == [1, 2]
+    assert dets.filter(min_conf=0.5, min_area=200).class_ids.tolist() == [2]
+    assert len(dets.filter()) == 3
+
+
+def test_scaled_rounds_to_int():
+    scaled = make_dets().scaled(0.5, 2.0)
+    assert scaled.boxes.dtype == np.int32
+    assert scaled.boxes[1].tolist() == [2, 10, 12, 30]
+    assert scaled.confidences.tolist() == pytest.approx([0.9, 0.4, 0.6])
+
+
+def test_offset():
+    moved = make_dets().offset(10, -5)
+    assert moved.boxes[0].tolist() == [10, -5, 20, 5]
+
+
+def test_concatenate():
+    dets = make_dets()
+    merged = detection.Detections.concatenate([dets.select([0]), dets.select([1, 2])])
+    assert len(merged) == 3
+    assert np.array_equal(merged.boxes, dets.boxes)
+    assert merged.names == NAMES
+
+
+def test_concatenate_empty_keeps_names():
+    merged = detection.Detections.concatenate([], names=NAMES)
+    assert len(merged) == 0
+    assert merged.names == NAMES
+
+
+def test_class_names_falls_back_to_index():
+    dets = detection.Detections([[0, 0, 1, 1]] * 2, [0.5, 0.5], [0, 5], NAMES)
+    assert dets.class_names.tolist() == ['person', '5']
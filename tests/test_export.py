@@ -0,0 +1,111 @@
+"""export.py: Yarıda kalmış metin çıktısının devam ederken kurtarılması."""
+
+import json
+
+import pytest
+
+import detection
+import export
+
+
+def dets(n):
+    return detection.Detections([[0, 0, 10, 10]] * n, [0.5] * n, [0] * n,
+                                {0: 'person'})
+
+
+def write_images(exporter_cls, path, counts):
+    with exporter_cls(str(path)) as exporter:
+        for image, n in counts:
+            exporter.write(image, dets(n))
+
+
+def read_images(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['image'] for line in f]
+
+
+def test_recover_keeps_completed_images(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    write_images(export.JsonlExporter, path, [('a', 2), ('b', 0), ('c', 3)])
+
+    exporter = export.JsonlExporter(str(path), resume=True)
+    exporter.close()
+
+    # Son görüntünün tüm satırlarının yazıldığı bilinemez: kesilir
+    assert exporter.completed == {'a', 'b'}
+    assert exporter.truncated == {'c'}
+    assert exporter.rows == 3
+    assert read_images(path) == ['a', 'a', 'b']
+
+
+def test_recover_truncated_line(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    write_images(export.JsonlExporter, path, [('a', 1), ('b', 2)])
+    with open(path, 'ab') as f:
+        f.write(b'{"image": "c", "class_id": 0, "conf')
+
+    with export.JsonlExporter(str(path), resume=True) as exporter:
+        assert exporter.completed == {'a'}
+        assert exporter.truncated == {'b'}
+        exporter.write('b', dets(2))
+        exporter.write('c', dets(1))
+
+    assert read_images(path) == ['a', 'b', 'b', 'c']
+
+
+def test_recover_stops_at_corrupt_line(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    write_images(export.JsonlExporter, path, [('a', 1), ('b', 1)])
+    with open(path, 'ab') as f:
+        f.write(b'not json\n{"image": "c"}\n')
+
+    with export.JsonlExporter(str(path), resume=True) as exporter:
+        assert exporter.completed == {'a'}
+    assert read_images(path) == ['a']
+
+
+def test_recover_csv_keeps_header(tmp_path):
+    path = tmp_path / 'out.csv'
+    write_images(export.CsvExporter, path, [('a', 1), ('b', 1)])
+
+    with export.CsvExporter(str(path), resume=True) as exporter:
+        assert exporter.completed == {'a'}
+        exporter.write('b', dets(1))
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[0].split(',') == list(export.COLUMNS)
+    assert [line.split(',')[0] for line in lines[1:]] == ['a', 'b']
+
+
+def test_recover_csv_rewrites_partial_header(tmp_path):
+    path = tmp_path / 'out.csv'
+    path.write_bytes(b'image,class_id')
+
+    with export.CsvExporter(str(path), resume=True) as exporter:
+        assert exporter.completed == set()
+        exporter.write('a', dets(1))
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[0].split(',') == list(export.COLUMNS)
+    assert len(lines) == 2
+
+
+def test_resume_missing_file_starts_fresh(tmp_path):
+    path = tmp_path / 'yeni.jsonl'
+    with export.JsonlExporter(str(path), resume=True) as exporter:
+        assert exporter.completed == set()
+        exporter.write('a', dets(1))
+    assert read_images(path) == ['a']
+
+
+@pytest.mark.parametrize('name, fmt', [
+    ('x.jsonl', 'jsonl'), ('x.ndjson', 'jsonl'), ('x.CSV', 'csv'),
+    ('x.parquet', 'parquet'),
+])
+def test_detect_format(name, fmt):
+    assert export.detect_format(name) == fmt
+
+
+def test_detect_format_unknown():
+    with pytest.raises(ValueError):
+        export.detect_format('x.txt')
@@ -0,0 +1,33 @@
+"""motion.py: Hareket bölgeleriyle örtüşen tespitlerin ayıklanması."""
+
+import detection
+import motion
+
+
+def make_dets(boxes):
+    return detection.Detections(boxes, [0.5] * len(boxes), [0] * len(boxes))
+
+
+def test_outside_regions_drops_overlapping_boxes():
+    dets = make_dets([
+        [0, 0, 10, 10],        # tamamen dışarıda
+        [95, 95, 120, 120],    # bölgeye kısmen giriyor
+        [110, 110, 150, 150],  # tamamen içeride
+        [300, 0, 320, 20],     # ikinci bölgede
+    ])
+    kept = motion.outside_regions(dets, [[100, 100, 200, 200], [290, 0, 400, 50]])
+    assert kept.boxes.tolist() == [[0, 0, 10, 10]]
+
+
+def test_outside_regions_touching_edge_is_kept():
+    # Kenarı paylaşan kutu bölgeyle örtüşmez
+    dets = make_dets([[0, 0, 100, 100]])
+    assert len(motion.outside_regions(dets, [[100, 0, 200, 100]])) == 1
+
+
+def test_outside_regions_no_regions_or_detections():
+    dets = make_dets([[0, 0, 10, 10]])
+    assert motion.outside_regions(dets, []) is dets
+
+    empty = detection.Detections()
+    assert motion.outside_regions(empty, [[0, 0, 5, 5]]) is empty
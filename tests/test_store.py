@@ -0,0 +1,77 @@
+"""store.py: Bölge sorguları ve diske yazılıp yeniden açılan depo."""
+
+import numpy as np
+import pytest
+
+import detection
+import store
+
+
+NAMES = {0: 'person', 2: 'car'}
+
+
+@pytest.fixture
+def detection_store():
+    ds = store.DetectionStore(cell_size=64)
+    ds.add('a.jpg', detection.Detections(
+        [[10, 10, 50, 50], [300, 300, 400, 380], [0, 0, 1000, 1000]],
+        [0.9, 0.5, 0.7], [0, 2, 2], NAMES
+    ))
+    ds.add('b.jpg', detection.Detections(
+        [[20, 20, 60, 60], [500, 10, 520, 30]], [0.3, 0.8], [0, 0], NAMES
+    ))
+    ds.add('bos.jpg', detection.Detections(names=NAMES))
+    return ds
+
+
+def brute_force(ds, region, within):
+    rx1, ry1, rx2, ry2 = region
+    b = ds.boxes
+    if within:
+        mask = (b[:, 0] >= rx1) & (b[:, 1] >= ry1) & (b[:, 2] <= rx2) & (b[:, 3] <= ry2)
+    else:
+        mask = (b[:, 0] < rx2) & (b[:, 2] > rx1) & (b[:, 1] < ry2) & (b[:, 3] > ry1)
+    return np.flatnonzero(mask).tolist()
+
+
+def test_region_intersects(detection_store):
+    rows = detection_store.query(region=(0, 0, 100, 100))
+    # İki küçük kutu ve tüm görüntüyü kaplayan büyük kutu
+    assert rows.tolist() == [0, 2, 3]
+
+
+def test_region_within(detection_store):
+    rows = detection_store.query(region=(0, 0, 100, 100), within=True)
+    assert rows.tolist() == [0, 3]
+
+
+@pytest.mark.parametrize('region', [
+    (0, 0, 64, 64), (250, 250, 450, 450), (490, 0, 530, 40),
+    (900, 900, 2000, 2000), (5000, 5000, 6000, 6000),
+])
+@pytest.mark.parametrize('within', [False, True])
+def test_region_matches_brute_force(detection_store, region, within):
+    rows = detection_store.query(region=region, within=within)
+    assert rows.tolist() == brute_force(detection_store, region, within)
+
+
+def test_region_combined_with_other_filters(detection_store):
+    rows = detection_store.query(region=(0, 0, 100, 100), classes=['person'],
+                                 min_conf=0.5)
+    assert rows.tolist() == [0]
+    rows = detection_store.query(region=(0, 0, 100, 100), images=['b.jpg'])
+    assert rows.tolist() == [3]
+
+
+def test_save_and_load_roundtrip(detection_store, tmp_path):
+    detection_store.save(str(tmp_path))
+    loaded = store.DetectionStore.load(str(tmp_path))
+
+    assert 'bos.jpg' in loaded
+    assert loaded.query(region=(0, 0, 100, 100)).tolist() == [0, 2, 3]
+    assert np.array_equal(loaded.boxes, detection_store.boxes)
+
+
+def test_duplicate_image_rejected(detection_store):
+    with pytest.raises(ValueError):
+        detection_store.add('a.jpg', detection.Detections())
@@ -0,0 +1,81 @@
+"""tiling.py: Döşeme ızgarası ve döşeme sınırındaki kutuların birleştirilmesi."""
+
+import numpy as np
+import pytest
+
+import detection
+import tiling
+
+
+# ==================== IZGARA ====================
+
+def test_tile_grid_small_image_is_single_tile():
+    assert tiling.tile_grid(300, 200, tile_size=640) == [(0, 0, 300, 200)]
+
+
+def test_tile_grid_covers_image_with_full_tiles():
+    tiles = tiling.tile_grid(1500, 700, tile_size=640, overlap=0.2)
+
+    # Adım 512: x = 0, 512 ve kenara hizalı 860; y = 0 ve 60
+    assert sorted({t[0] for t in tiles}) == [0, 512, 860]
+    assert sorted({t[1] for t in tiles}) == [0, 60]
+    assert all(w == 640 and h == 640 for _, _, w, h in tiles)
+
+    covered = np.zeros((700, 1500), dtype=bool)
+    for x, y, w, h in tiles:
+        covered[y:y + h, x:x + w] = True
+    assert covered.all()
+
+
+# ==================== BİRLEŞTİRME ====================
+
+def make_dets(boxes, confidences, class_ids):
+    return detection.Detections(boxes, confidences, class_ids, {0: 'a', 1: 'b'})
+
+
+def test_merge_nms_keeps_most_confident_duplicate():
+    dets = make_dets(
+        [[0, 0, 100, 100], [2, 2, 98, 100], [300, 300, 350, 350]],
+        [0.6, 0.9, 0.5], [0, 0, 0],
+    )
+    merged = tiling.merge_detections(dets, 0.5, 'nms', 'iou')
+    assert merged.confidences.tolist() == pytest.approx([0.9, 0.5])
+    assert merged.boxes[0].tolist() == [2, 2, 98, 100]
+
+
+def test_merge_ignores_other_classes():
+    dets = make_dets([[0, 0, 100, 100]] * 2, [0.9, 0.8], [0, 1])
+    assert len(tiling.merge_detections(dets, 0.5, 'nms', 'iou')) == 2
+
+
+def test_merge_ios_matches_box_cut_at_tile_edge():
+    # Döşeme sınırında kesilmiş kutu tam kutunun içindedir:
+    # IoU düşük (0.4) ama IoS 1.0
+    dets = make_dets([[0, 0, 100, 100], [0, 0, 40, 100]], [0.9, 0.8], [0, 0])
+    assert len(tiling.merge_detections(dets, 0.5, 'nms', 'iou')) == 2
+    assert len(tiling.merge_detections(dets, 0.5, 'nms', 'ios')) == 1
+
+
+def test_merge_is_greedy():
+    # B, A tarafından bastırılır; C yalnızca B ile örtüştüğü için kalır
+    dets = make_dets(
+        [[0, 0, 100, 100], [40, 0, 140, 100], [80, 0, 180, 100]],
+        [0.9, 0.8, 0.7], [0, 0, 0],
+    )
+    merged = tiling.merge_detections(dets, 0.3, 'nms', 'iou')
+    assert merged.confidences.tolist() == pytest.approx([0.9, 0.7])
+
+
+def test_merge_wbf_weights_boxes_by_confidence():
+    dets = make_dets([[0, 0, 100, 100], [10, 10, 110, 110]], [0.75, 0.25], [0, 0])
+    merged = tiling.merge_detections(dets, 0.5, 'wbf', 'iou')
+    assert len(merged) == 1
+    assert merged.boxes[0].tolist() == [2, 2, 102, 102]
+    assert merged.confidences[0] == pytest.approx(0.75)
+
+
+def test_merge_small_inputs_unchanged():
+    empty = detection.Detections()
+    assert tiling.merge_detections(empty) is empty
+    single = make_dets([[0, 0, 5, 5]], [0.5], [0])
+    assert tiling.merge_detections(single) is single
@@ -0,0 +1,81 @@
+"""tracker.py: İz kimliklerinin kareler boyunca korunması."""
+
+import numpy as np
+
+import detection
+import tracker
+
+
+def frame_dets(boxes, class_ids=None):
+    boxes = np.asarray(boxes)
+    if class_ids is None:
+        class_ids = [0] * len(boxes)
+    return detection.Detections(boxes, [0.9] * len(boxes), class_ids,
+                                {0: 'person', 1: 'car'})
+
+
+def moving_boxes(frame):
+    # İki nesne zıt yönlerde sabit hızla ilerler
+    return [[10 + 5 * frame, 10, 50 + 5 * frame, 90],
+            [400 - 5 * frame, 200, 440 - 5 * frame, 280]]
+
+
+def test_ids_confirmed_after_min_hits():
+    trk = tracker.Tracker(min_hits=3)
+    for frame in range(2):
+        tracked, ids = trk.step(frame_dets(moving_boxes(frame)), frame)
+        assert len(ids) == 0
+
+    tracked, ids = trk.step(frame_dets(moving_boxes(2)), 2)
+    assert sorted(ids.tolist()) == [1, 2]
+    assert len(tracked) == 2
+
+
+def test_ids_persist_across_frames():
+    trk = tracker.Tracker(min_hits=1)
+    _, first = trk.step(frame_dets(moving_boxes(0)), 0)
+
+    for frame in range(1, 20):
+        tracked, ids = trk.step(frame_dets(moving_boxes(frame)), frame)
+        assert ids.tolist() == first.tolist()
+        # Kutular tespitlere yakın kalır
+        assert np.abs(tracked.boxes - np.asarray(moving_boxes(frame))).max() <= 2
+
+
+def test_ids_survive_frames_without_detection():
+    trk = tracker.Tracker(min_hits=1)
+    for frame in range(5):
+        _, ids = trk.step(frame_dets(moving_boxes(frame)), frame)
+
+    # Tespit yapılmayan kareler: kutular tahminden gelir, ID'ler korunur
+    for frame in range(5, 8):
+        tracked, predicted_ids = trk.step(None, frame)
+        assert predicted_ids.tolist() == ids.tolist()
+
+    _, resumed = trk.step(frame_dets(moving_boxes(8)), 8)
+    assert resumed.tolist() == ids.tolist()
+
+
+def test_new_object_gets_new_id():
+    trk = tracker.Tracker(min_hits=1)
+    _, ids = trk.step(frame_dets(moving_boxes(0)), 0)
+
+    boxes = moving_boxes(1) + [[700, 700, 740, 760]]
+    _, ids = trk.step(frame_dets(boxes), 1)
+    assert sorted(ids.tolist()) == [1, 2, 3]
+
+
+def test_class_aware_matching():
+    trk = tracker.Tracker(min_hits=1)
+    _, first = trk.step(frame_dets([[10, 10, 50, 90]], [0]), 0)
+    # Aynı yerde farklı sınıf: eski iz eşleşmez, yeni ID açılır
+    _, second = trk.step(frame_dets([[10, 10, 50, 90]], [1]), 1)
+    assert second.tolist() != first.tolist()
+
+
+def test_lost_tracks_are_dropped():
+    trk = tracker.Tracker(min_hits=1, max_age=2)
+    trk.step(frame_dets(moving_boxes(0)), 0)
+    for frame in range(1, 5):
+        trk.step(frame_dets(np.zeros((0, 4))), frame)
+    assert len(trk) == 0
@@ -0,0 +1,473 @@
+"""
+Döşemeli (Tiled) Tespit - Çok Büyük Görüntüler İçin
+
+On binlerce piksel genişliğindeki (drone, uydu) görüntüler tek bir model
+çağrısına verildiğinde ya bellek yetmez ya da model görüntüyü 640 piksele
+küçülttüğü için küçük nesnelerin tamamı kaybolur. Bu modül görüntüyü
+örtüşen döşemelere (tile) böler ve döşemeleri batch'ler halinde modele verir:
+
+    1. Görüntü tile_size × tile_size boyutlu, örtüşen döşemelere bölünür
+    2. Döşemeler kaynaktan tembel (lazy) okunur; bellekte aynı anda
+       yalnızca bir batch'lik döşeme bulunur
+    3. Her döşemedeki kutular tam görüntü koordinatlarına taşınır
+    4. Döşeme sınırlarında iki kez bulunan nesneler NMS veya
+       ağırlıklı kutu birleştirme (WBF) ile tekilleştirilir
+
+Bellek eşlemeli (memory-mapped) kaynaklar:
+------------------------------------------
+• .npy dosyaları np.load(mmap_mode='r') ile açılır (BGR sırasında olmalıdır)
+• Sıkıştırılmamış TIFF dosyaları, tifffile kuruluysa bellek eşlemeli açılır
+• Diğer formatlar tam olarak decode edilir (OpenCV sınırları geçerlidir)
+
+Toplu tespit hattında TiledModel sarmalayıcısı kullanılır
+(detection.py --tile).
+
+Komut Satırı Kullanımı:
+-----------------------
+    python tiling.py buyuk_goruntu.tif --tile-size 640 --overlap 0.2
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+import detection
+
+# tifffile: Büyük TIFF dosyalarını bellek eşlemeli açmak için (opsiyonel)
+try:
+    import tifffile
+
+    TIFFFILE_AVAILABLE = True
+except ImportError:
+    TIFFFILE_AVAILABLE = False
+
+# ==================== SABİTLER ====================
+
+# Varsayılan döşeme boyutu (YOLOv8 giriş boyutuyla aynı)
+DEFAULT_TILE_SIZE = 640
+
+# Komşu döşemeler arasındaki örtüşme oranı
+DEFAULT_OVERLAP = 0.2
+
+# Birleştirme eşiği
+DEFAULT_MERGE_THRESHOLD = 0.5
+
+# Örtüşme matrisi bloğu başına en fazla eleman sayısı (bellek sınırı)
+_BLOCK_ELEMENTS = 1 << 22
+
+# Örtüşme matrisi bloğu başına en fazla satır (küçük bloklar x ekseninde
+# daha dar bir aralıkla karşılaştırılır)
+_BLOCK_ROWS = 256
+
+
+# ==================== KAYNAK VE DÖŞEMELER ====================
+
+def open_source(path):
+    """
+    Görüntü kaynağını mümkünse bellek eşlemeli olarak açar.
+
+    Parametreler:
+        path (str): Görüntü dosyasının yolu
+
+    Dönüş:
+        tuple: (dizi benzeri kaynak, RGB sırasında mı)
+
+    Hata:
+        ValueError: Görüntü decode edilemezse
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.npy':
+        # Dosya diske bağlı kalır; yalnızca okunan döşemeler belleğe gelir
+        return np.load(path, mmap_mode='r'), False
+
+    if ext in ('.tif', '.tiff') and TIFFFILE_AVAILABLE:
+        try:
+            # tifffile görüntüleri RGB sırasında döndürür
+            return tifffile.memmap(path, mode='r'), True
+        except ValueError:
+            # Sıkıştırılmış TIFF: bellek eşlemesi mümkün değil
+            pass
+
+    img = detection.read_image(path)
+    if img is None:
+        raise ValueError(f"Görüntü decode edilemedi: {path}")
+    return img, False
+
+
+def tile_grid(width, height, tile_size=DEFAULT_TILE_SIZE,
+              overlap=DEFAULT_OVERLAP):
+    """
+    Görüntüyü örtüşen döşemelere bölen koordinatları hesaplar.
+
+    Son satır ve sütundaki döşemeler görüntü kenarına hizalanır;
+    böylece tüm döşemeler (görüntü daha küçük değilse) tam boyutludur.
+
+    Parametreler:
+        width (int): Görüntü genişliği
+        height (int): Görüntü yüksekliği
+        tile_size (int): Döşeme kenar uzunluğu (piksel)
+        overlap (float): Örtüşme oranı (0-1 arası)
+
+    Dönüş:
+        list: (x, y, genişlik, yükseklik) döşeme listesi
+    """
+    step = max(1, int(tile_size * (1 - overlap)))
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size + 1, step))
+        if positions[-1] + tile_size < length:
+            positions.append(length - tile_size)
+        return positions
+
+    tiles = []
+    for y in starts(height):
+        for x in starts(width):
+            tiles.append((
+                x, y,
+                min(tile_size, width - x),
+                min(tile_size, height - y)
+            ))
+    return tiles
+
+
+def read_tile(source, x, y, w, h, rgb=False):
+    """
+    Kaynaktan tek bir döşemeyi okur ve BGR formatına getirir.
+
+    Parametreler:
+        source: Dizi benzeri görüntü kaynağı
+        x, y, w, h (int): Döşeme koordinatları
+        rgb (bool): Kaynak RGB sırasındaysa True
+
+    Dönüş:
+        numpy.ndarray: Bitişik (contiguous) BGR döşeme
+    """
+    tile = np.ascontiguousarray(source[y:y + h, x:x + w])
+
+    if tile.ndim == 2:
+        return cv2.cvtColor(tile, cv2.COLOR_GRAY2BGR)
+    if tile.shape[2] == 4:
+        code = cv2.COLOR_RGBA2BGR if rgb else cv2.COLOR_BGRA2BGR
+        return cv2.cvtColor(tile, code)
+    if rgb:
+        return cv2.cvtColor(tile, cv2.COLOR_RGB2BGR)
+    return tile
+
+
+# ==================== KUTU BİRLEŞTİRME ====================
+
+def _overlap_matrix(a, b, metric):
+    """
+    İki kutu dizisi arasındaki örtüşme matrisini hesaplar.
+
+    metric='iou': Kesişim / Birleşim
+    metric='ios': Kesişim / Küçük kutunun alanı (döşeme sınırında
+                  kesilmiş kutuları tam kutuyla eşlemek için daha uygun)
+
+    Dönüş:
+        numpy.ndarray: (len(a), len(b)) boyutlu örtüşme matrisi
+    """
+    xx1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    yy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    xx2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    yy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+
+    area_a = ((a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1]))[:, None]
+    area_b = ((b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]))[None, :]
+
+    if metric == 'ios':
+        denom = np.minimum(area_a, area_b)
+    else:
+        denom = area_a + area_b - inter
+    return inter / np.maximum(denom, 1e-9)
+
+
+def _overlapping_pairs(boxes, class_ids, rank, threshold, metric):
+    """
+    Eşiği aşan aynı sınıflı kutu çiftlerini bulur.
+
+    Örtüşme matrisi sınıf başına, bellek sınırlı satır blokları halinde
+    hesaplanır. Kutular x1'e göre sıralandığından her blok yalnızca x
+    ekseninde ona yetişebilen kutularla karşılaştırılır (birbirinden
+    uzak döşemelerin kutuları hiç eşlenmez).
+
+    Parametreler:
+        boxes (numpy.ndarray): (N, 4) kutular
+        class_ids (numpy.ndarray): Sınıf indeksleri
+        rank (numpy.ndarray): Her kutunun güven sırası (0 = en güvenli)
+        threshold (float): Örtüşme eşiği
+        metric (str): 'iou' veya 'ios'
+
+    Dönüş:
+        tuple: (baş, üye) indeks dizileri; baş her zaman daha güvenlidir
+    """
+    heads = []
+    members = []
+
+    for cls in np.unique(class_ids):
+        idx = np.flatnonzero(class_ids == cls)
+        idx = idx[np.argsort(boxes[idx, 0], kind='stable')]
+        x1 = boxes[idx, 0]
+        widest = (boxes[idx, 2] - x1).max()
+        block = max(1, min(_BLOCK_ROWS, _BLOCK_ELEMENTS // len(idx)))
+
+        for start in range(0, len(idx), block):
+            rows = idx[start:start + block]
+            # x ekseninde bloğa değebilecek kutuların aralığı
+            lo = np.searchsorted(x1, x1[start] - widest, 'left')
+            hi = np.searchsorted(x1, boxes[rows, 2].max(), 'right')
+            cols = idx[lo:hi]
+            overlap = _overlap_matrix(boxes[rows], boxes[cols], metric)
+
+            # Her çift bir kez, daha güvenli kutu baş olacak şekilde alınır
+            later = rank[cols][None, :] > rank[rows][:, None]
+            r, c = np.nonzero((overlap > threshold) & later)
+            heads.append(rows[r])
+            members.append(cols[c])
+
+    if not heads:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(heads), np.concatenate(members)
+
+
+def merge_detections(dets, threshold=DEFAULT_MERGE_THRESHOLD, method='nms',
+                     metric='ios'):
+    """
+    Çakışan tespitleri sınıf bazında tekilleştirir.
+
+    Örtüşmeler tek bir vektörel matris geçişiyle bulunur; açgözlü (greedy)
+    bastırma yalnızca gerçekten örtüşen kutular üzerinde yürür (döşemeli
+    tespitte bunlar yalnızca döşeme sınırlarındaki kopyalardır).
+
+    Parametreler:
+        dets (Detections): Tüm döşemelerden toplanan tespitler
+        threshold (float): Örtüşme eşiği
+        method (str): 'nms' (en güvenli kutu kalır) veya
+            'wbf' (kutular güvene göre ağırlıklı ortalanır)
+        metric (str): 'iou' veya 'ios'
+
+    Dönüş:
+        Detections: Birleştirilmiş tespitler (güven sırasında)
+    """
+    if len(dets) < 2:
+        return dets
+
+    boxes = dets.boxes.astype(np.float64)
+    scores = dets.confidences
+    order = np.argsort(-scores, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+
+    heads, members = _overlapping_pairs(boxes, dets.class_ids, rank,
+                                        threshold, metric)
+
+    # Çiftler baş kutunun güven sırasına göre işlenir: baş kutu daha
+    # önce bastırılmadıysa kalır ve örtüştüğü tüm kutuları bastırır
+    by_rank = np.argsort(rank[heads], kind='stable')
+    heads, members = heads[by_rank], members[by_rank]
+    suppressed = np.zeros(len(dets), dtype=bool)
+    if len(heads):
+        starts = np.flatnonzero(np.r_[True, heads[1:] != heads[:-1]])
+        ends = np.r_[starts[1:], len(heads)]
+        for s, e in zip(starts, ends):
+            if not suppressed[heads[s]]:
+                suppressed[members[s:e]] = True
+
+    keep = order[~suppressed[order]]
+    if method != 'wbf':
+        return dets.select(keep)
+
+    # Her bastırılan kutu, onu bastıran ilk (en güvenli) kalan kutunun
+    # kümesine katılır
+    valid = ~suppressed[heads]
+    heads, members = heads[valid], members[valid]
+    _, first = np.unique(members, return_index=True)
+    owner = np.arange(len(dets))
+    owner[members[first]] = heads[first]
+
+    slot = np.empty(len(dets), dtype=np.intp)
+    slot[keep] = np.arange(len(keep))
+    cluster = slot[owner]
+
+    # Ağırlıklı kutu birleştirme: küme içindeki kutuların güven
+    # skorlarıyla ağırlıklandırılmış ortalaması
+    weights = scores.astype(np.float64)
+    merged = np.zeros((len(keep), 4), dtype=np.float64)
+    np.add.at(merged, cluster, boxes * weights[:, None])
+    merged /= np.bincount(cluster, weights, minlength=len(keep))[:, None]
+
+    return detection.Detections(
+        np.rint(merged), scores[keep], dets.class_ids[keep], dets.names
+    )
+
+
+# ==================== DÖŞEMELİ TESPİT ====================
+
+def detect_tiled(model, source, tile_size=DEFAULT_TILE_SIZE,
+                 overlap=DEFAULT_OVERLAP, conf=detection.DEFAULT_CONF,
+                 batch_size=detection.DEFAULT_BATCH_SIZE, method='nms',
+                 threshold=DEFAULT_MERGE_THRESHOLD, metric='ios'):
+    """
+    Büyük bir görüntüde döşemeli tespit yapar.
+
+    Parametreler:
+        model: Yüklenmiş YOLO modeli
+        source: Görüntü yolu veya dizi benzeri görüntü (BGR)
+        tile_size (int): Döşeme kenar uzunluğu (piksel)
+        overlap (float): Örtüşme oranı (0-1 arası)
+        conf (float): Minimum güven eşiği
+        batch_size (int): Model çağrısı başına döşeme sayısı
+        method (str): Birleştirme yöntemi ('nms' veya 'wbf')
+        threshold (float): Birleştirme örtüşme eşiği
+        metric (str): Örtüşme ölçütü ('iou' veya 'ios')
+
+    Dönüş:
+        Detections: Tam görüntü koordinatlarında tespitler
+    """
+    rgb = False
+    if isinstance(source, (str, os.PathLike)):
+        source, rgb = open_source(os.fspath(source))
+
+    height, width = source.shape[:2]
+    tiles = tile_grid(width, height, tile_size, overlap)
+
+    parts = []
+    names = None
+    for batch in detection.batched(tiles, batch_size):
+        # Yalnızca bu batch'in döşemeleri belleğe okunur
+        images = [read_tile(source, x, y, w, h, rgb) for x, y, w, h in batch]
+        results = detection.detect_images(model, images, conf, imgsz=tile_size)
+
+        for (x, y, _, _), dets in zip(batch, results):
+            names = dets.names
+            if len(dets):
+                parts.append(dets.offset(x, y))
+
+    merged = detection.Detections.concatenate(parts, names)
+    return merge_detections(merged, threshold, method, metric)
+
+
+class TiledModel:
+    """
+    Bir modeli döşemeli tespitle saran arka uç.
+
+    detection.detect_images bu nesnenin detect() metodunu çağırır; her
+    görüntü döşemelere bölünerek iç modele verilir. Böylece döşemeli
+    tespit toplu tespit hattına (önbellek, işçi havuzu, dışa aktarma)
+    değişiklik yapmadan eklenir.
+    """
+
+    def __init__(self, model, tile_size=DEFAULT_TILE_SIZE,
+                 overlap=DEFAULT_OVERLAP,
+                 batch_size=detection.DEFAULT_BATCH_SIZE, method='nms',
+                 threshold=DEFAULT_MERGE_THRESHOLD, metric='ios'):
+        """
+        Parametreler:
+            model: YOLO modeli veya arka uç
+            tile_size (int): Döşeme kenar uzunluğu (piksel)
+            overlap (float): Örtüşme oranı (0-1 arası)
+            batch_size (int): Model çağrısı başına döşeme sayısı
+            method (str): Birleştirme yöntemi ('nms' veya 'wbf')
+            threshold (float): Birleştirme örtüşme eşiği
+            metric (str): Örtüşme ölçütü ('iou' veya 'ios')
+        """
+        self.model = model
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self.method = method
+        self.threshold = threshold
+        self.metric = metric
+
+        # Önbellek anahtarı döşeme ayarlarını da içermeli
+        import cache
+
+        self.identity = (f"{cache.model_identity(model)}|tile{tile_size}"
+                         f"@{overlap:g}|{method}-{metric}{threshold:g}")
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None):
+        """
+        Görüntüleri döşemeli olarak işler.
+
+        imgsz yok sayılır; iç model döşeme boyutunda çalışır.
+
+        Dönüş:
+            list: Her görüntü için Detections
+        """
+        return [
+            detect_tiled(self.model, image, self.tile_size, self.overlap,
+                         conf, self.batch_size, self.method, self.threshold,
+                         self.metric)
+            for image in images
+        ]
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="Büyük görüntülerde döşemeli YOLO tespiti"
+    )
+    parser.add_argument('images', nargs='+', help="Görüntü dosyaları")
+    parser.add_argument('--weights', default=detection.DEFAULT_WEIGHTS,
+                        help="Model ağırlık dosyası")
+    parser.add_argument('--conf', type=float, default=detection.DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--tile-size', type=int, default=DEFAULT_TILE_SIZE,
+                        help="Döşeme kenar uzunluğu (piksel)")
+    parser.add_argument('--overlap', type=float, default=DEFAULT_OVERLAP,
+                        help="Döşemeler arası örtüşme oranı")
+    parser.add_argument('--batch-size', type=int,
+                        default=detection.DEFAULT_BATCH_SIZE,
+                        help="Model çağrısı başına döşeme sayısı")
+    parser.add_argument('--merge', choices=('nms', 'wbf'), default='nms',
+                        help="Döşeme sınırlarındaki kutuları birleştirme yöntemi")
+    parser.add_argument('--metric', choices=('iou', 'ios'), default='ios',
+                        help="Birleştirmede kullanılacak örtüşme ölçütü")
+    parser.add_argument('--threshold', type=float,
+                        default=DEFAULT_MERGE_THRESHOLD,
+                        help="Birleştirme örtüşme eşiği")
+    args = parser.parse_args(argv)
+
+    model = detection.load_model(args.weights)
+
+    for path in args.images:
+        start = time.perf_counter()
+        record = {'image': path}
+        try:
+            dets = detect_tiled(
+                model, path, args.tile_size, args.overlap, args.conf,
+                args.batch_size, args.merge, args.threshold, args.metric
+            )
+            record['objects'] = dets.to_records()
+        except (OSError, ValueError) as e:
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        print(json.dumps(record, ensure_ascii=False))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Video Kareleri Arasında Nesne Takibi (IoU + Kalman)
+
+Her karede sıfırdan oluşturulan tespitler, kareler arasında kalıcı
+kimliklere (ID) bağlanır. Böylece bir akıştaki farklı nesne sayısı ve
+her nesnenin görüntüde kalma süresi hesaplanabilir.
+
+Yöntem (SORT benzeri):
+----------------------
+1. TAHMİN: Her iz (track) sabit hızlı bir Kalman filtresiyle bir sonraki
+   kareye taşınır. Durum: [cx, cy, w, h, vx, vy, vw, vh]. Tüm izler tek
+   seferde (N×8 durum, N×8×8 kovaryans) NumPy ile güncellenir.
+2. EŞLEME: Tahmin edilen kutular ile yeni tespitler arasında IoU
+   matrisi hesaplanır; farklı sınıflar eşleşmez. En yüksek IoU'dan
+   başlayarak açgözlü (greedy) eşleme yapılır.
+3. GÜNCELLEME: Eşleşen izler ölçümle düzeltilir; eşleşmeyen tespitler
+   yeni iz başlatır; max_age kare boyunca eşleşmeyen izler silinir.
+
+Seyrek Tespit:
+--------------
+Model yalnızca her k. karede çalıştırılabilir; aradaki karelerde
+step(None) çağrılır ve kutular Kalman tahmininden gelir. Çıkarım
+maliyeti yaklaşık k kat azalır.
+
+Kullanım:
+---------
+    tracker = Tracker()
+    for index, frame in enumerate(frames):
+        dets = detect(frame) if index % 3 == 0 else None
+        tracked, ids = tracker.step(dets, index, timestamp=index / fps)
+    print(tracker.summary())
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import numpy as np
+
+import detection
+
+# ==================== SABİTLER ====================
+
+# Eşleme için en düşük IoU
+DEFAULT_IOU_THRESHOLD = 0.3
+
+# Bu kadar kare eşleşmeyen iz silinir
+DEFAULT_MAX_AGE = 30
+
+# İzin onaylanması (sayılması ve gösterilmesi) için gereken eşleşme sayısı
+DEFAULT_MIN_HITS = 3
+
+# Kalman gürültü katsayıları (kutu boyutuna oranla standart sapma)
+STD_POSITION = 1.0 / 20
+STD_VELOCITY = 1.0 / 160
+STD_MEASUREMENT = 1.0 / 20
+
+
+# ==================== IoU ====================
+
+def iou_matrix(a, b):
+    """
+    İki kutu kümesi arasındaki IoU matrisini hesaplar.
+
+    Parametreler:
+        a (numpy.ndarray): (N × 4) [x1, y1, x2, y2] kutular
+        b (numpy.ndarray): (M × 4) [x1, y1, x2, y2] kutular
+
+    Dönüş:
+        numpy.ndarray: (N × M) IoU değerleri
+    """
+    a = np.asarray(a, dtype=np.float64)[:, None, :]
+    b = np.asarray(b, dtype=np.float64)[None, :, :]
+
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2])
+                      - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3])
+                      - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def greedy_match(scores, threshold):
+    """
+    Skor matrisinde en yüksekten başlayarak bire bir eşleme yapar.
+
+    Parametreler:
+        scores (numpy.ndarray): (N × M) skorlar
+        threshold (float): Eşleşme için en düşük skor
+
+    Dönüş:
+        tuple: (satır indeksleri, sütun indeksleri) dizileri
+    """
+    rows, cols = np.nonzero(scores >= threshold)
+    order = np.argsort(-scores[rows, cols], kind='stable')
+
+    used_rows, used_cols = set(), set()
+    matched_rows, matched_cols = [], []
+    for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+        if r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        matched_rows.append(r)
+        matched_cols.append(c)
+    return (np.array(matched_rows, dtype=np.intp),
+            np.array(matched_cols, dtype=np.intp))
+
+
+# ==================== KUTU ↔ DURUM DÖNÜŞÜMÜ ====================
+
+def _to_measurement(boxes):
+    """[x1, y1, x2, y2] → [cx, cy, w, h]"""
+    boxes = np.asarray(boxes, dtype=np.float64)
+    wh = boxes[:, 2:] - boxes[:, :2]
+    return np.hstack([boxes[:, :2] + wh / 2, wh])
+
+
+def _to_boxes(state):
+    """[cx, cy, w, h, ...] → [x1, y1, x2, y2]"""
+    center = state[:, :2]
+    half = np.maximum(state[:, 2:4], 1.0) / 2
+    return np.hstack([center - half, center + half])
+
+
+def _diag(variances):
+    """(N × K) varyanslardan (N × K × K) köşegen matrisler oluşturur."""
+    n, k = variances.shape
+    out = np.zeros((n, k, k))
+    idx = np.arange(k)
+    out[:, idx, idx] = variances
+    return out
+
+
+# ==================== TAKİPÇİ ====================
+
+class Tracker:
+    """
+    Çoklu nesne takipçisi (IoU eşleme + sabit hızlı Kalman filtresi).
+
+    İzlerin tüm durumu sütun dizilerinde tutulur; tahmin ve güncelleme
+    adımları iz sayısından bağımsız olarak tek seferde yapılır.
+    """
+
+    def __init__(self, iou_threshold=DEFAULT_IOU_THRESHOLD,
+                 max_age=DEFAULT_MAX_AGE, min_hits=DEFAULT_MIN_HITS,
+                 class_aware=True):
+        """
+        Parametreler:
+            iou_threshold (float): Eşleme için en düşük IoU
+            max_age (int): Eşleşmeden geçebilecek en fazla kare sayısı
+            min_hits (int): İzin onaylanması için gereken eşleşme sayısı
+            class_aware (bool): True ise farklı sınıflar eşleşmez
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.class_aware = class_aware
+
+        # İz sütunları
+        self.state = np.zeros((0, 8))         # Kalman durumu
+        self.covariance = np.zeros((0, 8, 8))  # Kalman kovaryansı
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.class_ids = np.zeros(0, dtype=np.int32)
+        self.confidences = np.zeros(0, dtype=np.float32)
+        self.hits = np.zeros(0, dtype=np.int32)
+        self.misses = np.zeros(0, dtype=np.int32)  # Son eşleşmeden beri kare
+        self.first_seen = np.zeros(0)               # İzin başladığı zaman
+
+        self.names = {}
+        self.frame = None
+        self._next_id = 1
+
+        # Onaylanmış her ID için: [sınıf, ilk görülme, son görülme]
+        self.history = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ---------- Kalman ----------
+
+    def _predict(self, steps):
+        """Tüm izleri 'steps' kare ileri taşır."""
+        if not len(self) or steps <= 0:
+            return
+
+        transition = np.eye(8)
+        transition[:4, 4:] = np.eye(4) * steps
+
+        wh = np.maximum(self.state[:, [2, 3, 2, 3]], 1.0)
+        noise = _diag(np.hstack([(STD_POSITION * wh) ** 2,
+                                 (STD_VELOCITY * wh) ** 2]) * steps)
+
+        self.state = self.state @ transition.T
+        self.covariance = transition @ self.covariance @ transition.T + noise
+        self.misses += steps
+
+    def _correct(self, index, measurement):
+        """Seçili izleri ölçümlerle (cx, cy, w, h) düzeltir."""
+        state = self.state[index]
+        cov = self.covariance[index]
+
+        wh = np.maximum(measurement[:, [2, 3, 2, 3]], 1.0)
+        innovation_cov = cov[:, :4, :4] + _diag((STD_MEASUREMENT * wh) ** 2)
+        gain = cov[:, :, :4] @ np.linalg.inv(innovation_cov)
+
+        residual = measurement - state[:, :4]
+        self.state[index] = state + (gain @ residual[:, :, None])[:, :, 0]
+        self.covariance[index] = cov - gain @ cov[:, :4, :]
+
+    def _spawn(self, dets, index, timestamp):
+        """Eşleşmeyen tespitlerden yeni izler başlatır."""
+        if not len(index):
+            return
+        measurement = _to_measurement(dets.boxes[index])
+        wh = np.maximum(measurement[:, [2, 3, 2, 3]], 1.0)
+
+        count = len(index)
+        self.state = np.vstack([
+            self.state, np.hstack([measurement, np.zeros((count, 4))])
+        ])
+        self.covariance = np.concatenate([
+            self.covariance,
+            _diag(np.hstack([(2 * STD_POSITION * wh) ** 2,
+                             (10 * STD_VELOCITY * wh) ** 2]))
+        ])
+        self.ids = np.concatenate([
+            self.ids, np.arange(self._next_id, self._next_id + count)
+        ])
+        self._next_id += count
+        self.class_ids = np.concatenate([self.class_ids, dets.class_ids[index]])
+        self.confidences = np.concatenate([self.confidences,
+                                           dets.confidences[index]])
+        self.hits = np.concatenate([self.hits, np.ones(count, np.int32)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, np.int32)])
+        self.first_seen = np.concatenate([self.first_seen,
+                                          np.full(count, float(timestamp))])
+
+    def _keep(self, mask):
+        """Yalnızca mask ile seçilen izleri tutar."""
+        for name in ('state', 'covariance', 'ids', 'class_ids',
+                     'confidences', 'hits', 'misses', 'first_seen'):
+            setattr(self, name, getattr(self, name)[mask])
+
+    # ---------- Genel arayüz ----------
+
+    def step(self, dets, frame, timestamp=None):
+        """
+        İzleri bir kare ilerletir.
+
+        Parametreler:
+            dets (Detections): Bu karenin tespitleri; None ise tespit
+                yapılmamıştır ve kutular yalnızca tahminden gelir
+            frame (int): Kare indeksi (atlanan kareler tahmine katılır)
+            timestamp (float): Karenin zamanı (saniye; None ise kare indeksi)
+
+        Dönüş:
+            tuple: (onaylanmış izlerin Detections'ı, ID dizisi)
+        """
+        timestamp = frame if timestamp is None else timestamp
+        steps = 1 if self.frame is None else frame - self.frame
+        self.frame = frame
+        self._predict(steps)
+
+        matched = np.zeros(0, dtype=np.intp)
+        if dets is not None:
+            self.names = dets.names or self.names
+            scores = iou_matrix(_to_boxes(self.state), dets.boxes)
+            if self.class_aware:
+                scores[self.class_ids[:, None] != dets.class_ids[None, :]] = 0
+            matched, columns = greedy_match(scores, self.iou_threshold)
+
+            if len(matched):
+                self._correct(matched, _to_measurement(dets.boxes[columns]))
+                self.confidences[matched] = dets.confidences[columns]
+                self.hits[matched] += 1
+                self.misses[matched] = 0
+
+            unmatched = np.setdiff1d(np.arange(len(dets)), columns)
+            self._spawn(dets, unmatched, timestamp)
+
+            # Uzun süre eşleşmeyen izleri sil
+            self._keep(self.misses <= self.max_age)
+
+            # Onaylanmış izlerin görülme zamanlarını güncelle
+            # (ilk görülme, iz onaylanmadan önceki ilk tespittir)
+            seen = (self.misses == 0) & (self.hits >= self.min_hits)
+            for track_id, class_id, first in zip(
+                    self.ids[seen].tolist(), self.class_ids[seen].tolist(),
+                    self.first_seen[seen].tolist()):
+                entry = self.history.get(track_id)
+                if entry is None:
+                    self.history[track_id] = [class_id, first, timestamp]
+                else:
+                    entry[2] = timestamp
+
+        # Onaylanmış ve hâlâ takip edilen izler döndürülür
+        visible = (self.hits >= self.min_hits) & (self.misses <= self.max_age)
+        if dets is not None:
+            # Tespit yapılan karede yalnızca bu karede eşleşen izler
+            visible &= self.misses == 0
+        boxes = np.rint(_to_boxes(self.state[visible]))
+        tracked = detection.Detections(
+            boxes, self.confidences[visible], self.class_ids[visible],
+            self.names
+        )
+        return tracked, self.ids[visible].copy()
+
+    def dwell_times(self):
+        """
+        Her onaylanmış ID'nin görüntüde kaldığı süre.
+
+        Dönüş:
+            dict: ID → süre (timestamp birimiyle, genelde saniye)
+        """
+        return {track_id: last - first
+                for track_id, (_, first, last) in self.history.items()}
+
+    def counts(self):
+        """
+        Sınıf başına farklı nesne (onaylanmış ID) sayısı.
+
+        Dönüş:
+            dict: sınıf adı → sayı
+        """
+        result = {}
+        for class_id, _, _ in self.history.values():
+            name = self.names.get(class_id, str(class_id))
+            result[name] = result.get(name, 0) + 1
+        return result
+
+    def summary(self):
+        """
+        Sınıf başına sayı ve kalma süresi istatistikleri.
+
+        Dönüş:
+            dict: sınıf adı → {count, mean_dwell, max_dwell}
+        """
+        dwell = {}
+        for class_id, first, last in self.history.values():
+            name = self.names.get(class_id, str(class_id))
+            dwell.setdefault(name, []).append(last - first)
+        return {
+            name: {
+                'count': len(values),
+                'mean_dwell': round(sum(values) / len(values), 3),
+                'max_dwell': round(max(values), 3),
+            }
+            for name, values in sorted(dwell.items(),
+                                       key=lambda item: -len(item[1]))
+        }
@@ -0,0 +1,526 @@
+"""
+Video Dosyası ve Kamera Akışında Nesne Tespiti
+
+Bu modül video dosyalarını, kameraları (V4L2) veya yerel bir test deseni
+kaynağını okuyarak kareler üzerinde sürekli tespit yapar. İş üç ayrı iş
+parçacığına bölünür:
+
+    [yakalama] --son kare--> [tespit + çizim] --son sonuç--> [gösterim]
+
+Aşamalar arasında kuyruk yerine tek elemanlı "son değer" yuvaları
+kullanılır. Tespit geride kalırsa yakalama yeni kareyi eskisinin üzerine
+yazar; bekleyen eski kareler işlenmez (uyarlamalı kare atlama). Böylece
+gecikme birikmez ve gösterim her zaman en son biten kareyi gösterir.
+Gösterim tarafı hiçbir zaman yakalamayı bekletmez.
+
+Takip (--track):
+----------------
+Tespitler tracker.Tracker ile kareler arasında kalıcı ID'lere bağlanır.
+--detect-every k ile model yalnızca her k. karede çalışır; aradaki
+karelerin kutuları takipçinin tahmininden gelir. Sonunda sınıf başına
+farklı nesne sayısı ve kalma süreleri raporlanır.
+
+Hareket Kapısı (--motion):
+--------------------------
+Sabit kameralarda model yalnızca hareket olan karelerde ve yalnızca
+hareketli bölgelerde çalışır (bkz. motion.py). Hareketsiz karelerde
+önceki tespitler kullanılır.
+
+Kaynak Belirtme:
+----------------
+• '0', '1', ...      : Kamera indeksi (Linux'ta V4L2)
+• 'test' / 'test:640x480@30' : Yapay test deseni (kamera gerekmez)
+• Diğer               : Video dosyası yolu
+
+Komut Satırı Kullanımı:
+-----------------------
+    python video.py video.mp4 --show
+    python video.py test:1280x720@30 --duration 10
+    python video.py video.mp4 --all-frames --track --detect-every 3
+    python video.py 0 --motion diff --refresh-every 300
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import sys
+import json
+import time
+import argparse
+import threading
+
+import cv2
+import numpy as np
+
+import detection
+import annotate
+import tracker
+import motion
+
+# ==================== SABİTLER ====================
+
+# Kararlı durum FPS hesabına katılmayan ilk kare sayısı (ısınma)
+WARMUP_FRAMES = 5
+
+# FPS hareketli ortalamasının yumuşatma katsayısı
+FPS_SMOOTHING = 0.1
+
+
+# ==================== SON DEĞER YUVASI ====================
+
+class LatestSlot:
+    """
+    Tek elemanlı, iş parçacığı güvenli "son değer" yuvası.
+
+    put() eski değeri her zaman üzerine yazar ve asla beklemez;
+    get() yeni bir değer gelene kadar bekler. Üzerine yazılan
+    (hiç okunmamış) değerler 'dropped' sayacında tutulur.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._version = 0
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._version += 1
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Yeni değeri alır (yuva boşalır); kapatıldıysa None döndürür."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._item is not None or self._closed, timeout
+            )
+            item, self._item = self._item, None
+            return item
+
+    def peek(self):
+        """Son değeri beklemeden döndürür (yuva boşalmaz)."""
+        with self._cond:
+            return self._item, self._version
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+# ==================== KAYNAKLAR ====================
+
+class TestPatternSource:
+    """
+    Kamera veya dosya gerektirmeyen yapay video kaynağı.
+
+    cv2.VideoCapture ile aynı read()/get()/release() arayüzünü sunar.
+    Kareler, hareket eden renkli dikdörtgenler içeren bir desendir.
+    Gerçek bir kamera gibi read() bir sonraki karenin zamanına kadar
+    bekler; kareler fps hızında üretilir.
+    """
+
+    def __init__(self, width=640, height=480, fps=30.0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self._index = 0
+        self._next_time = None
+        # Arka plan bir kez oluşturulur (yatay renk geçişi)
+        gradient = np.linspace(0, 255, width, dtype=np.uint8)
+        self._background = np.dstack([
+            np.tile(gradient, (height, 1)),
+            np.full((height, width), 96, np.uint8),
+            np.tile(gradient[::-1], (height, 1)),
+        ])
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        # Kamera gibi fps hızında kare ver (yakalama döngüsü boşa dönmez)
+        now = time.perf_counter()
+        if self._next_time is None:
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        else:
+            # Geride kalındıysa kaçırılan kareler telafi edilmez
+            self._next_time = now
+        self._next_time += 1.0 / self.fps
+
+        frame = self._background.copy()
+        t = self._index
+        for k in range(3):
+            size = self.height // (4 + k)
+            x = (t * (3 + 2 * k)) % max(1, self.width - size)
+            y = (self.height // 4) * (k + 1) - size // 2
+            color = annotate.class_color(k)
+            cv2.rectangle(frame, (x, y), (x + size, y + size), color, -1)
+        self._index += 1
+        return True, frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+
+    def release(self):
+        pass
+
+
+def open_capture(source):
+    """
+    Kaynak belirtecine göre video kaynağını açar.
+
+    Parametreler:
+        source (str): Kamera indeksi, 'test[:GxY@FPS]' veya dosya yolu
+
+    Dönüş:
+        tuple: (kaynak nesnesi, canlı kaynak mı)
+
+    Hata:
+        ValueError: Kaynak açılamazsa
+    """
+    source = str(source)
+
+    if source.startswith('test'):
+        width, height, fps = 640, 480, 30.0
+        spec = source.partition(':')[2]
+        if spec:
+            size, _, rate = spec.partition('@')
+            width, height = (int(v) for v in size.split('x'))
+            if rate:
+                fps = float(rate)
+        return TestPatternSource(width, height, fps), True
+
+    if source.isdigit():
+        capture = cv2.VideoCapture(int(source))
+        live = True
+    else:
+        capture = cv2.VideoCapture(source)
+        live = False
+
+    if not capture.isOpened():
+        raise ValueError(f"Video kaynağı açılamadı: {source}")
+    return capture, live
+
+
+# ==================== VİDEO TESPİTİ ====================
+
+class VideoDetector:
+    """
+    Bir video kaynağında yakalama ve tespiti ayrı iş parçacıklarında yürütür.
+
+    Kullanım:
+        detector = VideoDetector(model, 'video.mp4')
+        detector.start()
+        ...
+        frame_index, frame, dets = detector.latest()   # beklemez
+        ...
+        detector.stop()
+    """
+
+    def __init__(self, model, source, conf=detection.DEFAULT_CONF,
+                 imgsz=None, realtime=True, labels=True, track=False,
+                 detect_every=1, gate=None):
+        """
+        Parametreler:
+            model: Yüklenmiş YOLO modeli
+            source (str): Kaynak belirteci (bkz. open_capture)
+            conf (float): Minimum güven eşiği
+            imgsz (int): Model giriş boyutu (None ise varsayılan)
+            realtime (bool): Dosya kaynaklarını kendi FPS'lerinde oku;
+                tespit yetişemezse kareler atlanır. False ise dosyanın
+                her karesi sırayla işlenir.
+            labels (bool): Kutularla birlikte etiketleri de çiz
+            track (bool): Nesneleri kareler arasında takip et (kalıcı ID)
+            detect_every (int): Model yalnızca her k. işlenen karede
+                çalışır; aradaki karelerde kutular takipçiden gelir
+                (track=True gerektirir)
+            gate (motion.MotionGate veya str): Hareket kapısı ya da
+                yöntem adı ('diff', 'mog2'); None ise her karede tespit
+        """
+        self.model = model
+        self.conf = conf
+        self.imgsz = imgsz
+        self.labels = labels
+        self.detect_every = max(1, detect_every) if track else 1
+        self.tracker = tracker.Tracker() if track else None
+        self.gate = motion.MotionGate(gate) if isinstance(gate, str) else gate
+        self.capture, self.live = open_capture(source)
+        self.realtime = realtime or self.live
+
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.source_fps = fps if fps and fps > 0 else 30.0
+
+        self._frames = LatestSlot()
+        self._results = LatestSlot()
+        self._stop = threading.Event()
+        self._threads = []
+
+        # İstatistikler
+        self.captured = 0
+        self.processed = 0
+        self.detected = 0
+        self.finished = False
+        self.error = None   # Tespit iş parçacığını durduran hata (metin)
+        self._fps = 0.0
+        self._steady_start = None
+
+    # ---------- Yaşam döngüsü ----------
+
+    def start(self):
+        """Yakalama ve tespit iş parçacıklarını başlatır."""
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name='video-capture',
+                             daemon=True),
+            threading.Thread(target=self._infer_loop, name='video-infer',
+                             daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """İş parçacıklarını durdurur ve kaynağı serbest bırakır."""
+        self._stop.set()
+        self._frames.close()
+        self._results.close()
+        for thread in self._threads:
+            thread.join()
+        self.capture.release()
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    # ---------- Sonuçlar ----------
+
+    def latest(self):
+        """
+        En son tamamlanan kareyi beklemeden döndürür.
+
+        Dönüş:
+            tuple: (kare indeksi, çizilmiş kare, Detections) veya None
+        """
+        item, _ = self._results.peek()
+        return item
+
+    def wait_result(self, timeout=None):
+        """Yeni bir sonuç gelene kadar bekler (CLI gösterimi için)."""
+        return self._results.get(timeout)
+
+    def stats(self):
+        """
+        Akış istatistiklerini döndürür.
+
+        Dönüş:
+            dict: captured, processed, detected (modelin çalıştığı kare),
+            skipped, fps (kararlı durum), source_fps ve takip açıksa
+            tracks (sınıf başına sayı ve kalma süreleri), hareket kapısı
+            açıksa motion (bkz. MotionGate.stats), tespit bir hatayla
+            durduysa error
+        """
+        stats = {
+            'captured': self.captured,
+            'processed': self.processed,
+            'detected': self.detected,
+            'skipped': self._frames.dropped,
+            'fps': round(self.steady_fps(), 2),
+            'source_fps': self.source_fps,
+        }
+        if self.tracker is not None:
+            stats['tracks'] = self.tracker.summary()
+        if self.gate is not None:
+            stats['motion'] = self.gate.stats()
+        if self.error is not None:
+            stats['error'] = self.error
+        return stats
+
+    def steady_fps(self):
+        """Isınma kareleri hariç ortalama işlenen kare hızı."""
+        if self._steady_start is None:
+            return self._fps
+        elapsed = time.perf_counter() - self._steady_start
+        frames = self.processed - WARMUP_FRAMES
+        return frames / elapsed if elapsed > 0 and frames > 0 else self._fps
+
+    # ---------- İş parçacıkları ----------
+
+    def _capture_loop(self):
+        interval = 1.0 / self.source_fps
+        next_time = time.perf_counter()
+
+        try:
+            while not self._stop.is_set():
+                ok, frame = self.capture.read()
+                if not ok:
+                    break
+
+                self.captured += 1
+                # Yeni kare eskisinin üzerine yazılır (kare atlama)
+                self._frames.put((self.captured - 1, frame))
+
+                if self.realtime and not self.live:
+                    # Dosyayı gerçek zamanlı hızda oku
+                    next_time += interval
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        self._stop.wait(delay)
+                    else:
+                        next_time = time.perf_counter()
+                elif not self.realtime:
+                    # Her kare işlensin: tespit yuvayı boşaltana kadar bekle
+                    while (self._frames.peek()[0] is not None
+                           and not self._stop.is_set()):
+                        self._stop.wait(0.001)
+        finally:
+            self.finished = True
+            self._frames.close()
+
+    def _infer_loop(self):
+        last = time.perf_counter()
+
+        try:
+            while not self._stop.is_set():
+                item = self._frames.get()
+                if item is None:
+                    break
+
+                index, frame = item
+                dets, ids = None, None
+                if self.processed % self.detect_every == 0:
+                    if self.gate is not None:
+                        # Hareket yoksa model çalışmaz, önceki tespitler döner
+                        dets, ran = self.gate.step(self.model, frame,
+                                                   self.conf, self.imgsz)
+                        self.detected += ran
+                    else:
+                        dets = detection.detect_images(
+                            self.model, [frame], self.conf, self.imgsz
+                        )[0]
+                        self.detected += 1
+
+                if self.tracker is not None:
+                    # Dosyalarda kare zamanı, canlı akışta duvar saati
+                    timestamp = (time.monotonic() if self.live
+                                 else index / self.source_fps)
+                    dets, ids = self.tracker.step(dets, index, timestamp)
+
+                output = annotate.draw_detections(
+                    frame, dets, labels=self.labels, copy=False, ids=ids
+                )
+                self._results.put((index, output, dets))
+
+                # FPS ölçümü (anlık değerin hareketli ortalaması)
+                self.processed += 1
+                now = time.perf_counter()
+                instant = 1.0 / max(now - last, 1e-6)
+                self._fps += FPS_SMOOTHING * (instant - self._fps)
+                last = now
+                if self.processed == WARMUP_FRAMES:
+                    self._steady_start = now
+        except Exception as e:
+            # İş parçacığı sessizce ölmesin: hata saklanır ve akış durur;
+            # arayüz ve CLI hatayı stats()['error'] ile gösterir
+            self.error = f"{type(e).__name__}: {e}"
+            self._stop.set()
+        finally:
+            # Yuvalar kapanır; bekleyen okuyucular (wait_result) uyanır
+            self._frames.close()
+            self._results.close()
+
+
+# ==================== KOMUT SATIRI ====================
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası.
+
+    Parametreler:
+        argv (list): Argüman listesi (None ise sys.argv kullanılır)
+
+    Dönüş:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    parser = argparse.ArgumentParser(
+        description="Video dosyası veya kamera akışında YOLO tespiti"
+    )
+    parser.add_argument('source',
+                        help="Video dosyası, kamera indeksi veya 'test'")
+    parser.add_argument('--weights', default=detection.DEFAULT_WEIGHTS,
+                        help="Model ağırlık dosyası")
+    parser.add_argument('--conf', type=float, default=detection.DEFAULT_CONF,
+                        help="Minimum güven eşiği")
+    parser.add_argument('--imgsz', type=int, default=None,
+                        help="Model giriş boyutu")
+    parser.add_argument('--all-frames', action='store_true',
+                        help="Dosyanın tüm karelerini işle (kare atlama yok)")
+    parser.add_argument('--duration', type=float, default=None,
+                        help="En fazla bu kadar saniye çalış")
+    parser.add_argument('--show', action='store_true',
+                        help="Sonuçları bir pencerede göster")
+    parser.add_argument('--track', action='store_true',
+                        help="Nesneleri kalıcı ID'lerle takip et; sınıf "
+                             "başına sayı ve kalma sürelerini raporla")
+    parser.add_argument('--detect-every', type=int, default=1,
+                        help="Modeli yalnızca her k. karede çalıştır "
+                             "(aradaki kareler takipçiden, --track ile)")
+    parser.add_argument('--motion', choices=motion.METHODS,
+                        help="Modeli yalnızca hareketli bölgelerde çalıştır "
+                             "(sabit kameralar için)")
+    parser.add_argument('--min-motion', type=float,
+                        default=motion.DEFAULT_MIN_MOTION,
+                        help="Modeli tetikleyen değişen piksel oranı")
+    parser.add_argument('--refresh-every', type=int, default=0,
+                        help="Hareket kapısında her k karede bir tüm kareyi "
+                             "işle (0: yalnızca gerektiğinde)")
+    args = parser.parse_args(argv)
+
+    gate = None
+    if args.motion:
+        gate = motion.MotionGate(args.motion, min_motion=args.min_motion,
+                                 refresh_every=args.refresh_every)
+
+    model = detection.load_model(args.weights)
+    detector = VideoDetector(
+        model, args.source, args.conf, args.imgsz,
+        realtime=not args.all_frames, track=args.track,
+        detect_every=args.detect_every, gate=gate
+    )
+
+    start = time.perf_counter()
+    detector.start()
+    try:
+        while True:
+            if args.duration and time.perf_counter() - start > args.duration:
+                break
+
+            result = detector.wait_result(timeout=0.5)
+            if result is None:
+                if not detector.is_running():
+                    break
+                continue
+
+            if args.show:
+                cv2.imshow('YOLO Video', result[1])
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        detector.stop()
+        if args.show:
+            cv2.destroyAllWindows()
+
+    print(json.dumps(detector.stats()), file=sys.stderr)
+    if detector.error is not None:
+        print(f"Tespit hatası: {detector.error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
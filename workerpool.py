@@ -0,0 +1,287 @@
+"""
+Çok Süreçli (Multi-Process) Çıkarım Havuzu
+
+Tek bir süreçte GIL ve PyTorch'un süreç başına iş parçacığı havuzu
+nedeniyle çekirdek sayısı arttıkça verim doğrusal artmaz. Bu modül
+çıkarımı N ayrı işçi sürece dağıtır:
+
+• Çekirdek sabitleme: Kullanılabilir çekirdekler N bitişik gruba
+  bölünür ve her işçi kendi grubuna sabitlenir (os.sched_setaffinity).
+  Bitişik gruplar çift soketli sunucularda genellikle aynı sokete
+  (NUMA düğümüne) düşer. İşçinin iş parçacığı sayısı grup boyutuna
+  eşitlenir; böylece işçiler birbirinin çekirdeğini paylaşmaz.
+• Süreç başlatma: İşçiler 'forkserver' (yoksa 'spawn') ile başlatılır.
+  PyTorch'un OpenMP iş parçacığı havuzu bir kez çalıştıktan sonra
+  fork edilen süreçlerde kilitlenebilir; ana süreçte model yüklense
+  bile işçiler temiz bir süreçten doğar ve modeli kendileri yükler.
+  Ana süreçte çıkarım çalıştırılmaz. ONNX/OpenVINO için model ana
+  süreçte bir kez dışa aktarılır, işçiler aynı önbellek dosyasını açar.
+• Görüntü aktarımı: Görüntüler pickle edilmez; paylaşımlı belleğe
+  (multiprocessing.shared_memory) bir kez kopyalanır ve işçi diziyi
+  doğrudan bu bellek üzerinde görür. Geriye yalnızca küçük tespit
+  dizileri döner. Kaynak takipçisi (resource_tracker) işçilerden önce
+  ana süreçte başlatılır; işçiler onu paylaşır, bloklar yalnızca ana
+  süreçte silinir (işçi çıkışında sızıntı uyarısı veya ikinci kez
+  silme olmaz).
+
+Havuzun detect() metodu olduğu için detection.detect_images,
+pipeline.run_pipeline ve cache.CachedModel ile doğrudan kullanılabilir.
+
+Kullanım:
+---------
+    with workerpool.WorkerPool('yolov8n.pt', processes=4) as pool:
+        dets = detection.detect_images(pool, images)
+
+    python detection.py resimler/ --processes 4 --batch-size 8
+"""
+
+# ==================== KÜTÜPHANE İMPORTLARI ====================
+
+import os
+import queue
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import detection
+
+# ==================== SABİTLER ====================
+
+# İşçi sürecinde kullanılan model (işçi başlatılırken yüklenir)
+_MODEL = None
+
+
+# ==================== ÇEKİRDEK GRUPLARI ====================
+
+def available_cores():
+    """
+    Bu sürecin çalışabileceği çekirdekleri döndürür.
+
+    Dönüş:
+        list: Sıralı çekirdek numaraları
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cores(cores, groups):
+    """
+    Çekirdekleri bitişik ve olabildiğince eşit gruplara böler.
+
+    Parametreler:
+        cores (list): Çekirdek numaraları
+        groups (int): Grup sayısı
+
+    Dönüş:
+        list: Her işçi için çekirdek listesi
+    """
+    return [chunk.tolist() for chunk in np.array_split(np.array(cores), groups)
+            if len(chunk)]
+
+
+# ==================== İŞÇİ SÜRECİ ====================
+
+def _build_model(spec, threads):
+    """İşçi sürecinde modeli yükler."""
+    if spec['backend'] == 'torch':
+        model = detection.load_model(spec['weights'])
+        model.fuse()
+        return model
+
+    import backends
+
+    # Sınıf adları dışa aktarılan modelin üst verisinden okunur
+    if spec['backend'] == 'onnx':
+        return backends.OnnxBackend(spec['path'], None, spec['imgsz'],
+                                    intra_threads=threads)
+    return backends.OpenVinoBackend(spec['path'], None, spec['imgsz'],
+                                    intra_threads=threads)
+
+
+def _init_worker(core_queue, spec):
+    """
+    İşçi süreci başlatıcısı: çekirdek sabitleme ve model hazırlığı.
+
+    Parametreler:
+        core_queue (Queue): Her işçiye bir çekirdek grubu veren kuyruk
+        spec (dict): Model bilgisi (backend, weights, path, imgsz)
+    """
+    global _MODEL
+
+    try:
+        cores = core_queue.get_nowait()
+    except queue.Empty:
+        # Çöken bir işçinin yerine başlatılan süreç: sabitleme yapılmaz
+        cores = None
+
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    threads = len(cores) if cores else None
+
+    if spec['backend'] == 'torch' and threads:
+        import torch
+
+        torch.set_num_threads(threads)
+
+    _MODEL = _build_model(spec, threads)
+
+
+def _attach(name, layout):
+    """
+    Paylaşımlı bellek bloğunu açar ve görüntüleri kopyasız görünüm
+    (view) olarak döndürür.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    images = [
+        np.ndarray(shape, dtype=np.uint8, buffer=block.buf, offset=offset)
+        for offset, shape in layout
+    ]
+    return block, images
+
+
+def _detect_shared(name, layout, conf, imgsz):
+    """
+    İşçide çalışan görev: paylaşımlı bellekteki görüntülerde tespit.
+
+    Dönüş:
+        list: Her görüntü için Detections
+    """
+    block, images = _attach(name, layout)
+    try:
+        return detection.detect_images(_MODEL, images, conf, imgsz)
+    finally:
+        # Görünümler silinmeden blok kapatılamaz. Model son girişe referans
+        # tutuyorsa eşleme, referans bırakıldığında kendiliğinden kapanır.
+        del images
+        try:
+            block.close()
+        except BufferError:
+            pass
+
+
+# ==================== HAVUZ ====================
+
+def _pack(images):
+    """
+    Görüntüleri tek bir paylaşımlı bellek bloğuna art arda kopyalar.
+
+    Dönüş:
+        tuple: (SharedMemory, [(offset, shape), ...])
+    """
+    images = [np.ascontiguousarray(img, dtype=np.uint8) for img in images]
+    total = sum(img.nbytes for img in images)
+    block = shared_memory.SharedMemory(create=True, size=max(total, 1))
+
+    layout = []
+    offset = 0
+    for img in images:
+        np.ndarray(img.shape, np.uint8, block.buf, offset)[...] = img
+        layout.append((offset, img.shape))
+        offset += img.nbytes
+    return block, layout
+
+
+class WorkerPool:
+    """
+    Çıkarımı çekirdeklere sabitlenmiş N işçi sürece dağıtan model.
+
+    detect() bir batch'i işçi sayısı kadar parçaya böler; parçalar
+    aynı anda farklı süreçlerde işlenir.
+    """
+
+    def __init__(self, weights=detection.DEFAULT_WEIGHTS, backend='torch',
+                 processes=None, imgsz=detection.DEFAULT_IMGSZ, cores=None):
+        """
+        Parametreler:
+            weights (str): .pt ağırlık dosyası
+            backend (str): 'torch', 'onnx' veya 'openvino'
+            processes (int): İşçi sayısı (None ise çekirdek sayısı)
+            imgsz (int): Giriş boyutu (ONNX/OpenVINO dışa aktarımı için)
+            cores (list): Kullanılacak çekirdekler (None ise tümü)
+
+        Hata:
+            RuntimeError: Gerekli kütüphane yüklü değilse
+        """
+        import backends
+
+        cores = cores or available_cores()
+        processes = min(processes or len(cores), len(cores))
+        self.core_groups = split_cores(cores, processes)
+        self.processes = len(self.core_groups)
+
+        # Ana süreçte PyTorch modeli yüklenmez (ağırlıklar yalnızca yerelde
+        # yoksa indirilir); modeli her işçi kendisi yükler
+        weights_path = backends.local_weights(weights)
+        spec = {'backend': backend, 'weights': weights_path, 'imgsz': imgsz}
+
+        if backend == 'torch':
+            self.identity = os.path.basename(weights_path)
+        else:
+            if backend not in backends.BACKENDS:
+                raise ValueError(f"Bilinmeyen arka uç: {backend}")
+            spec['path'] = backends.export_cached(weights_path, backend,
+                                                  imgsz)
+            self.identity = os.path.basename(spec['path'])
+
+        # fork yerine forkserver/spawn: ana süreçte çalışmış OpenMP veya
+        # ONNX Runtime iş parçacığı havuzları işçilere kopyalanmaz
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in methods else 'spawn'
+        )
+
+        # İşçiler ana sürecin kaynak takipçisini paylaşsın: aksi halde her
+        # işçi kendi takipçisini başlatır ve açtığı blokları çıkışta
+        # sızıntı sayıp ikinci kez silmeye çalışır
+        resource_tracker.ensure_running()
+
+        core_queue = ctx.Queue()
+        for group in self.core_groups:
+            core_queue.put(group)
+
+        self._pool = ctx.Pool(self.processes, _init_worker,
+                              (core_queue, spec))
+
+    def detect(self, images, conf=detection.DEFAULT_CONF, imgsz=None):
+        """
+        Görüntüleri işçilere bölerek işler.
+
+        Dönüş:
+            list: Her görüntü için Detections (giriş sırasıyla)
+        """
+        if not len(images):
+            return []
+
+        parts = np.array_split(np.arange(len(images)),
+                               min(self.processes, len(images)))
+        blocks = []
+        try:
+            pending = []
+            for index in parts:
+                block, layout = _pack([images[i] for i in index])
+                blocks.append(block)
+                pending.append(self._pool.apply_async(
+                    _detect_shared, (block.name, layout, conf, imgsz)
+                ))
+
+            results = []
+            for task in pending:
+                results.extend(task.get())
+            return results
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def close(self):
+        """İşçi süreçlerini kapatır."""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()